@@ -0,0 +1,68 @@
+"""
+Benchmark of the simulation: the cost of
+one Match.step per defender on the field,
+with the ball held in a corner no defender
+reaches, so every step moves every defender.
+
+    python bench_match.py --steps 2000
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+from soccer_game_field_model import Match
+
+# Down and left push the ball into the bottom left corner
+CORNER = {
+    pygame.K_LEFT: True,
+    pygame.K_RIGHT: False,
+    pygame.K_UP: False,
+    pygame.K_DOWN: True,
+}
+
+
+def time_steps(level, length, steps):
+    """
+    Return the number of defenders and the
+    mean microseconds of a step per defender
+    Args:
+        level: integer level of the match
+        length: integer pitch length
+        steps: integer of steps to time
+    """
+    match = Match(level, lives=10**9, length=length)
+    for _ in range(60):  # settle the ball in its corner
+        match.step(CORNER)
+    count = len(match.defenders)
+    start = time.perf_counter()
+    for _ in range(steps):
+        match.step(CORNER)
+    seconds = time.perf_counter() - start
+    return count, seconds / steps / count * 1e6
+
+
+def main():
+    """
+    Time matches with more and more
+    defenders, patrolling and pursuing
+    """
+    parser = argparse.ArgumentParser(description="Match step benchmark")
+    parser.add_argument("--steps", type=int, default=2000)
+    args = parser.parse_args()
+    pygame.init()
+    for level, length in ((5, 1000), (5, 5000), (12, 5000), (30, 5000)):
+        count, per_defender = time_steps(level, length, args.steps)
+        print(
+            f"level {level:>2}, {count:>3} defenders: "
+            f"{per_defender:5.2f} us per defender per step"
+        )
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
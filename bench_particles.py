@@ -0,0 +1,71 @@
+"""
+Benchmark of the particle system: the cost
+of updating and drawing a full pool each
+frame, drawn headless with SDL's dummy
+video driver.
+
+    python bench_particles.py --frames 300
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+from soccer_game_field_particles import ParticleSystem
+from soccer_game_field_render import SurfaceRenderer
+from soccer_game_field_view import LOGICAL_SIZE
+
+
+def time_particles(renderer, budget, frames):
+    """
+    Return the mean milliseconds to update and
+    to draw one frame with the pool kept full
+    Args:
+        renderer: renderer drawn on
+        budget: integer of particles alive
+        frames: integer of frames to time
+    """
+    particles = ParticleSystem(capacity=budget, seed=1)
+    update_time = 0.0
+    draw_time = 0.0
+    for _ in range(frames):
+        # Top the pool up, as a long goal celebration would
+        while particles.count < budget:
+            particles.emit("confetti", 500, 500, budget - particles.count)
+        start = time.perf_counter()
+        particles.update()
+        middle = time.perf_counter()
+        particles.draw(renderer, 1.0, 1.0)
+        renderer.present()
+        end = time.perf_counter()
+        update_time += middle - start
+        draw_time += end - middle
+    return update_time / frames * 1000, draw_time / frames * 1000
+
+
+def main():
+    """
+    Time pools of growing size against
+    the 60 FPS frame budget
+    """
+    parser = argparse.ArgumentParser(description="Particle benchmark")
+    parser.add_argument("--frames", type=int, default=300)
+    args = parser.parse_args()
+    pygame.init()
+    renderer = SurfaceRenderer(LOGICAL_SIZE, LOGICAL_SIZE)
+    for budget in (500, 1000, 2000, 4000, 8000):
+        update_ms, draw_ms = time_particles(renderer, budget, args.frames)
+        total = update_ms + draw_ms
+        print(
+            f"{budget:>5} particles: update {update_ms:6.3f} ms, "
+            f"draw {draw_ms:6.3f} ms ({total / (1000 / 60):.0%} of a 60 FPS frame)"
+        )
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
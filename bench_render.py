@@ -0,0 +1,97 @@
+"""
+Benchmark of the cost of one frame with
+each render backend and internal resolution,
+drawn headless with SDL's dummy video driver.
+
+    python bench_render.py --frames 600
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+# pylint: disable=wrong-import-position
+import pygame
+from soccer_game_field_view import UpFieldView
+from soccer_game_field_model import Match
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_splitscreen import SplitScreen
+
+IDLE = dict.fromkeys(
+    (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), False
+)
+
+
+def time_frames(renderer, size, frames, level=5, length=1000):
+    """
+    Return the mean milliseconds to simulate
+    and draw one frame
+    Args:
+        renderer: string renderer kind of the view
+        size: integer width and height drawn at
+        frames: integer of frames to time
+        level: integer level, sets the defender count
+        length: integer pitch length, longer pitches
+        have more defenders, mostly off screen
+    """
+    view = UpFieldView(
+        headless=True, internal_size=(size, size), renderer=renderer
+    )
+    view._load_assets()  # pylint: disable=protected-access
+    view.match = Match(level, length=length)
+    view._update_camera(snap=True)  # pylint: disable=protected-access
+    start = time.perf_counter()
+    for _ in range(frames):
+        view.match.step(IDLE)
+        view._update_camera()  # pylint: disable=protected-access
+        view._draw_field()  # pylint: disable=protected-access
+        view._draw_hud(level)  # pylint: disable=protected-access
+        view.renderer.present()
+    elapsed = time.perf_counter() - start
+    pygame.display.quit()
+    return elapsed / frames * 1000
+
+
+def time_split(players, frames):
+    """
+    Return the mean milliseconds of one frame
+    of a 1920x1080 split screen, bots playing
+    every pane
+    """
+    bots = [EvasiveBot(level=5, restarts=0) for _ in range(players)]
+    split = SplitScreen(players, (1920, 1080), bots=bots, headless=True)
+    split.run(level=5, max_frames=frames)
+    pygame.display.quit()
+    return split.frame_stats.mean() * 1000
+
+
+def main():
+    """
+    Time every backend and print each
+    relative to the surface backend
+    """
+    parser = argparse.ArgumentParser(description="Render backend benchmark")
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+    for size in (1000, 500):
+        baseline = None
+        for renderer in ("surface", "texture-software"):
+            cost = time_frames(renderer, size, args.frames)
+            baseline = baseline or cost
+            print(
+                f"{renderer:>16} {size}x{size}: {cost:6.3f} ms/frame"
+                f" ({cost / baseline:.2f}x surface)"
+            )
+    # A pitch five screens long, with five times the defenders
+    for length in (1000, 5000):
+        cost = time_frames("surface", 1000, args.frames, length=length)
+        print(f"{'pitch':>16} {length} long: {cost:6.3f} ms/frame")
+    for players in (2, 4):
+        cost = time_split(players, args.frames)
+        print(f"{'split screen':>16} {players} players: {cost:6.3f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
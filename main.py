@@ -2,10 +2,147 @@
 Main file that runs and
 displays soccer game.
 
+Pass --metrics-port to serve live
+frame and game statistics over HTTP,
+--internal-size to draw the game at
+a lower resolution than the window and
+--renderer texture to draw with SDL2 textures,
+--diagnostics to watch memory across replays,
+--telemetry DIR to record the session
+as compressed JSON lines in DIR and
+--particles N to cap the particles of
+effects on slow machines, --pitch-length N
+to play on a pitch N pixels long that
+scrolls with the ball and --players N for
+2 to 4 players in split screen, which takes
+only the window, pitch and particle flags.
+The quality drops on slow machines and
+comes back when frames are fast again (F3
+shows the tier); --fixed-quality keeps it
+at its best.
+--record DIR saves a replay of every run
+in DIR, see soccer_game_field_replay, and
+--dev reloads changed images, sounds and
+levels while playing. The match in play is
+saved every second to --snapshot-dir DIR
+(--no-snapshots turns this off) and, after
+a crash, --resume carries on where it
+stopped.
 """
 
+import argparse
+import atexit
 from soccer_game_field_view import UpFieldView
+from soccer_game_field_view import LOGICAL_SIZE
+from soccer_game_field_metrics import MetricsServer
+from soccer_game_field_diagnostics import MemoryDiagnostics
+from soccer_game_field_telemetry import TelemetryWriter
+from soccer_game_field_splitscreen import SplitScreen
+from soccer_game_field_quality import QualityGovernor
+from soccer_game_field_replay import ReplayRecorder
+from soccer_game_field_hotreload import HotReloader
+from soccer_game_field_snapshot import SnapshotWriter
+from soccer_game_field_snapshot import load_snapshot
 
 
-new_field = UpFieldView()
-new_field.display_game()
\ No newline at end of file
+def parse_size(text):
+    """
+    Return a (width, height) tuple
+    from text such as 500x500
+    """
+    width, height = text.lower().split("x")
+    return (int(width), int(height))
+
+
+parser = argparse.ArgumentParser(description="Mini Soccer Game")
+parser.add_argument("--metrics-port", type=int, default=None)
+parser.add_argument("--internal-size", type=parse_size, default=LOGICAL_SIZE)
+parser.add_argument("--window-size", type=parse_size, default=None)
+parser.add_argument("--fullscreen", action="store_true")
+parser.add_argument("--diagnostics", action="store_true")
+parser.add_argument("--telemetry", metavar="DIR", default=None)
+parser.add_argument("--particles", type=int, default=None)
+parser.add_argument("--pitch-length", type=int, default=LOGICAL_SIZE[1])
+parser.add_argument("--players", type=int, choices=(1, 2, 3, 4), default=1)
+parser.add_argument("--fixed-quality", action="store_true")
+parser.add_argument("--record", metavar="DIR", default=None)
+parser.add_argument("--dev", action="store_true")
+parser.add_argument("--resume", action="store_true")
+parser.add_argument("--no-snapshots", action="store_true")
+parser.add_argument("--snapshot-dir", metavar="DIR", default="snapshot")
+parser.add_argument(
+    "--renderer",
+    choices=("surface", "texture", "texture-software"),
+    default="surface",
+)
+args = parser.parse_args()
+
+if args.players > 1:
+    # Split screen panes draw at their own size into one window
+    # and play several matches, which these features do not cover
+    unsupported = [
+        flag
+        for flag, used in (
+            ("--internal-size", args.internal_size != LOGICAL_SIZE),
+            ("--renderer", args.renderer != "surface"),
+            ("--diagnostics", args.diagnostics),
+            ("--telemetry", args.telemetry is not None),
+            ("--metrics-port", args.metrics_port is not None),
+            ("--record", args.record is not None),
+            ("--dev", args.dev),
+            ("--resume", args.resume),
+        )
+        if used
+    ]
+    if unsupported:
+        parser.error(f"{', '.join(unsupported)} cannot be used with --players")
+
+window_size = args.window_size
+if window_size is None:
+    # Fullscreen at (0, 0) takes the size of the desktop
+    window_size = (0, 0) if args.fullscreen else LOGICAL_SIZE
+    if args.players > 1 and not args.fullscreen:
+        window_size = (1920, 1080)
+
+if args.players > 1:
+    split = SplitScreen(args.players, window_size, args.fullscreen)
+    split.set_pitch_length(args.pitch_length)
+    if args.particles is not None:
+        for pane in split.panes:
+            pane.view.particles.set_budget(args.particles)
+    print("Scores:", split.run())
+    raise SystemExit
+
+# Start before the view so its first Surfaces are counted too
+diagnostics = MemoryDiagnostics().start() if args.diagnostics else None
+
+new_field = UpFieldView(
+    internal_size=args.internal_size,
+    window_size=window_size,
+    fullscreen=args.fullscreen,
+    renderer=args.renderer,
+)
+new_field.pitch_length = args.pitch_length
+if args.particles is not None:
+    new_field.particles.set_budget(args.particles)
+if not args.fixed_quality:
+    new_field.quality = QualityGovernor()
+if args.dev:
+    new_field.hot_reload = HotReloader(new_field).start()
+if args.resume:
+    new_field.resume = load_snapshot(args.snapshot_dir)
+if not args.no_snapshots:
+    new_field.snapshots = SnapshotWriter(args.snapshot_dir).start()
+    atexit.register(new_field.snapshots.close)
+if args.record is not None:
+    new_field.recorder = ReplayRecorder(args.record)
+if diagnostics is not None:
+    new_field.diagnostics = diagnostics
+    atexit.register(lambda: print(diagnostics.report()))
+if args.telemetry is not None:
+    new_field.telemetry = TelemetryWriter(args.telemetry).start()
+    # Quitting exits through sys.exit, which still runs this
+    atexit.register(new_field.telemetry.close)
+if args.metrics_port is not None:
+    MetricsServer(new_field, args.metrics_port).start()
+new_field.display_game()
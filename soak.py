@@ -0,0 +1,94 @@
+"""
+Soak test that lets a bot play the
+soccer game for a long time and reports
+frame times and memory growth.
+
+Run headless as fast as possible:
+    python soak.py --frames 1000000
+or watch the bot play in real time:
+    python soak.py --render
+"""
+
+import argparse
+import tracemalloc
+from soccer_game_field_view import UpFieldView
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_metrics import MetricsServer
+from soccer_game_field_diagnostics import MemoryDiagnostics
+
+
+def run_soak(
+    frames, chunk, level=1, render=False, metrics_port=None, restarts=None
+):
+    """
+    Let the reference bot play for the given
+    number of frames, printing frame time and
+    memory statistics after every chunk
+    Args:
+        frames: integer of frames to play
+        chunk: integer of frames between reports
+        level: integer starting level of the bot
+        render: True to draw the game in real time
+        metrics_port: integer port to serve live
+        metrics on, None for no endpoint
+        restarts: integer of restarts in a row with
+        growing memory to flag, None for no
+        per-run diagnostics
+    Returns:
+        List of report dictionaries, one per chunk
+    """
+    view = UpFieldView(headless=not render)
+    bot = EvasiveBot(level=level)
+    if metrics_port is not None:
+        MetricsServer(view, metrics_port).start()
+    tracemalloc.start()
+    if restarts is not None:
+        view.diagnostics = MemoryDiagnostics(restarts=restarts).start()
+    baseline = None
+    reports = []
+    played = 0
+    while played < frames:
+        batch = min(chunk, frames - played)
+        # One run plays on across chunks until the bot loses it
+        view.display_game(bot=bot, max_frames=batch, carry_on=True)
+        played += batch
+
+        current, peak = tracemalloc.get_traced_memory()
+        if baseline is None:
+            baseline = current
+        report = view.frame_stats.summary()
+        report["memory_kb"] = current // 1024
+        report["peak_kb"] = peak // 1024
+        report["growth_kb"] = (current - baseline) // 1024
+        if view.diagnostics is not None:
+            report["surfaces"] = view.diagnostics.report()["surfaces"]
+        reports.append(report)
+        print(report)
+    tracemalloc.stop()
+    return reports
+
+
+def main():
+    """
+    Parse the command line and run the soak test
+    """
+    parser = argparse.ArgumentParser(description="Soak test the soccer game")
+    parser.add_argument("--frames", type=int, default=100000)
+    parser.add_argument("--chunk", type=int, default=10000)
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--metrics-port", type=int, default=None)
+    parser.add_argument("--diagnose-restarts", type=int, default=None)
+    args = parser.parse_args()
+    run_soak(
+        args.frames,
+        args.chunk,
+        args.level,
+        args.render,
+        args.metrics_port,
+        args.diagnose_restarts,
+    )
+
+
+if __name__ == "__main__":
+    main()
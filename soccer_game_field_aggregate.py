@@ -0,0 +1,467 @@
+"""
+Gameplay statistics from the session
+telemetry: runs, goals, tackles, levels
+reached and the scores of each starting
+level, plus a static leaderboard page.
+
+The aggregator keeps a checkpoint of how
+far it has read each telemetry file, with
+the running totals and the runs still in
+progress. A run the player quit, or whose
+session's files are all gone without its
+game over, as after a crash, is counted as
+abandoned and forgotten, so the checkpoint
+stays as small as the files kept. The
+writer compresses every batch
+as a gzip member of its own, so each update
+starts at the first member it has not
+finished and decompresses only what was
+written since: files that have not grown
+are skipped without opening them, so
+updating after years of sessions costs
+about as much as the new sessions do.
+
+    python soccer_game_field_aggregate.py --telemetry telemetry --out stats
+"""
+
+import argparse
+import html
+import json
+import os
+import time
+import zlib
+
+# Scores at or above this are counted together
+SCORE_CAP = 20
+LEADERBOARD_SIZE = 10
+CHECKPOINT_FILE = "checkpoint.json"
+_FORMAT = 2
+
+
+def empty_stats():
+    """
+    Return the statistics of no runs
+    """
+    return {
+        "runs": 0,
+        "bot_runs": 0,
+        "abandoned": 0,
+        "goals": 0,
+        "tackles": 0,
+        "levels_reached": {},
+        "by_start": {},
+        "leaderboard": [],
+    }
+
+
+def gzip_members(data):
+    """
+    Yield the text of each gzip member of
+    data, the compressed bytes it takes and
+    whether it is complete; the last one may
+    end mid-write
+    """
+    view = memoryview(data)
+    start = 0
+    while start < len(data):
+        decompressor = zlib.decompressobj(wbits=31)
+        try:
+            text = decompressor.decompress(view[start:])
+        except zlib.error:
+            return
+        if not decompressor.eof:
+            yield text, len(data) - start, False  # still being written
+            return
+        used = len(data) - start - len(decompressor.unused_data)
+        yield text, used, True
+        start += used
+
+
+def decompress_gzip(data):
+    """
+    Return as much text as can be read from
+    gzip data, which may end mid-write
+    """
+    return b"".join(text for text, _, _ in gzip_members(data))
+
+
+class StatsAggregator:
+    """
+    Adds telemetry events to running
+    statistics, file by file, from where
+    the last update stopped
+
+    Attributes:
+        checkpoint_path: string path of the
+        checkpoint file
+        files: dictionary from file name to its
+        compressed size, the compressed offset of
+        its first member not fully counted and
+        the bytes of that member's text counted
+        open_runs: dictionary from session to
+        the run it was last playing
+        stats: dictionary of the statistics,
+        see empty_stats
+        events_read: integer of events counted
+        by the last update
+        bytes_read: integer of compressed bytes
+        read by the last update
+    """
+
+    def __init__(self, checkpoint_path):
+        self.checkpoint_path = checkpoint_path
+        self.files = {}
+        self.open_runs = {}
+        self.stats = empty_stats()
+        self.events_read = 0
+        self.bytes_read = 0
+        self._load()
+
+    def _load(self):
+        """
+        Read the checkpoint, starting over
+        when it is missing or unreadable
+        """
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return
+        if saved.get("format") != _FORMAT:
+            return
+        self.files = saved["files"]
+        self.open_runs = saved["open_runs"]
+        self.stats = saved["stats"]
+        for key, value in empty_stats().items():
+            self.stats.setdefault(key, value)  # added since it was saved
+
+    def save(self):
+        """
+        Write the checkpoint, replacing the
+        old one only once complete
+        """
+        saved = {
+            "format": _FORMAT,
+            "files": self.files,
+            "open_runs": self.open_runs,
+            "stats": self.stats,
+        }
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(saved, f, separators=(",", ":"))
+        os.replace(temp_path, self.checkpoint_path)
+
+    def update(self, directory):
+        """
+        Count the events written to the
+        telemetry files in directory since
+        the last update
+        Args:
+            directory: string folder of the
+            .jsonl.gz files of TelemetryWriter
+        Returns:
+            Integer of new events counted
+        """
+        self.events_read = 0
+        self.bytes_read = 0
+        try:
+            names = sorted(
+                name
+                for name in os.listdir(directory)
+                if name.endswith(".jsonl.gz")
+            )
+        except OSError:
+            names = []
+        # Files the writer pruned are never read again
+        self.files = {
+            name: self.files[name] for name in names if name in self.files
+        }
+        for name in names:
+            path = os.path.join(directory, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            seen = self.files.get(name, {"size": 0, "member": 0, "offset": 0})
+            if size == seen["size"]:
+                continue  # nothing new
+            with open(path, "rb") as f:
+                f.seek(seen["member"])
+                data = f.read()
+            self.bytes_read += len(data)
+            member, offset = seen["member"], seen["offset"]
+            for text, used, complete in gzip_members(data):
+                # Only whole lines: the last one may still be written
+                end = text.rfind(b"\n") + 1
+                self._add_lines(_session(name), text[offset:end])
+                if complete:
+                    member += used
+                    offset = 0
+                else:
+                    offset = max(end, offset)
+            self.files[name] = {
+                "size": size,
+                "member": member,
+                "offset": offset,
+            }
+        # Runs of sessions whose files are all gone never end
+        sessions = {_session(name) for name in names}
+        for session in list(self.open_runs):
+            if session not in sessions:
+                del self.open_runs[session]
+                self.stats["abandoned"] += 1
+        return self.events_read
+
+    def _add_lines(self, session, text):
+        """
+        Add the events of whole JSON lines
+        of a session to the statistics
+        """
+        for line in text.splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            self._add(session, event)
+            self.events_read += 1
+
+    def _add(self, session, event):
+        """
+        Add one event of a session to the
+        statistics
+        """
+        kind = event.get("kind")
+        if kind == "run_start":
+            self.open_runs[session] = {
+                "start": event.get("level", 1),
+                "bot": bool(event.get("bot")),
+                "goals": 0,
+                "tackles": 0,
+            }
+            return
+        run = self.open_runs.get(session)
+        if run is None:
+            return  # the run started before the oldest file kept
+        if kind == "goal":
+            run["goals"] += 1
+        elif kind == "tackle":
+            run["tackles"] += 1
+        elif kind == "game_over":
+            del self.open_runs[session]
+            self._finish_run(run, event)
+        elif kind == "quit":
+            del self.open_runs[session]
+            self.stats["abandoned"] += 1
+
+    def _finish_run(self, run, event):
+        """
+        Add a run that ended to the statistics;
+        runs played by bots are only counted
+        """
+        stats = self.stats
+        if run["bot"]:
+            stats["bot_runs"] += 1
+            return
+        score = int(event.get("score", run["goals"]))
+        reached = str(event.get("level", run["start"]))
+        stats["runs"] += 1
+        stats["goals"] += run["goals"]
+        stats["tackles"] += run["tackles"]
+        _bump(stats["levels_reached"], reached)
+
+        start = stats["by_start"].setdefault(
+            str(run["start"]),
+            {"runs": 0, "total_score": 0, "best": 0, "scores": {}},
+        )
+        start["runs"] += 1
+        start["total_score"] += score
+        start["best"] = max(start["best"], score)
+        _bump(start["scores"], str(min(score, SCORE_CAP)))
+
+        board = stats["leaderboard"]
+        if len(board) < LEADERBOARD_SIZE or score > board[-1]["score"]:
+            board.append(
+                {
+                    "score": score,
+                    "start": run["start"],
+                    "reached": int(reached),
+                    "time": event.get("time", 0),
+                }
+            )
+            # Earlier runs keep their place on equal scores
+            board.sort(key=lambda entry: (-entry["score"], entry["time"]))
+            del board[LEADERBOARD_SIZE:]
+
+
+def _session(name):
+    """
+    Return the session of a telemetry file:
+    its name without the file number
+    """
+    return name.rsplit("-", 1)[0]
+
+
+def _bump(counts, key):
+    """
+    Add one to counts[key]
+    """
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _levels(counts):
+    """
+    Return the items of a dictionary keyed
+    by level numbers in level order
+    """
+    return sorted(counts.items(), key=lambda item: int(item[0]))
+
+
+def render_page(stats):
+    """
+    Return the static HTML page of the
+    statistics and leaderboard
+    """
+    esc = html.escape
+    cards = "".join(
+        f'<div class="card"><b>{value}</b><span>{esc(label)}</span></div>'
+        for label, value in (
+            ("runs", stats["runs"]),
+            ("goals", stats["goals"]),
+            ("tackles", stats["tackles"]),
+            ("bot runs", stats["bot_runs"]),
+            ("abandoned", stats["abandoned"]),
+        )
+    )
+
+    board = "".join(
+        f"<tr><td>{rank}</td><td>{entry['score']}</td><td>{entry['start']}</td>"
+        f"<td>{entry['reached']}</td><td>"
+        f"{esc(time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['time'])))}"
+        "</td></tr>"
+        for rank, entry in enumerate(stats["leaderboard"], start=1)
+    )
+
+    starts = []
+    for level, start in _levels(stats["by_start"]):
+        counts = [
+            start["scores"].get(str(score), 0) for score in range(SCORE_CAP + 1)
+        ]
+        most = max(counts)
+        bars = "".join(
+            f'<div class="bar" style="height:{count * 100 // most}%"'
+            f' title="score {score}: {count} runs"></div>'
+            for score, count in enumerate(counts)
+        )
+        starts.append(
+            f"<tr><td>{esc(level)}</td><td>{start['runs']}</td>"
+            f"<td>{start['total_score'] / start['runs']:.1f}</td>"
+            f"<td>{start['best']}</td>"
+            f"<td><div class=\"bars\">{bars}</div></td></tr>"
+        )
+
+    starts = "".join(starts)
+    reached = "".join(
+        f"<tr><td>{esc(level)}</td><td>{count}</td></tr>"
+        for level, count in _levels(stats["levels_reached"])
+    )
+    updated = esc(time.strftime("%Y-%m-%d %H:%M"))
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8" />
+  <title>Mini Soccer Game - Stats</title>
+  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+  <style>
+    body {{
+      background: #020617;
+      color: #e5e7eb;
+      font-family: system-ui, -apple-system, "Segoe UI", sans-serif;
+      max-width: 960px;
+      margin: 0 auto;
+      padding: 2rem 1rem;
+    }}
+    h1, h2 {{ color: #22c55e; }}
+    .cards {{ display: flex; gap: 1rem; flex-wrap: wrap; }}
+    .card {{
+      background: #0f172a;
+      border: 1px solid #1f2937;
+      border-radius: 0.75rem;
+      padding: 1rem 1.5rem;
+    }}
+    .card b {{ display: block; font-size: 1.75rem; }}
+    .card span, .muted {{ color: #9ca3af; }}
+    table {{ border-collapse: collapse; width: 100%; margin-bottom: 2rem; }}
+    th, td {{
+      border-bottom: 1px solid #1f2937;
+      padding: 0.4rem;
+      text-align: left;
+    }}
+    .bars {{ display: flex; align-items: flex-end; gap: 2px; height: 2rem; }}
+    .bar {{ background: #22c55e; width: 6px; min-height: 1px; }}
+  </style>
+</head>
+<body>
+  <h1>Mini Soccer Game Stats</h1>
+  <p class="muted">Updated {updated}</p>
+  <div class="cards">{cards}</div>
+  <h2>Leaderboard</h2>
+  <table>
+    <tr><th>#</th><th>Score</th><th>Start level</th><th>Reached</th>
+    <th>When</th></tr>
+    {board}
+  </table>
+  <h2>By starting level</h2>
+  <table>
+    <tr><th>Start</th><th>Runs</th><th>Mean score</th><th>Best</th>
+    <th>Scores 0 to {SCORE_CAP}+</th></tr>
+    {starts}
+  </table>
+  <h2>Levels reached</h2>
+  <table>
+    <tr><th>Level</th><th>Runs</th></tr>
+    {reached}
+  </table>
+</body>
+</html>
+"""
+
+
+def update_stats(telemetry_dir, out_dir):
+    """
+    Count the new telemetry and write the
+    checkpoint and stats page to out_dir
+    Returns:
+        The StatsAggregator used
+    """
+    aggregator = StatsAggregator(os.path.join(out_dir, CHECKPOINT_FILE))
+    aggregator.update(telemetry_dir)
+    aggregator.save()
+    temp_path = os.path.join(out_dir, "index.html.tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(render_page(aggregator.stats))
+    os.replace(temp_path, os.path.join(out_dir, "index.html"))
+    return aggregator
+
+
+def main():
+    """
+    Parse the command line and update
+    the stats page
+    """
+    parser = argparse.ArgumentParser(description="Update the game stats page")
+    parser.add_argument("--telemetry", default="telemetry")
+    parser.add_argument("--out", default="stats")
+    args = parser.parse_args()
+    start = time.perf_counter()
+    aggregator = update_stats(args.telemetry, args.out)
+    print(
+        f"{aggregator.events_read} new events, {aggregator.stats['runs']} runs"
+        f" in total, in {time.perf_counter() - start:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
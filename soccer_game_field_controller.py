@@ -4,7 +4,10 @@ obtaining input from the user
 """
 
 # pylint: disable
+from abc import ABC
+from abc import abstractmethod
 import pygame
+from soccer_game_field_model import escape_force
 
 
 class FieldController:
@@ -55,3 +58,190 @@ def get_ball_move():
     """
     user_input = pygame.key.get_pressed()
     return user_input
+
+
+class BotController(ABC):
+    """
+    Interface for a scripted player that
+    drives the game instead of the keyboard.
+    Subclasses decide the ball moves; the
+    view asks the bot for its starting level
+    and whether to play again after game over.
+    Attributes:
+        level: integer starting level
+        restarts: integer of game overs the
+        bot will play through before quitting,
+        None to never quit
+    """
+
+    def __init__(self, level=1, restarts=None):
+        self.level = level
+        self.restarts = restarts
+
+    def choose_level(self):
+        """
+        Returns the starting level of a run
+        """
+        return self.level
+
+    def want_restart(self):
+        """
+        Returns True to play another run
+        after a game over, else False
+        """
+        if self.restarts is None:
+            return True
+        self.restarts -= 1
+        return self.restarts >= 0
+
+    @abstractmethod
+    def get_ball_move(self, match):
+        """
+        Returns the keys the bot holds this frame
+        Args:
+            match: the Match being played
+        Returns:
+            Dictionary from the arrow key
+            constants to booleans, read the
+            same way as get_ball_move()
+        """
+
+
+class EvasiveBot(BotController):
+    """
+    Reference bot that heads for the goal and
+    swerves away from the nearest defender,
+    using the same push as the escape assist
+    Attributes:
+        caution: float weight of the swerve
+        against heading for the goal
+        dead_zone: float below which a direction
+        is not pressed
+    """
+
+    def __init__(self, level=1, restarts=None, caution=4.0, dead_zone=0.2):
+        super().__init__(level, restarts)
+        self.caution = caution
+        self.dead_zone = dead_zone
+
+    def get_ball_move(self, match):
+        """
+        Returns the keys that steer the ball
+        towards the goal and away from danger
+        Args:
+            match: the Match being played
+        Returns:
+            Dictionary from the arrow key
+            constants to booleans
+        """
+        goal_x, goal_y = match.goal_rect.center
+        steer_x = goal_x - match.ball_x
+        steer_y = goal_y - match.ball_y
+        dist = (steer_x * steer_x + steer_y * steer_y) ** 0.5
+        if dist > 0:
+            steer_x /= dist
+            steer_y /= dist
+
+        if match.nearest_def is not None:
+            push_x, push_y = escape_force(
+                match.ball_x,
+                match.ball_y,
+                match.nearest_def[0],
+                match.nearest_def[1],
+                match.danger_radius,
+                self.caution,
+            )
+            steer_x += push_x
+            steer_y += push_y
+
+        return {
+            pygame.K_LEFT: steer_x < -self.dead_zone,
+            pygame.K_RIGHT: steer_x > self.dead_zone,
+            pygame.K_UP: steer_y < -self.dead_zone,
+            pygame.K_DOWN: steer_y > self.dead_zone,
+        }
+
+
+class EventDispatcher:
+    """
+    The one place the game reads the pygame
+    event queue. Handlers are registered per
+    game state and event type, and only the
+    event types that have a handler are let
+    into the queue. A handler may switch the
+    state; the rest of the events already read
+    then go to the new state's handlers, so no
+    keystroke is lost between screens.
+
+    Attributes:
+        state: string of the current game state,
+        such as "menu", "play" or "game_over"
+        handlers: dictionary from (state, event
+        type) tuples to lists of handlers; the
+        state None matches every state
+    """
+
+    def __init__(self):
+        self.state = None
+        self.handlers = {}
+        self.allowed = set()
+
+    def on(self, state, event_type, handler):
+        """
+        Register a handler for an event type
+        Args:
+            state: string game state the handler
+            runs in, None for every state
+            event_type: integer pygame event type
+            handler: function taking the event
+        """
+        self.handlers.setdefault((state, event_type), []).append(handler)
+        self.allowed.add(event_type)
+
+    def install(self):
+        """
+        Block every event type that no handler
+        uses, so pygame never queues them
+        """
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(sorted(self.allowed))
+
+    def set_state(self, state):
+        """
+        Switch the state events are sent to
+        """
+        self.state = state
+
+    def handle(self, event):
+        """
+        Send one event to the handlers of the
+        current state and of every state
+        """
+        for state in (self.state, None):
+            for handler in self.handlers.get((state, event.type), ()):
+                handler(event)
+
+    def dispatch(self):
+        """
+        Handle every queued event without
+        waiting, once per frame
+        """
+        for event in pygame.event.get():
+            self.handle(event)
+
+    def wait(self, timeout=0):
+        """
+        Idle until an event arrives, then
+        handle it and anything queued behind it
+        Args:
+            timeout: integer milliseconds to wait
+            at most, 0 to wait forever
+        Returns:
+            True if any event was handled
+        """
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return False
+        self.handle(event)
+        self.dispatch()
+        return True
@@ -0,0 +1,203 @@
+"""
+Diagnostics mode that watches memory over
+many replays: it counts the live Surfaces
+by where they were made, takes tracemalloc
+snapshots at every level and at the end of
+every run, and flags memory that keeps
+growing across restarts.
+"""
+
+import gc
+import tracemalloc
+import weakref
+from collections import deque
+
+
+class SurfaceTracker:
+    """
+    Counts the Surfaces still alive by the
+    place that made them, without keeping
+    any of them alive
+
+    Attributes:
+        enabled: True once diagnostics are on;
+        track does nothing before that
+        live: dictionary from origin strings to
+        weak sets of the Surfaces made there
+        created: dictionary from origin strings
+        to the integer of Surfaces ever made there
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.live = {}
+        self.created = {}
+
+    def track(self, surface, origin):
+        """
+        Record a new Surface and return it
+        Args:
+            surface: the Surface just made
+            origin: string naming where it was made
+        """
+        if self.enabled:
+            self.live.setdefault(origin, weakref.WeakSet()).add(surface)
+            self.created[origin] = self.created.get(origin, 0) + 1
+        return surface
+
+    def counts(self):
+        """
+        Return a dictionary from origin to the
+        integer of its Surfaces alive now
+        """
+        return {origin: len(alive) for origin, alive in self.live.items()}
+
+
+SURFACES = SurfaceTracker()
+
+
+def _traced_bytes():
+    """
+    Return the bytes tracemalloc traces now,
+    after collecting garbage
+    """
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+class MemoryDiagnostics:
+    """
+    Takes memory samples at every level and
+    at the end of every run, and flags growth
+    across the last few restarts
+
+    Attributes:
+        restarts: integer of runs in a row that
+        must each end with more memory to flag growth
+        threshold: integer bytes the memory must
+        grow by over those runs to be flagged
+        frames: integer of stack frames tracemalloc
+        keeps per allocation
+        samples: deque of the latest dictionaries,
+        one per run start, level or run end, with
+        the traced bytes and live Surface counts
+        run_ends: deque of the traced bytes at the
+        end of the latest runs
+        warnings: deque of the latest strings of
+        growth found
+    Everything kept is bounded, so diagnostics
+    can stay on for days.
+    """
+
+    def __init__(self, restarts=5, threshold=256 * 1024, frames=10):
+        self.restarts = restarts
+        self.threshold = threshold
+        self.frames = frames
+        self.samples = deque(maxlen=1000)
+        self.run_ends = deque(maxlen=1000)
+        self.end_surfaces = deque(maxlen=restarts + 1)
+        self.warnings = deque(maxlen=100)
+        self.run = 0
+        self.first_snapshot = None
+
+    def start(self):
+        """
+        Start tracing allocations and counting Surfaces
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        SURFACES.enabled = True
+        return self
+
+    def _sample(self, kind, level):
+        """
+        Record one memory sample
+        """
+        sample = {
+            "kind": kind,
+            "run": self.run,
+            "level": level,
+            "traced_kb": _traced_bytes() // 1024,
+            "surfaces": SURFACES.counts(),
+        }
+        self.samples.append(sample)
+        return sample
+
+    def run_started(self, level):
+        """
+        Call when a run starts at a level
+        """
+        self.run += 1
+        self._sample("run_start", level)
+
+    def level_started(self, level):
+        """
+        Call when a goal moves the run up a level
+        """
+        self._sample("level", level)
+
+    def run_ended(self, level):
+        """
+        Call at game over. Samples the memory,
+        compares it with the first run and checks
+        the last restarts for steady growth
+        Returns:
+            List of the warnings found this run
+        """
+        sample = self._sample("run_end", level)
+        self.run_ends.append(sample["traced_kb"] * 1024)
+        self.end_surfaces.append(sample["surfaces"])
+        snapshot = tracemalloc.take_snapshot()
+        if self.first_snapshot is None:
+            self.first_snapshot = snapshot
+        found = self.check_growth(snapshot)
+        for warning in found:
+            print("Memory diagnostics:", warning)
+        self.warnings.extend(found)
+        return found
+
+    def check_growth(self, snapshot=None):
+        """
+        Return warnings when memory or the count
+        of live Surfaces of any origin grew at the
+        end of each of the last restarts runs
+        Args:
+            snapshot: tracemalloc snapshot of now,
+            to name the lines that grew the most
+        """
+        found = []
+        window = list(self.run_ends)[-(self.restarts + 1) :]
+        if len(window) == self.restarts + 1:
+            rising = all(b > a for a, b in zip(window, window[1:]))
+            growth = window[-1] - window[0]
+            if rising and growth >= self.threshold:
+                found.append(
+                    f"traced memory grew {growth // 1024} KB over the last "
+                    f"{self.restarts} restarts"
+                )
+                if snapshot is not None and self.first_snapshot is not None:
+                    for stat in snapshot.compare_to(self.first_snapshot, "lineno")[:3]:
+                        found.append(f"  {stat}")
+
+        ends = self.end_surfaces
+        if len(ends) == self.restarts + 1:
+            for origin in ends[-1]:
+                counts = [surfaces.get(origin, 0) for surfaces in ends]
+                if all(b > a for a, b in zip(counts, counts[1:])):
+                    found.append(
+                        f"live '{origin}' Surfaces grew from {counts[0]} to "
+                        f"{counts[-1]} over the last {self.restarts} restarts"
+                    )
+        return found
+
+    def report(self):
+        """
+        Return a dictionary summing up the runs
+        """
+        return {
+            "runs": self.run,
+            "run_end_kb": [value // 1024 for value in self.run_ends],
+            "surfaces": SURFACES.counts(),
+            "surfaces_created": dict(SURFACES.created),
+            "warnings": list(self.warnings),
+        }
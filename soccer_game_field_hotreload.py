@@ -0,0 +1,256 @@
+"""
+Dev mode hot reload. A background thread
+polls the image and sound folders and the
+level file for changes; between two frames
+the game swaps in what changed without
+restarting or resetting the match.
+
+Only the cache entries of a changed file are
+replaced, so one edited sprite costs one
+image load. An image or sound that cannot be
+read, such as one caught mid-save, keeps the
+old one in play and is tried again only once
+the file changes, and a level file with
+mistakes is reported and skipped until it is
+fixed.
+"""
+
+import os
+import threading
+import pygame
+from soccer_game_field_levels import LEVELS_FILE
+from soccer_game_field_levels import LevelError
+from soccer_game_field_levels import default_levels
+from soccer_game_field_levels import load_levels
+from soccer_game_field_model import ASSET_CACHE
+
+WATCHED = ("images", "sounds", LEVELS_FILE)
+
+
+class FileWatcher:
+    """
+    Polls files and folders for files added,
+    changed or removed since the last poll
+
+    Attributes:
+        paths: list of string files and folders
+        watched, folders with everything in them
+        interval: float seconds between polls
+    """
+
+    def __init__(self, paths, interval=0.5):
+        self.paths = list(paths)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._changed = set()
+        self._stop = threading.Event()
+        self._thread = None
+        self._seen = self._scan()
+
+    def _scan(self):
+        """
+        Return the modification time and size
+        of every file watched, by path
+        """
+        paths = []
+        for root in self.paths:
+            if os.path.isdir(root):
+                for folder, _, names in os.walk(root):
+                    paths.extend(os.path.join(folder, name) for name in names)
+            else:
+                paths.append(root)
+        files = {}
+        for path in paths:
+            stamp = _stamp(path)
+            if stamp is not None:  # None: removed while scanning
+                files[path] = stamp
+        return files
+
+    def poll(self):
+        """
+        Look for changes once, adding them to
+        the changes waiting to be taken
+        Returns:
+            Set of the string paths changed
+        """
+        seen = self._scan()
+        changed = {
+            path
+            for path in seen.keys() | self._seen.keys()
+            if seen.get(path) != self._seen.get(path)
+        }
+        self._seen = seen
+        if changed:
+            with self._lock:
+                self._changed |= changed
+        return changed
+
+    def changes(self):
+        """
+        Take the paths changed since the last
+        call, as a set
+        """
+        with self._lock:
+            changed, self._changed = self._changed, set()
+        return changed
+
+    def start(self):
+        """
+        Start polling on a background thread
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="hot-reload", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def _run(self):
+        """
+        Watcher thread: poll until stopped
+        """
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+    def stop(self):
+        """
+        Stop polling
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class HotReloader:
+    """
+    Applies the changes a FileWatcher found
+    to a view at a frame boundary
+
+    Attributes:
+        view: the UpFieldView being played
+        watcher: FileWatcher of the game's files
+        failed: dictionary from the string path
+        of each file that could not be read to
+        its modification time and size then
+        reloads: integer of files swapped in
+    """
+
+    # The reloader updates the view's caches from outside
+    # pylint: disable=protected-access
+
+    def __init__(self, view, paths=WATCHED, interval=0.5):
+        self.view = view
+        self.watcher = FileWatcher(paths, interval)
+        self.failed = {}
+        self.reloads = 0
+
+    def start(self):
+        """
+        Start watching on a background thread
+        """
+        self.watcher.start()
+        return self
+
+    def stop(self):
+        """
+        Stop watching
+        """
+        self.watcher.stop()
+
+    def apply(self):
+        """
+        Swap in every file changed since the
+        last frame; called by the game loop
+        between frames
+        Returns:
+            List of the string paths reloaded
+        """
+        changed = self.watcher.changes()
+        # Failed files are only read again once saved again
+        changed.update(
+            path
+            for path, stamp in self.failed.items()
+            if _stamp(path) != stamp
+        )
+        if not changed:
+            return []
+        reloaded = []
+        images_changed = False
+        for path in sorted(changed):
+            if path.endswith(".png"):
+                if self._reload_file(path, ASSET_CACHE.reload):
+                    images_changed = True
+                    reloaded.append(path)
+            elif self._is_level_file(path):
+                if self._reload_levels(path):
+                    reloaded.append(path)
+            elif self._reload_file(path, self.view._reload_sound):
+                reloaded.append(path)
+        if images_changed:
+            self.view._reload_images()
+        for path in reloaded:
+            print("Reloaded", path)
+        self.reloads += len(reloaded)
+        return reloaded
+
+    def _reload_file(self, path, reload):
+        """
+        Read an image or sound file again with
+        reload(path); one that cannot be read is
+        reported and kept in failed
+        Returns:
+            True if reload swapped the file in
+        """
+        self.failed.pop(path, None)
+        if not os.path.exists(path):
+            return False  # removed: keep the loaded one
+        try:
+            return reload(path)
+        except pygame.error as e:
+            print("Not reloaded until saved again:", path, e)
+            self.failed[path] = _stamp(path)
+            return False
+
+    def _is_level_file(self, path):
+        """
+        Return True if path is the level file
+        of the match being played
+        """
+        match = self.view.match
+        source = LEVELS_FILE
+        if match is not None and match.levels.source is not None:
+            source = match.levels.source
+        return os.path.abspath(path) == os.path.abspath(source)
+
+    def _reload_levels(self, path):
+        """
+        Load the level file again and play on
+        with it; a file with mistakes is reported
+        and the current levels kept
+        Returns:
+            True if the new levels are in play
+        """
+        try:
+            table = load_levels(path)
+        except (OSError, LevelError) as e:
+            print("Level file not reloaded:", e)
+            return False
+        if os.path.abspath(path) == os.path.abspath(LEVELS_FILE):
+            # New matches load the shipped levels from the new table
+            default_levels.cache_clear()
+        if self.view.match is not None:
+            self.view.match.set_levels(table)
+        return True
+
+
+def _stamp(path):
+    """
+    Return the modification time and size of
+    the file at path, None if it is gone
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
@@ -0,0 +1,327 @@
+"""
+Level definitions loaded from a TOML or JSON
+file: defender count, lanes, speeds, pattern,
+pursuers and their speed and badge of every
+level.
+
+A file is parsed and checked once, then
+compiled into a compact binary table cached
+next to it under the hash of its contents.
+Later starts read the table back without
+parsing, and each level is a ready LevelSpec.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import struct
+from collections import namedtuple
+
+try:
+    import tomllib
+except ImportError:  # Python before 3.11 reads JSON only
+    tomllib = None
+
+LEVELS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "levels", "levels.toml"
+)
+
+# Direction each pattern lets defenders move in, (x, y)
+PATTERNS = {"bounce": (1, 1), "horizontal": (1, 0), "vertical": (0, 1)}
+PATTERN_NAMES = list(PATTERNS)
+
+MAX_LANES = 8
+
+# Header: magic, format version, level count, badge count
+_HEADER = struct.Struct("<4sHHH")
+# Level: defenders, pursuers, ball speed, defender x and y speed,
+# pursuer speed, pattern, lane count, lanes, badge index
+_RECORD = struct.Struct(f"<HHddddBB{MAX_LANES}HH")
+_MAGIC = b"SLVL"
+_FORMAT = 2
+
+LevelSpec = namedtuple(
+    "LevelSpec",
+    [
+        "number",
+        "defenders",
+        "pursuers",
+        "ball_speed",
+        "defender_speed",
+        "pursuer_speed",
+        "pattern",
+        "lanes",
+        "badge",
+    ],
+)
+
+
+class LevelError(ValueError):
+    """
+    A level file that cannot be used
+    """
+
+
+class LevelTable:
+    """
+    The compiled levels of one file
+
+    Attributes:
+        specs: list of LevelSpec, level 1 first
+        source: string path of the level file
+        digest: string hash of the file, the
+        name of its cached table
+        from_cache: True if the table was read
+        from the cache instead of compiled
+    """
+
+    def __init__(self, specs, source=None, digest=None, from_cache=False):
+        self.specs = specs
+        self.source = source
+        self.digest = digest
+        self.from_cache = from_cache
+
+    def __len__(self):
+        return len(self.specs)
+
+    def get(self, level):
+        """
+        Return the LevelSpec of a level; levels
+        past the last one defined repeat it
+        """
+        index = min(max(int(level), 1), len(self.specs)) - 1
+        return self.specs[index]
+
+
+def parse_levels(data, path):
+    """
+    Return the dictionary of a level file
+    Args:
+        data: bytes of the file
+        path: string path, its extension
+        picks TOML or JSON
+    """
+    toml = path.endswith(".toml")
+    if toml and tomllib is None:
+        raise LevelError(f"{path}: TOML needs Python 3.11, use JSON")
+    try:
+        text = data.decode("utf-8")
+        return tomllib.loads(text) if toml else json.loads(text)
+    except ValueError as e:  # bad UTF-8, TOML or JSON
+        raise LevelError(f"{path}: {e}") from e
+
+
+def _number(value, name, where, low, high, kind=float):
+    """
+    Return value checked to be a number
+    of the kind from low to high
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise LevelError(f"{where}: '{name}' must be a number")
+    if kind is int and value != int(value):
+        raise LevelError(f"{where}: '{name}' must be a whole number")
+    if not low <= value <= high:
+        raise LevelError(f"{where}: '{name}' must be from {low} to {high}")
+    return kind(value)
+
+
+def validate_levels(raw, path):
+    """
+    Check the levels of a parsed file and
+    return them as a list of LevelSpec
+    Args:
+        raw: dictionary of the file, with an
+        optional "defaults" table merged into
+        each entry of its "levels" list
+        path: string path, for error messages
+    """
+    if not isinstance(raw, dict):
+        raise LevelError(f"{path}: expected a table of levels")
+    defaults = raw.get("defaults", {})
+    if not isinstance(defaults, dict):
+        raise LevelError(f"{path}: 'defaults' must be a table")
+    levels = raw.get("levels")
+    if not isinstance(levels, list) or not levels:
+        raise LevelError(f"{path}: 'levels' must be a non-empty list")
+    if len(levels) > 0xFFFF:
+        raise LevelError(f"{path}: too many levels")
+
+    specs = []
+    for number, entry in enumerate(levels, start=1):
+        where = f"{path}: level {number}"
+        if not isinstance(entry, dict):
+            raise LevelError(f"{where}: expected a table")
+        level = dict(defaults)
+        level.update(entry)
+
+        defenders = _number(
+            level.get("defenders"), "defenders", where, 0, 200, int
+        )
+        pursuers = _number(
+            level.get("pursuers", 0), "pursuers", where, 0, defenders, int
+        )
+        ball_speed = _number(level.get("ball_speed"), "ball_speed", where, 0.1, 200)
+        speed = level.get("defender_speed")
+        if not isinstance(speed, list) or len(speed) != 2:
+            raise LevelError(f"{where}: 'defender_speed' must be [x, y]")
+        speed = tuple(
+            _number(value, "defender_speed", where, 0, 100) for value in speed
+        )
+        # Pursuers speed up with the level unless the file says
+        pursuer_speed = _number(
+            level.get("pursuer_speed", 1.0 + 0.25 * number),
+            "pursuer_speed",
+            where,
+            0,
+            100,
+        )
+
+        pattern = level.get("pattern", "bounce")
+        if pattern not in PATTERNS:
+            raise LevelError(
+                f"{where}: 'pattern' must be one of {', '.join(PATTERN_NAMES)}"
+            )
+        lanes = level.get("lanes")
+        if not isinstance(lanes, list) or not 1 <= len(lanes) <= MAX_LANES:
+            raise LevelError(
+                f"{where}: 'lanes' must list 1 to {MAX_LANES} y-positions"
+            )
+        lanes = tuple(_number(lane, "lanes", where, 0, 999, int) for lane in lanes)
+        badge = level.get("badge")
+        if not isinstance(badge, str) or not badge:
+            raise LevelError(f"{where}: 'badge' must be an image path")
+
+        specs.append(
+            LevelSpec(
+                number,
+                defenders,
+                pursuers,
+                ball_speed,
+                speed,
+                pursuer_speed,
+                pattern,
+                lanes,
+                badge,
+            )
+        )
+    return specs
+
+
+def compile_levels(specs):
+    """
+    Return the binary table of a list of
+    LevelSpec
+    """
+    badges = []
+    for spec in specs:
+        if spec.badge not in badges:
+            badges.append(spec.badge)
+    parts = [_HEADER.pack(_MAGIC, _FORMAT, len(specs), len(badges))]
+    for badge in badges:
+        encoded = badge.encode("utf-8")
+        parts.append(struct.pack("<H", len(encoded)) + encoded)
+    for spec in specs:
+        lanes = spec.lanes + (0,) * (MAX_LANES - len(spec.lanes))
+        parts.append(
+            _RECORD.pack(
+                spec.defenders,
+                spec.pursuers,
+                spec.ball_speed,
+                spec.defender_speed[0],
+                spec.defender_speed[1],
+                spec.pursuer_speed,
+                PATTERN_NAMES.index(spec.pattern),
+                len(spec.lanes),
+                *lanes,
+                badges.index(spec.badge),
+            )
+        )
+    return b"".join(parts)
+
+
+def decode_levels(blob):
+    """
+    Return the list of LevelSpec of a
+    binary table made by compile_levels
+    """
+    try:
+        magic, version, count, badge_count = _HEADER.unpack_from(blob)
+        if magic != _MAGIC or version != _FORMAT:
+            raise LevelError("not a level table of this version")
+        offset = _HEADER.size
+        badges = []
+        for _ in range(badge_count):
+            (size,) = struct.unpack_from("<H", blob, offset)
+            offset += 2
+            badges.append(blob[offset : offset + size].decode("utf-8"))
+            offset += size
+        records = blob[offset:]
+        if len(records) != count * _RECORD.size:
+            raise LevelError("level table is truncated")
+        specs = []
+        for number, record in enumerate(_RECORD.iter_unpack(records), start=1):
+            lane_count = record[7]
+            specs.append(
+                LevelSpec(
+                    number,
+                    record[0],
+                    record[1],
+                    record[2],
+                    (record[3], record[4]),
+                    record[5],
+                    PATTERN_NAMES[record[6]],
+                    tuple(record[8 : 8 + lane_count]),
+                    badges[record[-1]],
+                )
+            )
+        return specs
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise LevelError(f"bad level table: {e}") from e
+
+
+def load_levels(path=LEVELS_FILE, cache_dir=None):
+    """
+    Return the LevelTable of a level file,
+    from its cached binary table when the
+    file has not changed since it was compiled
+    Args:
+        path: string path of a .toml or .json file
+        cache_dir: string folder of the compiled
+        tables, by default __levelcache__ next
+        to the file
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(_MAGIC + bytes([_FORMAT]) + data).hexdigest()
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), "__levelcache__")
+    cache_path = os.path.join(cache_dir, digest + ".bin")
+
+    try:
+        with open(cache_path, "rb") as f:
+            return LevelTable(decode_levels(f.read()), path, digest, True)
+    except (OSError, LevelError):
+        pass
+
+    blob = compile_levels(validate_levels(parse_levels(data, path), path))
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(blob)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print("Could not cache compiled levels:", e)
+    # Always play from the decoded table, so cached and fresh
+    # loads give exactly the same numbers
+    return LevelTable(decode_levels(blob), path, digest)
+
+
+@functools.lru_cache(maxsize=None)
+def default_levels():
+    """
+    Return the LevelTable of the shipped
+    level file, loaded on first use
+    """
+    return load_levels()
@@ -0,0 +1,148 @@
+"""
+Optional metrics endpoint serving live frame
+and game statistics of a running UpFieldView
+in the Prometheus text format.
+
+The game thread only ever writes plain
+counters (the view's FrameStats, fps and
+match); the exporter thread reads them
+without taking a lock, so scraping can
+never stall a frame.
+"""
+
+import os
+import threading
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from soccer_game_field_model import ASSET_CACHE
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def memory_bytes():
+    """
+    Return the resident memory of the game
+    process in bytes, 0 if it cannot be read
+    """
+    try:
+        with open("/proc/self/statm", "r", encoding="utf-8") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is not None:
+        # Peak rather than current, but the best the platform gives
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return 0
+
+
+def render_metrics(view):
+    """
+    Return the metrics of a view as
+    Prometheus text
+    Args:
+        view: the running UpFieldView
+    Returns:
+        String of the metrics page
+    """
+    stats = view.frame_stats
+    # Copy once so the histogram is consistent within this scrape
+    buckets = list(stats.buckets)
+    match = view.match
+    lines = [
+        "# HELP soccer_frame_seconds Time spent on each frame.",
+        "# TYPE soccer_frame_seconds histogram",
+    ]
+    cumulative = 0
+    for bound, count in zip(stats.bucket_bounds, buckets):
+        cumulative += count
+        label = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append(f'soccer_frame_seconds_bucket{{le="{label}"}} {cumulative}')
+    lines.append(f"soccer_frame_seconds_sum {stats.total}")
+    lines.append(f"soccer_frame_seconds_count {cumulative}")
+    lines.append("# TYPE soccer_frames_over_budget_total counter")
+    lines.append(f"soccer_frames_over_budget_total {stats.over_budget}")
+    lines.append("# TYPE soccer_fps gauge")
+    lines.append(f"soccer_fps {view.fps}")
+    if match is not None:
+        lines.append("# TYPE soccer_level gauge")
+        lines.append(f"soccer_level {match.level}")
+        lines.append("# TYPE soccer_defenders gauge")
+        lines.append(f"soccer_defenders {len(match.defenders)}")
+        lines.append("# TYPE soccer_score gauge")
+        lines.append(f"soccer_score {match.score}")
+    lines.append("# TYPE soccer_asset_cache_hits_total counter")
+    lines.append(f"soccer_asset_cache_hits_total {ASSET_CACHE.hits}")
+    lines.append("# TYPE soccer_asset_cache_misses_total counter")
+    lines.append(f"soccer_asset_cache_misses_total {ASSET_CACHE.misses}")
+    lines.append("# TYPE soccer_asset_cache_entries gauge")
+    lines.append(f"soccer_asset_cache_entries {len(ASSET_CACHE.images)}")
+    lines.append("# TYPE soccer_memory_rss_bytes gauge")
+    lines.append(f"soccer_memory_rss_bytes {memory_bytes()}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """
+    HTTP server on a background thread that
+    answers every GET with the metrics of a view
+
+    Attributes:
+        view: the UpFieldView being exported
+        port: integer port listened on, filled
+        in once started when 0 was asked for
+    """
+
+    def __init__(self, view, port=9100, host="127.0.0.1"):
+        self.view = view
+        self.host = host
+        self.port = port
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """
+        Start serving on a daemon thread
+        """
+        view = self.view
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Serves the metrics page
+            """
+
+            def do_GET(self):  # pylint: disable=invalid-name
+                """
+                Answer a scrape
+                """
+                body = render_metrics(view).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                """
+                Keep scrapes out of the game's console
+                """
+
+        self.httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(
+            target=self.httpd.serve_forever, name="metrics", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the socket
+        """
+        if self.httpd is not None:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
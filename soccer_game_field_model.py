@@ -4,50 +4,179 @@ of instances and variables during the
 soccer game
 """
 
+import math
+import os
 import random
+from array import array
 import pygame
+from soccer_game_field_diagnostics import SURFACES
+from soccer_game_field_levels import PATTERNS
+from soccer_game_field_levels import default_levels
+
+
+class AssetCache:
+    """
+    Images loaded from disk and scaled once,
+    kept by file name and size so every level
+    and every defender shares the same surface
+
+    Attributes:
+        images: dictionary from (path, size, angle)
+        tuples to the loaded surface
+        masks: dictionary from the same tuples to
+        the collision mask of the surface
+        hits: integer of lookups already loaded
+        misses: integer of lookups read from disk
+    """
+
+    def __init__(self):
+        self.images = {}
+        self.masks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def image(self, path, size=None, angle=0):
+        """
+        Return the image at path, scaled to
+        size and then rotated by angle
+        Args:
+            path: string path of the image file
+            size: tuple of the width and height,
+            None to keep the image's own size
+            angle: integer degrees to rotate
+            counterclockwise
+        Return:
+            The cached surface
+        """
+        key = (path, size, angle)
+        surface = self.images.get(key)
+        if surface is None:
+            self.misses += 1
+            if angle:
+                surface = self.image(path, size)
+                surface = pygame.transform.rotate(surface, angle)
+            else:
+                surface = _fit(pygame.image.load(path), size)
+            self.images[key] = SURFACES.track(surface, "asset")
+        else:
+            self.hits += 1
+        return surface
+
+    def mask(self, path, size=None, angle=0):
+        """
+        Return the collision mask of the opaque
+        pixels of image(path, size, angle)
+        """
+        key = (path, size, angle)
+        mask = self.masks.get(key)
+        if mask is None:
+            mask = pygame.mask.from_surface(self.image(path, size, angle))
+            self.masks[key] = mask
+        return mask
+
+    def invalidate(self, path):
+        """
+        Forget every size and angle of the
+        image at path, so it is read again
+        from disk on its next use
+        Return:
+            True if the image was cached
+        """
+        target = os.path.abspath(path)
+        keys = [key for key in self.images if os.path.abspath(key[0]) == target]
+        for key in keys:
+            del self.images[key]
+            self.masks.pop(key, None)
+        return bool(keys)
+
+    def reload(self, path):
+        """
+        Read the image at path from disk once
+        and replace every cached size of it;
+        rotations are made again on their next
+        use. A file that cannot be read raises
+        pygame.error and the old images are kept
+        Return:
+            True if the image was cached
+        """
+        target = os.path.abspath(path)
+        # Kept under the names they were asked for by
+        sizes = {
+            (key[0], key[1])
+            for key in self.images
+            if os.path.abspath(key[0]) == target
+        }
+        if not sizes:
+            return False
+        source = pygame.image.load(path)
+        self.invalidate(path)
+        for name, size in sizes:
+            surface = _fit(source, size)
+            self.images[(name, size, 0)] = SURFACES.track(surface, "asset")
+        return True
+
+
+def _fit(surface, size):
+    """
+    Return a loaded image scaled to size,
+    None to keep its own size, in the pixel
+    format of the window when there is one
+    """
+    if size is not None:
+        surface = pygame.transform.scale(surface, size)
+    if pygame.display.get_surface() is not None:
+        # Match the window's pixel format, or every blit
+        # converts the image again
+        surface = surface.convert_alpha()
+    return surface
+
+
+ASSET_CACHE = AssetCache()
 
 
 class Level:
     """
-    Create a level that generates
-    the number of defenders on that level
-    and the velocity of the ball on
-    that level
+    The number of defenders and the ball
+    speed of a level, as its LevelSpec in
+    the level file defines them
     Attributes:
         numdef: The number of defenders
-        vel: The number of pixels moved
-        per keyboard click
+        vel: The top speed of the ball in
+        pixels a frame
+        spec: LevelSpec of the level
     """
 
-    def __init__(self, level):
+    def __init__(self, level, levels=None):
         self.level = int(level)
         self.numdef = 0
-        self.vel = 10
+        self.vel = 0.0
+        if levels is None:
+            levels = default_levels()
+        self.spec = levels.get(self.level)
 
     def create_numdef(self):
         """
         Return the number of defenders
-        created based on the level
+        on each screen of the level
         Args: No arguments
         Return:
             numdef: number of
             defenders as integers
         """
-        self.numdef = self.level
+        self.numdef = self.spec.defenders
         return self.numdef
 
     def create_newvel(self):
         """
-        Return number of pixels based
-        on the current level
+        Return the top speed of the ball
+        on the level
         Args: No arguments
         Return:
-            vel: Integer representing
+            vel: Float representing
             the number of pixels the
-            ball will move per click
+            ball moves per frame at most
         """
-        self.vel = (4 * self.level) + 20
+        self.vel = self.spec.ball_speed
         return self.vel
 
 
@@ -58,11 +187,17 @@ class Defender:
     of each new defender
 
     Attributes:
+        lanes: tuple of the y-positions
+        defenders start on, by default those
+        of level one in the level file
         def_y_pos: The defender y-position as
         an integer
     """
 
-    def __init__(self, def_rank):
+    def __init__(self, def_rank, lanes=None):
+        if lanes is None:
+            lanes = default_levels().get(1).lanes
+        self.lanes = lanes
         self.def_y_pos = self.find_y_pos(def_rank)
 
     def find_y_pos(self, def_rank):
@@ -76,12 +211,14 @@ class Defender:
             is for
         Return:
             def_y_pos: integer representing
-            y-position of the defender on screen
+            y-position of the defender on screen,
+            None when there are fewer lanes
         """
-        self.def_y_pos = 25 + (def_rank * 150)
-        if self.def_y_pos <= 900:
-            return self.def_y_pos
-        return None
+        if 1 <= def_rank <= len(self.lanes):
+            self.def_y_pos = self.lanes[def_rank - 1]
+        else:
+            self.def_y_pos = None
+        return self.def_y_pos
 
 
 def defend_move(current_x):
@@ -131,13 +268,96 @@ def make_def_dict(number_def):
     return defender_dict
 
 
+class FieldDefender:
+    """
+    One defender on the field, updated in
+    place every frame
+
+    Attributes:
+        x, y: floats, center of the defender
+        vx, vy: floats, velocity per frame
+        frames: tuple of the two animation
+        frame surfaces, still and mid-step
+        masks: tuple of the collision mask of
+        each frame
+        reach: float distance from the center
+        within which a ball may touch it
+        phase: integer offset of its bobbing
+        pursuer: True if it chases the ball
+        instead of patrolling
+    """
+
+    __slots__ = (
+        "x",
+        "y",
+        "vx",
+        "vy",
+        "frames",
+        "masks",
+        "reach",
+        "phase",
+        "pursuer",
+    )
+
+    def __init__(self, x, y, frames, masks, phase=0):
+        self.x = x
+        self.y = y
+        self.vx = 0.0
+        self.vy = 0.0
+        self.frames = ()
+        self.masks = ()
+        self.reach = 0.0
+        self.set_frames(frames, masks)
+        self.phase = phase
+        self.pursuer = False
+
+    def set_frames(self, frames, masks):
+        """
+        Change the animation frames and their
+        collision masks
+        """
+        self.frames = frames
+        self.masks = masks
+        # Half the widest frame plus half the ball, and a pixel
+        # for the ball rect's rounding
+        widest = max(max(frame.get_size()) for frame in frames)
+        self.reach = widest / 2 + 26
+
+    @property
+    def image(self):
+        """
+        Return the still frame of the defender
+        """
+        return self.frames[0]
+
+
+def lean_frames():
+    """
+    Return the animation frames and masks of
+    defenders, by the angle of their "step"
+    frame: each leans slightly left or right
+    Return:
+        Dictionary from 8 and -8 to a tuple of
+        the frames tuple and the masks tuple
+    """
+    path, size = "images/soccerplayer.png", (150, 150)
+    base_img = ASSET_CACHE.image(path, size)
+    base_mask = ASSET_CACHE.mask(path, size)
+    steps = {}
+    for angle in (8, -8):
+        steps[angle] = (
+            (base_img, ASSET_CACHE.image(path, size, angle)),
+            (base_mask, ASSET_CACHE.mask(path, size, angle)),
+        )
+    return steps
+
+
 def initialize_def(defender_dict):
     """
-    Return a dictionary with each key
-    being the defender number and the
-    values being the defender image, the
-    x-position of the defender, and
-    y-position of the defender
+    Return the defenders of a dictionary
+    made by make_def_dict as FieldDefender
+    entities, in key order, each at the
+    x-position 400 with its animation frames
     Args:
         defender_dict: A dictionary
         with the intantiated defenders,
@@ -146,31 +366,17 @@ def initialize_def(defender_dict):
         and the values being an integer
         for the y-position
     Returns:
-        defender_pos_dict: a dictionary
-        with a length of the number
-        of defenders, each key being the
-        number defender, and the values being a
-        list of three items: the surface image
-        of the defender, the x-position
-        of the defender, and y-position of defender
-
-
+        List of FieldDefender, one per key
     """
-    defender_pos_dict = {}
-    for i in defender_dict:
-        player_pos_stat = []
-        player = pygame.image.load("images/soccerplayer.png")
-        player = pygame.transform.scale(player, (150, 150))
-
-        player_rect = player.get_rect()
-        player_rect = (400, defender_dict[i])
-        player_rect = list(player_rect)
-
-        player_pos_stat.append(player)
-        player_pos_stat.append(player_rect[0])
-        player_pos_stat.append(player_rect[1])
-        defender_pos_dict[i] = player_pos_stat
-    return defender_pos_dict
+    # Defenders leaning the same way share their frames
+    steps = lean_frames()
+    defenders = []
+    for i in sorted(defender_dict):
+        frames, masks = steps[8 if i % 2 == 0 else -8]
+        defenders.append(
+            FieldDefender(400.0, defender_dict[i], frames, masks, phase=i * 7)
+        )
+    return defenders
 
 
 def ball_move(user_input, ball_rect, vel):
@@ -196,53 +402,505 @@ def ball_move(user_input, ball_rect, vel):
         ball_rect[1] += vel
 
 
-def level_images():
-    """
-    create a dictionary with
-    the level as the key and
-    it's associated graphic image
-    as a surface as it's value
-    Args: None
-    Return: None
-    """
-    level_one = pygame.image.load("images/level_one.png")
-    level_two = pygame.image.load("images/level_two.png")
-    level_three = pygame.image.load("images/level_three.png")
-    level_four = pygame.image.load("images/level_four.png")
-    level_five = pygame.image.load("images/level_five.png")
-    level_six = pygame.image.load("images/level_six.png")
-    level_dict = {
-        1: level_one,
-        2: level_two,
-        3: level_three,
-        4: level_four,
-        5: level_five,
-        6: level_six,
-    }
-    return level_dict
-
-
-def make_level_rect(level, diction):
-    """
-    Given the current level and the
-    dictionary containing all of
-    the level images, return a list
-    containing the current level image
-    and it's rectangular dimensions
-
+def escape_force(ball_x, ball_y, def_x, def_y, danger_radius, max_force):
+    """
+    Given the ball and the nearest defender,
+    return the push that dribbles the ball
+    away from the defender. The push grows
+    stronger the closer the defender is.
     Args:
-        level: integer representing the
-        current level
-        diction: dictionary with
-        the level as the key and
-        the values as their associated
-        images
-    Returns:
-        List with first element being
-        surface image and second element
-        the rectangular dimensions of the
-        image
-    """
-    level_image = pygame.transform.scale(diction[level], (100, 100))
-    level_rect = level_image.get_rect(center=(900, 100))
-    return [level_image, level_rect]
+        ball_x: float x-position of the ball
+        ball_y: float y-position of the ball
+        def_x: float x-position of the defender
+        def_y: float y-position of the defender
+        danger_radius: float distance in pixels
+        inside which the defender pushes the ball
+        max_force: float push when the defender
+        is right on top of the ball
+    Return:
+        A tuple of two floats, the x and y
+        push. (0.0, 0.0) when the defender is
+        outside the danger radius
+    """
+    dx = ball_x - def_x
+    dy = ball_y - def_y
+    dist_sq = dx * dx + dy * dy
+    if dist_sq <= 0 or dist_sq >= danger_radius * danger_radius:
+        return (0.0, 0.0)
+    dist = dist_sq**0.5
+    closeness = (danger_radius - dist) / danger_radius  # 0..1
+    strength = max_force * closeness
+    return (dx / dist * strength, dy / dist * strength)
+
+
+class FlowField:
+    """
+    Coarse grid over the pitch giving each
+    cell the direction toward the cell of a
+    target, shared by every defender chasing
+    it. A cell's direction is only worked out
+    when a defender asks for it after the
+    target changed cells, so following the
+    ball costs nothing while it stays inside
+    one cell and a lookup is always O(1).
+
+    Attributes:
+        cell: integer logical size of a cell
+        cols: integer of cells across
+        rows: integer of cells down
+        target: tuple of the (col, row) cell
+        of the target, or None
+        version: integer raised each time the
+        target changes cells
+        updates: integer of cell directions
+        worked out
+    """
+
+    def __init__(self, width, height, cell=100):
+        self.cell = cell
+        self.cols = -(-width // cell)
+        self.rows = -(-height // cell)
+        cells = self.cols * self.rows
+        self.dir_x = array("f", bytes(4 * cells))
+        self.dir_y = array("f", bytes(4 * cells))
+        # Version of the target each cell's direction is for
+        self.stamp = array("l", [-1]) * cells
+        self.target = None
+        self.version = 0
+        self.updates = 0
+
+    def _cell(self, x, y):
+        """
+        Return the (col, row) cell of a
+        logical position, clamped to the grid
+        """
+        col = min(max(int(x // self.cell), 0), self.cols - 1)
+        row = min(max(int(y // self.cell), 0), self.rows - 1)
+        return (col, row)
+
+    def set_target(self, x, y):
+        """
+        Point the field at a logical position;
+        directions go stale only when it moved
+        into another cell
+        """
+        cell = self._cell(x, y)
+        if cell != self.target:
+            self.target = cell
+            self.version += 1
+
+    def direction(self, x, y):
+        """
+        Return the unit (x, y) direction from the
+        cell of a logical position toward the
+        target cell, (0.0, 0.0) inside it
+        """
+        col, row = self._cell(x, y)
+        index = row * self.cols + col
+        if self.stamp[index] != self.version:
+            dx = self.target[0] - col
+            dy = self.target[1] - row
+            dist = math.hypot(dx, dy)
+            if dist:
+                self.dir_x[index] = dx / dist
+                self.dir_y[index] = dy / dist
+            else:
+                self.dir_x[index] = 0.0
+                self.dir_y[index] = 0.0
+            self.stamp[index] = self.version
+            self.updates += 1
+        return (self.dir_x[index], self.dir_y[index])
+
+
+class Match:
+    """
+    One run of the game: the ball, the
+    defenders on the field, the level,
+    score and lives. step() advances the
+    game by one frame, so the same match
+    runs in the window or headless.
+
+    Attributes:
+        level: integer of the current level
+        score: integer of goals scored
+        lives: integer of lives left
+        length: integer height of the pitch in
+        logical pixels, a whole number of 1000
+        pixel screens, with the goal at the top
+        levels: LevelTable the levels are set up
+        from, see soccer_game_field_levels
+        ball_x, ball_y: floats, center of the ball
+        ball_vx, ball_vy: floats, ball velocity
+        max_speed: float top speed of the ball
+        defenders: list of FieldDefender on the
+        field, see initialize_def
+        ball_mask: collision mask of the ball
+        anim_counter: integer of frames played
+        nearest_def: tuple of the (x, y) position
+        of the defender nearest the ball on the
+        last frame, or None
+        animate: True to run and bob the defenders,
+        False to keep them on their first frame,
+        which costs less to play and draw
+        pursuers: list of the defenders that
+        chase the ball instead of patrolling
+        pursuer_speed: float chasing speed of
+        the pursuers
+        flow: FlowField toward the ball that
+        pursuers steer by
+    """
+
+    danger_radius = 180.0  # pixels
+    max_escape_force = 1.2  # how strong the "dribble away" assist is
+    goal_rect = pygame.Rect(400, 0, 200, 200)
+    ball_image = ("images/soccerball.png", (50, 50))
+    pursuit_radius = 700.0  # pursuers farther from the ball patrol
+    pursuit_turn = 0.08  # share of the chase velocity taken per frame
+
+    def __init__(self, level, lives=3, length=1000, levels=None):
+        self.level = int(level)
+        self.score = 0
+        self.lives = lives
+        self.length = max(1, round(length / 1000)) * 1000
+        self.levels = default_levels() if levels is None else levels
+        self.pursuers = []
+        self.flow = FlowField(1000, self.length)
+        self.anim_counter = 0
+        self.nearest_def = None
+        self.animate = True
+        self.max_speed = 0.0
+        self.pursuer_speed = 0.0
+        self.defenders = []
+        self.ball_x = 500.0
+        self.ball_y = self.length - 100.0
+        self.ball_vx = 0.0
+        self.ball_vy = 0.0
+        self.ball_mask = ASSET_CACHE.mask(*self.ball_image)
+        self.setup_level(self.level)
+
+    def setup_level(self, level):
+        """
+        Place the defenders for the given
+        level and set the ball speed
+        Args:
+            level: integer of the level to set up
+        Return: No returns
+        """
+        self.level = level
+        spec = self.levels.get(level)
+        # Every screen of a longer pitch gets the level's defenders
+        screens = self.length // 1000
+        number_def = spec.defenders * screens
+        self.max_speed = spec.ball_speed
+        self.pursuer_speed = spec.pursuer_speed
+        self.defenders = initialize_def(make_def_dict(number_def))
+
+        # Defenders take turns between the screens and the lanes
+        # of the level, sharing lanes once every lane is taken;
+        # their directions along the level's pattern alternate
+        lanes = spec.lanes
+        move_x, move_y = PATTERNS[spec.pattern]
+        speed_x, speed_y = spec.defender_speed
+        for i, defender in enumerate(self.defenders, start=1):
+            screen = (i - 1) % screens
+            lane = ((i - 1) // screens) % len(lanes)
+            defender.y = screen * 1000 + lanes[lane]
+            defender.vx = speed_x * move_x * (1 if i % 2 == 0 else -1)
+            defender.vy = speed_y * move_y * (1 if i % 3 == 0 else -1)
+
+        # The last defenders placed chase the ball
+        patrolling = (spec.defenders - spec.pursuers) * screens
+        self.pursuers = self.defenders[patrolling:]
+        for defender in self.pursuers:
+            defender.pursuer = True
+
+    def reload_images(self):
+        """
+        Take the defender frames and the ball
+        mask from ASSET_CACHE again after their
+        images changed, keeping every position
+        """
+        steps = lean_frames()
+        for i, defender in enumerate(self.defenders, start=1):
+            defender.set_frames(*steps[8 if i % 2 == 0 else -8])
+        self.ball_mask = ASSET_CACHE.mask(*self.ball_image)
+
+    def set_levels(self, levels):
+        """
+        Play on with a new LevelTable: the
+        current level is set up again from it,
+        keeping the score, lives and ball
+        """
+        self.levels = levels
+        self.setup_level(self.level)
+
+    def reset_ball(self):
+        """
+        Reset ball to starting position and stop movement
+        """
+        self.ball_x = 500.0
+        self.ball_y = self.length - 100.0
+        self.ball_vx = 0.0
+        self.ball_vy = 0.0
+
+    def ball_rect(self):
+        """
+        Return the rectangle of the 50x50
+        ball around its current center
+        """
+        rect = pygame.Rect(0, 0, 50, 50)
+        rect.center = (int(self.ball_x), int(self.ball_y))
+        return rect
+
+    def ball_hits(self, ball_coord, defender, sprite):
+        """
+        Return True if the ball touches a defender.
+        The cheap rectangle test runs first and the
+        opaque pixels of the ball and the defender's
+        current frame are only compared when the
+        rectangles overlap
+        Args:
+            ball_coord: Rect of the ball
+            defender: the FieldDefender
+            sprite: tuple from defender_sprite
+        """
+        current_img, defender_x, draw_y = sprite
+        defender_coord = current_img.get_rect(center=(defender_x, draw_y))
+        if not ball_coord.colliderect(defender_coord):
+            return False
+        frame_id = self._frame_id()
+        defender_mask = defender.masks[frame_id]
+        offset = (
+            defender_coord.x - ball_coord.x,
+            defender_coord.y - ball_coord.y,
+        )
+        return self.ball_mask.overlap(defender_mask, offset) is not None
+
+    def defender_sprite(self, defender):
+        """
+        Return the current animation frame of
+        a defender and where it is drawn
+        Args:
+            defender: the FieldDefender
+        Return:
+            Tuple of the frame surface, the
+            x-position and the bobbed y-position
+            of the center of the frame
+        """
+        current_img = defender.frames[self._frame_id()]
+        if not self.animate:
+            return (current_img, defender.x, defender.y)
+        # Bobbing offset (small up/down sine wave)
+        bob_offset = int(3 * math.sin((self.anim_counter + defender.phase) / 12.0))
+        return (current_img, defender.x, defender.y + bob_offset)
+
+    def _frame_id(self):
+        """
+        Return the index of the animation frame
+        every defender shows, switching every
+        10 ticks while animated
+        """
+        if not self.animate:
+            return 0
+        return 0 if (self.anim_counter // 10) % 2 == 0 else 1
+
+    def move_ball(self, user_input):
+        """
+        Move the ball one frame from the held
+        arrow keys, with friction and the speed
+        limit, keeping it on the field
+        Args:
+            user_input: mapping from the arrow
+            key constants to whether they are held
+        Return: No returns
+        """
+        # --- Ball physics with smooth motion ---
+        acceleration = 1.0
+        if user_input[pygame.K_LEFT]:
+            self.ball_vx -= acceleration
+        if user_input[pygame.K_RIGHT]:
+            self.ball_vx += acceleration
+        if user_input[pygame.K_UP]:
+            self.ball_vy -= acceleration
+        if user_input[pygame.K_DOWN]:
+            self.ball_vy += acceleration
+
+        # Apply friction
+        friction = 0.90
+        self.ball_vx *= friction
+        self.ball_vy *= friction
+
+        # Limit maximum speed
+        speed = (self.ball_vx**2 + self.ball_vy**2) ** 0.5
+        if speed > self.max_speed and speed > 0:
+            scale = self.max_speed / speed
+            self.ball_vx *= scale
+            self.ball_vy *= scale
+
+        self.ball_x += self.ball_vx
+        self.ball_y += self.ball_vy
+
+        # Keep ball within field bounds
+        self.ball_x = max(100, min(self.ball_x, 900))
+        self.ball_y = max(150, min(self.ball_y, self.length - 50))
+
+    def nearest_defender(self):
+        """
+        Return the x and bobbed y-position of
+        the defender nearest the ball, None
+        when there are no defenders
+        """
+        nearest = None
+        nearest_dist_sq = None
+        for defender in self.defenders:
+            _, defender_x, draw_y = self.defender_sprite(defender)
+            dx_ball = self.ball_x - defender_x
+            dy_ball = self.ball_y - draw_y
+            dist_sq = dx_ball * dx_ball + dy_ball * dy_ball
+            if nearest_dist_sq is None or dist_sq < nearest_dist_sq:
+                nearest_dist_sq = dist_sq
+                nearest = (defender_x, draw_y)
+        return nearest
+
+    def escape_assist(self):
+        """
+        Auto-escape / dribble assist: push the
+        ball away from nearest_def when it is
+        close, see escape_force
+        """
+        if self.nearest_def is None:
+            return
+        push_x, push_y = escape_force(
+            self.ball_x,
+            self.ball_y,
+            self.nearest_def[0],
+            self.nearest_def[1],
+            self.danger_radius,
+            self.max_escape_force,
+        )
+        self.ball_vx += push_x
+        self.ball_vy += push_y
+
+    def step(self, user_input):
+        """
+        Advance the match by one frame
+        Args:
+            user_input: mapping from the arrow
+            key constants to whether they are held
+        Return:
+            None for an ordinary frame, "goal" when
+            the ball went in and the next level was
+            set up, "tackle" when a life was lost and
+            "game_over" when the last life was lost
+        """
+        self.anim_counter += 1
+        self.move_ball(user_input)
+        ball_coord = self.ball_rect()
+        if self.pursuers:
+            self.flow.set_target(self.ball_x, self.ball_y)
+
+        # Defenders: CONSTANT PATTERNS (horizontal + vertical)
+        nearest_dist_sq = None
+        self.nearest_def = None
+        ball_x, ball_y = self.ball_x, self.ball_y
+        bottom = self.length - 200
+        frame_id = self._frame_id()
+        animate = self.animate
+        counter = self.anim_counter
+        for defender in self.defenders:
+            vx = defender.vx
+            vy = defender.vy
+            if defender.pursuer:
+                vx, vy = self._pursue(defender.x, defender.y, vx, vy)
+
+            defender_x = defender.x + vx
+            defender_y = defender.y + vy
+
+            # Bounce horizontally between 150 and 850
+            if defender_x <= 150 or defender_x >= 850:
+                vx = -vx
+                defender_x += vx  # move back inside after bounce
+
+            # Bounce vertically between 200 and 200 from the end
+            if defender_y <= 200 or defender_y >= bottom:
+                vy = -vy
+                defender_y += vy
+
+            defender.x = defender_x
+            defender.y = defender_y
+            defender.vx = vx
+            defender.vy = vy
+
+            # Bobbing as in defender_sprite, without the tuple
+            draw_y = defender_y
+            if animate:
+                draw_y += int(3 * math.sin((counter + defender.phase) / 12.0))
+
+            # Track nearest defender (using bobbed draw_y for realism)
+            dx_ball = ball_x - defender_x
+            dy_ball = ball_y - draw_y
+            dist_sq = dx_ball * dx_ball + dy_ball * dy_ball
+            if nearest_dist_sq is None or dist_sq < nearest_dist_sq:
+                nearest_dist_sq = dist_sq
+                self.nearest_def = (defender_x, draw_y)
+
+            # Pixel test only when the ball is within reach
+            reach = defender.reach
+            if -reach < dx_ball < reach and -reach < dy_ball < reach:
+                sprite = (defender.frames[frame_id], defender_x, draw_y)
+                if self.ball_hits(ball_coord, defender, sprite):
+                    return self._tackle()
+
+        self.escape_assist()
+
+        # Goal collision: level up
+        if ball_coord.colliderect(self.goal_rect):
+            self.score += 1
+            # Increase difficulty: next level, more defenders + faster
+            self.setup_level(self.level + 1)
+            self.reset_ball()
+            return "goal"
+        return None
+
+    def _pursue(self, defender_x, defender_y, vx, vy):
+        """
+        Turn a pursuer's velocity toward the
+        ball along the flow field
+        Args:
+            defender_x: float x-position of the defender
+            defender_y: float y-position of the defender
+            vx: float x velocity of the defender
+            vy: float y velocity of the defender
+        Return:
+            Tuple of the new x and y velocity,
+            unchanged when the ball is out of range
+        """
+        dx = self.ball_x - defender_x
+        dy = self.ball_y - defender_y
+        dist_sq = dx * dx + dy * dy
+        if dist_sq > self.pursuit_radius * self.pursuit_radius:
+            return (vx, vy)
+        flow_x, flow_y = self.flow.direction(defender_x, defender_y)
+        if flow_x == 0.0 and flow_y == 0.0:
+            # Same cell as the ball: head straight for it
+            if dist_sq == 0:
+                return (vx, vy)
+            dist = dist_sq**0.5
+            flow_x, flow_y = dx / dist, dy / dist
+        speed = self.pursuer_speed
+        vx += (flow_x * speed - vx) * self.pursuit_turn
+        vy += (flow_y * speed - vy) * self.pursuit_turn
+        return (vx, vy)
+
+    def _tackle(self):
+        """
+        Lose a life after the ball hit a defender
+        Return:
+            "game_over" when no lives are left,
+            else "tackle" and the ball is reset
+        """
+        self.lives -= 1
+        if self.lives <= 0:
+            return "game_over"
+        self.reset_ball()
+        return "tackle"
@@ -0,0 +1,671 @@
+"""
+Networked head-to-head mode. An asyncio
+server runs the authoritative match of each
+player, both starting on the same level so
+they race the same defender layout, and sends
+every client delta-compressed snapshots at a
+fixed tick rate. Clients predict their own
+ball between snapshots.
+
+Play two bots against each other on localhost
+over a slow, lossy link and print the report:
+    python soccer_game_field_network.py local --latency 0.05 --loss 0.05
+Or run the server and clients separately:
+    python soccer_game_field_network.py server --port 5555
+    python soccer_game_field_network.py client --host 127.0.0.1
+"""
+
+import argparse
+import asyncio
+import random
+import struct
+import time
+import pygame
+from soccer_game_field_model import Match
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_controller import get_ball_move
+from soccer_game_field_stats import FrameStats
+from soccer_game_field_view import UpFieldView
+
+ARROW_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+POS_SCALE = 8  # snapshot positions are in 1/8 pixels
+VEL_SCALE = 256  # and velocities in 1/256 pixels per tick
+HISTORY = 64  # snapshots kept on each side as delta bases
+INPUT_REDUNDANCY = 4  # inputs resent in every packet to ride out loss
+
+HELLO = b"H"
+WELCOME = b"W"
+INPUT = b"I"
+SNAPSHOT = b"S"
+WELCOME_FORMAT = "!cBB"  # kind, player id, starting level
+INPUT_HEADER = "!cIB"  # kind, acked snapshot tick, input count
+INPUT_FORMAT = "!IB"  # input sequence number, held keys
+SNAPSHOT_HEADER = "!cIIIH"  # kind, tick, base tick, input seq, count
+
+
+def pack_keys(user_input):
+    """
+    Return the held arrow keys as a bitmask
+    Args:
+        user_input: mapping from the arrow
+        key constants to whether they are held
+    """
+    bits = 0
+    for index, key in enumerate(ARROW_KEYS):
+        if user_input[key]:
+            bits |= 1 << index
+    return bits
+
+
+def unpack_keys(bits):
+    """
+    Return a dictionary of the held arrow
+    keys from a bitmask made by pack_keys
+    """
+    return {key: bool(bits & (1 << i)) for i, key in enumerate(ARROW_KEYS)}
+
+
+def _clamp16(value):
+    """
+    Round and clamp a value into a signed 16 bit integer
+    """
+    return max(-32768, min(32767, int(round(value))))
+
+
+def snapshot_values(match, opponent):
+    """
+    Return the state one player sees as a
+    tuple of small integers: level, score,
+    lives, their ball, the opponent's ball
+    and score, then every defender position
+    Args:
+        match: the player's Match
+        opponent: the opponent's Match
+    """
+    values = [
+        match.level,
+        match.score,
+        match.lives,
+        _clamp16(match.ball_x * POS_SCALE),
+        _clamp16(match.ball_y * POS_SCALE),
+        _clamp16(match.ball_vx * VEL_SCALE),
+        _clamp16(match.ball_vy * VEL_SCALE),
+        _clamp16(opponent.ball_x * POS_SCALE),
+        _clamp16(opponent.ball_y * POS_SCALE),
+        opponent.score,
+    ]
+    for defender in match.defenders:
+        values.append(_clamp16(defender.x * POS_SCALE))
+        values.append(_clamp16(defender.y * POS_SCALE))
+    return tuple(_clamp16(value) for value in values)
+
+
+def encode_snapshot(tick, input_seq, values, base_tick=0, base_values=None):
+    """
+    Encode a snapshot as the values that changed
+    since a base snapshot the client already has.
+    Without a base, or when the number of values
+    changed with the level, every value is sent.
+    Args:
+        tick: integer server tick of the snapshot
+        input_seq: integer of the last client
+        input applied
+        values: tuple from snapshot_values
+        base_tick: integer tick of the base, 0 for none
+        base_values: tuple of the base snapshot
+    Returns:
+        Bytes of the packet
+    """
+    count = len(values)
+    if base_values is None or len(base_values) != count:
+        base_tick = 0
+        base_values = (None,) * count
+    mask = bytearray((count + 7) // 8)
+    changed = []
+    for index, value in enumerate(values):
+        if value != base_values[index]:
+            mask[index // 8] |= 1 << (index % 8)
+            changed.append(value)
+    header = struct.pack(SNAPSHOT_HEADER, SNAPSHOT, tick, base_tick, input_seq, count)
+    return header + bytes(mask) + struct.pack(f"!{len(changed)}h", *changed)
+
+
+def decode_snapshot(data, history):
+    """
+    Decode a snapshot packet against the
+    snapshots already received
+    Args:
+        data: bytes of the packet
+        history: dictionary from tick to the
+        values of received snapshots
+    Returns:
+        Tuple of the tick, the input sequence
+        and the values, or None when the base
+        snapshot is no longer known
+    """
+    header_size = struct.calcsize(SNAPSHOT_HEADER)
+    _, tick, base_tick, input_seq, count = struct.unpack_from(
+        SNAPSHOT_HEADER, data
+    )
+    if base_tick == 0:
+        base_values = (0,) * count
+    elif base_tick in history:
+        base_values = history[base_tick]
+    else:
+        return None
+    mask = data[header_size : header_size + (count + 7) // 8]
+    changed_at = header_size + len(mask)
+    changed = struct.unpack_from(
+        f"!{(len(data) - changed_at) // 2}h", data, changed_at
+    )
+    values = []
+    changed_index = 0
+    for index in range(count):
+        if mask[index // 8] & (1 << (index % 8)):
+            values.append(changed[changed_index])
+            changed_index += 1
+        else:
+            values.append(base_values[index])
+    return (tick, input_seq, tuple(values))
+
+
+class LossyLink:
+    """
+    Stands in front of a datagram transport and
+    delays, reorders and drops packets to test
+    the game over a bad network on localhost
+
+    Attributes:
+        transport: the real datagram transport
+        latency: float seconds every packet waits
+        jitter: float most extra random seconds
+        loss: float chance from 0 to 1 a packet
+        is dropped
+        dropped: integer of packets dropped
+    """
+
+    def __init__(self, transport, latency=0.0, jitter=0.0, loss=0.0, seed=None):
+        self.transport = transport
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.dropped = 0
+        self.rng = random.Random(seed)
+
+    def sendto(self, data, addr=None):
+        """
+        Send a packet late, or not at all
+        """
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        delay = self.latency + self.rng.uniform(0, self.jitter)
+        if delay <= 0:
+            self._deliver(data, addr)
+        else:
+            asyncio.get_running_loop().call_later(delay, self._deliver, data, addr)
+
+    def _deliver(self, data, addr):
+        """
+        Hand a packet to the real transport
+        """
+        if self.transport.is_closing():
+            return
+        if addr is None:
+            self.transport.sendto(data)
+        else:
+            self.transport.sendto(data, addr)
+
+    def close(self):
+        """
+        Close the real transport
+        """
+        self.transport.close()
+
+
+class _RemotePlayer:
+    """
+    Server side record of one connected client
+    """
+
+    def __init__(self, player_id, addr, match):
+        self.player_id = player_id
+        self.addr = addr
+        self.match = match
+        self.keys = unpack_keys(0)
+        self.inputs = []
+        self.queued_seq = 0
+        self.applied_seq = 0
+        self.acked_tick = 0
+        self.history = {}
+        self.finished = False
+        self.bytes_sent = 0
+        self.snapshots = 0
+        self.full_snapshots = 0
+
+
+class HeadToHeadServer(asyncio.DatagramProtocol):
+    """
+    Authoritative server of a head-to-head
+    match. Every tick it applies one queued
+    input per player, steps their matches and
+    sends each player a snapshot
+
+    Attributes:
+        level: integer starting level of both players
+        players: integer of players to wait for
+        tick_rate: integer ticks per second
+        shim: dictionary of LossyLink arguments,
+        None to send straight to the network
+        tick: integer of ticks played
+        tick_stats: FrameStats of tick processing times
+    """
+
+    def __init__(self, level=1, players=2, tick_rate=60, shim=None):
+        self.level = level
+        self.players = players
+        self.tick_rate = tick_rate
+        self.shim = shim
+        self.transport = None
+        self.remote = {}
+        self.tick = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self.tick_stats = FrameStats(budget=1 / tick_rate)
+        self.all_joined = asyncio.Event()
+
+    def connection_made(self, transport):
+        if self.shim:
+            transport = LossyLink(transport, **self.shim)
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        kind = data[:1]
+        if kind == HELLO:
+            self._join(addr)
+        elif kind == INPUT and addr in self.remote:
+            self._queue_inputs(self.remote[addr], data)
+
+    def _join(self, addr):
+        """
+        Welcome a new player, or welcome again
+        a player whose welcome was lost
+        """
+        if addr not in self.remote:
+            if len(self.remote) >= self.players:
+                return
+            player_id = len(self.remote)
+            self.remote[addr] = _RemotePlayer(player_id, addr, Match(self.level))
+            if len(self.remote) == self.players:
+                self.all_joined.set()
+        welcome = struct.pack(
+            WELCOME_FORMAT, WELCOME, self.remote[addr].player_id, self.level
+        )
+        self.transport.sendto(welcome, addr)
+
+    def _queue_inputs(self, player, data):
+        """
+        Queue the inputs of a packet that the
+        server has not seen yet, in order
+        """
+        header_size = struct.calcsize(INPUT_HEADER)
+        input_size = struct.calcsize(INPUT_FORMAT)
+        _, acked_tick, count = struct.unpack_from(INPUT_HEADER, data)
+        player.acked_tick = max(player.acked_tick, acked_tick)
+        for index in range(count):
+            seq, bits = struct.unpack_from(
+                INPUT_FORMAT, data, header_size + index * input_size
+            )
+            if seq > player.queued_seq:
+                player.inputs.append((seq, bits))
+                player.queued_seq = seq
+        # A client running ahead only adds latency; drop the backlog
+        del player.inputs[:-INPUT_REDUNDANCY * 2]
+
+    async def run(self, duration=None):
+        """
+        Wait for every player, then play ticks at
+        the tick rate until both players are out
+        of lives or the duration has passed
+        Args:
+            duration: float seconds to play, None
+            to play until both games are over
+        Returns:
+            The report dictionary, see report
+        """
+        await self.all_joined.wait()
+        loop = asyncio.get_running_loop()
+        period = 1 / self.tick_rate
+        self.started_at = loop.time()
+        next_tick = self.started_at
+        while not all(player.finished for player in self.remote.values()):
+            if duration is not None and loop.time() - self.started_at >= duration:
+                break
+            tick_start = time.perf_counter()
+            self.play_tick()
+            self.tick_stats.record(time.perf_counter() - tick_start)
+            next_tick += period
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+        self.elapsed = loop.time() - self.started_at
+        return self.report()
+
+    def play_tick(self):
+        """
+        Step every match by one frame and
+        send every player their snapshot
+        """
+        self.tick += 1
+        players = list(self.remote.values())
+        for player in players:
+            if player.finished:
+                continue
+            if player.inputs:
+                player.applied_seq, bits = player.inputs.pop(0)
+                player.keys = unpack_keys(bits)
+            if player.match.step(player.keys) == "game_over":
+                player.finished = True
+
+        for player in players:
+            opponent = players[(player.player_id + 1) % len(players)]
+            values = snapshot_values(player.match, opponent.match)
+            base_values = player.history.get(player.acked_tick)
+            packet = encode_snapshot(
+                self.tick,
+                player.applied_seq,
+                values,
+                player.acked_tick,
+                base_values,
+            )
+            if base_values is None:
+                player.full_snapshots += 1
+            player.history[self.tick] = values
+            player.history.pop(self.tick - HISTORY, None)
+            player.snapshots += 1
+            player.bytes_sent += len(packet)
+            self.transport.sendto(packet, player.addr)
+
+    def report(self):
+        """
+        Return a dictionary with the tick
+        processing times and, per client, the
+        scores and bandwidth used
+        """
+        elapsed = self.elapsed or 1.0
+        clients = []
+        for player in self.remote.values():
+            clients.append(
+                {
+                    "player": player.player_id,
+                    "score": player.match.score,
+                    "level": player.match.level,
+                    "bytes_per_second": round(player.bytes_sent / elapsed),
+                    "bytes_per_snapshot": round(
+                        player.bytes_sent / max(1, player.snapshots), 1
+                    ),
+                    "full_snapshots": player.full_snapshots,
+                    "snapshots": player.snapshots,
+                }
+            )
+        return {"ticks": self.tick, "tick": self.tick_stats.summary(), "clients": clients}
+
+
+class HeadToHeadClient(asyncio.DatagramProtocol):
+    """
+    Client of a head-to-head match. Keeps a
+    local Match updated from server snapshots
+    and predicts its own ball by replaying the
+    inputs the server has not applied yet
+
+    Attributes:
+        player_id: integer given by the server
+        match: the local Match, None until welcomed
+        opponent: tuple of the opponent's ball
+        x and y and their score
+        latest_tick: integer tick of the newest snapshot
+        bytes_received: integer of snapshot bytes received
+    """
+
+    def __init__(self, shim=None):
+        self.shim = shim
+        self.transport = None
+        self.player_id = None
+        self.match = None
+        self.opponent = (500.0, 900.0, 0)
+        self.history = {}
+        self.latest_tick = 0
+        self.seq = 0
+        self.pending = []
+        self.bytes_received = 0
+        self.joined = asyncio.Event()
+
+    def connection_made(self, transport):
+        if self.shim:
+            transport = LossyLink(transport, **self.shim)
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        kind = data[:1]
+        if kind == WELCOME and self.match is None:
+            _, self.player_id, level = struct.unpack(WELCOME_FORMAT, data)
+            self.match = Match(level)
+            self.joined.set()
+        elif kind == SNAPSHOT and self.match is not None:
+            self.bytes_received += len(data)
+            decoded = decode_snapshot(data, self.history)
+            if decoded is not None:
+                self._apply(*decoded)
+
+    async def join(self, retry=0.2):
+        """
+        Say hello to the server until it
+        welcomes this client
+        """
+        while not self.joined.is_set():
+            self.transport.sendto(HELLO)
+            try:
+                await asyncio.wait_for(self.joined.wait(), retry)
+            except asyncio.TimeoutError:
+                pass
+
+    def send_input(self, user_input):
+        """
+        Send this tick's keys to the server
+        and predict the ball moving with them
+        Args:
+            user_input: mapping from the arrow
+            key constants to whether they are held
+        """
+        self.seq += 1
+        self.pending.append((self.seq, pack_keys(user_input)))
+        self._predict(user_input)
+
+        recent = self.pending[-INPUT_REDUNDANCY:]
+        packet = struct.pack(INPUT_HEADER, INPUT, self.latest_tick, len(recent))
+        for seq, bits in recent:
+            packet += struct.pack(INPUT_FORMAT, seq, bits)
+        self.transport.sendto(packet)
+
+    def _apply(self, tick, input_seq, values):
+        """
+        Take the state of a snapshot and replay
+        the inputs the server has not applied
+        """
+        self.history[tick] = values
+        # Snapshots lost on the way leave gaps, so drop all the old ones
+        for old_tick in [t for t in self.history if t <= tick - HISTORY]:
+            del self.history[old_tick]
+        if tick <= self.latest_tick:
+            return  # arrived out of order, already have newer state
+        self.latest_tick = tick
+
+        match = self.match
+        level, match.score, match.lives = values[0], values[1], values[2]
+        if level != match.level:
+            match.setup_level(level)
+        match.anim_counter = tick
+        match.ball_x = values[3] / POS_SCALE
+        match.ball_y = values[4] / POS_SCALE
+        match.ball_vx = values[5] / VEL_SCALE
+        match.ball_vy = values[6] / VEL_SCALE
+        self.opponent = (values[7] / POS_SCALE, values[8] / POS_SCALE, values[9])
+        for index, defender in enumerate(match.defenders):
+            defender.x = values[10 + 2 * index] / POS_SCALE
+            defender.y = values[11 + 2 * index] / POS_SCALE
+
+        self.pending = [item for item in self.pending if item[0] > input_seq]
+        for _, bits in self.pending:
+            self._predict(unpack_keys(bits))
+
+    def _predict(self, user_input):
+        """
+        Move the local ball one frame as the
+        server will, escape assist included
+        """
+        match = self.match
+        match.move_ball(user_input)
+        match.nearest_def = match.nearest_defender()
+        match.escape_assist()
+
+
+async def play_client(
+    host, port, bot=None, view=None, tick_rate=60, duration=None, shim=None
+):
+    """
+    Connect to a server and play until out of
+    lives or the duration has passed
+    Args:
+        host: string host of the server
+        port: integer port of the server
+        bot: BotController playing, None for the keyboard
+        view: UpFieldView to draw in, None for headless
+        tick_rate: integer inputs sent per second
+        duration: float seconds to play, None for no limit
+        shim: dictionary of LossyLink arguments
+    Returns:
+        The HeadToHeadClient after the match
+    """
+    loop = asyncio.get_running_loop()
+    transport, client = await loop.create_datagram_endpoint(
+        lambda: HeadToHeadClient(shim), remote_addr=(host, port)
+    )
+    await client.join()
+    period = 1 / tick_rate
+    started_at = loop.time()
+    next_tick = started_at
+    while client.match.lives > 0:
+        if duration is not None and loop.time() - started_at >= duration:
+            break
+        if bot is None:
+            user_input = get_ball_move()
+        else:
+            user_input = bot.get_ball_move(client.match)
+        client.send_input(user_input)
+        if view is not None:
+            view.draw_head_to_head(client)
+        next_tick += period
+        await asyncio.sleep(max(0.0, next_tick - loop.time()))
+    transport.close()
+    return client
+
+
+async def run_local(
+    seconds=10.0, level=1, port=0, tick_rate=60, latency=0.0, loss=0.0, seed=None
+):
+    """
+    Run a server and two bot clients on
+    localhost through a simulated bad link
+    Args:
+        seconds: float seconds to play
+        level: integer starting level
+        port: integer server port, 0 for any free port
+        tick_rate: integer ticks per second
+        latency: float seconds of one-way delay
+        loss: float chance from 0 to 1 a packet is lost
+        seed: integer seed of the simulated link
+    Returns:
+        Tuple of the server report and the
+        two HeadToHeadClient instances
+    """
+    loop = asyncio.get_running_loop()
+    shim = {"latency": latency, "jitter": latency / 2, "loss": loss, "seed": seed}
+    transport, server = await loop.create_datagram_endpoint(
+        lambda: HeadToHeadServer(level, 2, tick_rate, shim),
+        local_addr=("127.0.0.1", port),
+    )
+    port = transport.get_extra_info("sockname")[1]
+    clients = [
+        play_client(
+            "127.0.0.1",
+            port,
+            EvasiveBot(level=level),
+            tick_rate=tick_rate,
+            duration=seconds,
+            shim=shim,
+        )
+        for _ in range(2)
+    ]
+    report, *players = await asyncio.gather(server.run(seconds), *clients)
+    transport.close()
+    return (report, players)
+
+
+def main():
+    """
+    Parse the command line and run the
+    server, a client, or a local bot match
+    """
+    parser = argparse.ArgumentParser(description="Head-to-head soccer game")
+    parser.add_argument("mode", choices=("server", "client", "local"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--level", type=int, default=1)
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--seconds", type=float, default=None)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--loss", type=float, default=0.0)
+    parser.add_argument("--bot", action="store_true")
+    args = parser.parse_args()
+    shim = {"latency": args.latency, "jitter": args.latency / 2, "loss": args.loss}
+
+    if args.mode == "local":
+        report, _ = asyncio.run(
+            run_local(
+                args.seconds or 10.0,
+                args.level,
+                tick_rate=args.tick_rate,
+                latency=args.latency,
+                loss=args.loss,
+            )
+        )
+        print(report)
+    elif args.mode == "server":
+
+        async def serve():
+            loop = asyncio.get_running_loop()
+            transport, server = await loop.create_datagram_endpoint(
+                lambda: HeadToHeadServer(args.level, 2, args.tick_rate, shim),
+                local_addr=(args.host, args.port),
+            )
+            report = await server.run(args.seconds)
+            transport.close()
+            return report
+
+        print(asyncio.run(serve()))
+    else:
+        view = UpFieldView()
+        bot = EvasiveBot(level=args.level) if args.bot else None
+        asyncio.run(
+            play_client(
+                args.host,
+                args.port,
+                bot,
+                view,
+                args.tick_rate,
+                args.seconds,
+                shim,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
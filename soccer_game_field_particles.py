@@ -0,0 +1,251 @@
+"""
+Particle effects: confetti for goals, dust
+for tackles and a trail behind the ball.
+
+Every particle lives in one preallocated
+pool of typed arrays, so effects never make
+objects per particle or grow while playing.
+All live particles are updated in one pass
+and drawn with one batched blit. A budget
+caps the live particles; emitting near the
+budget emits fewer, so effects thin out on
+slow machines instead of slowing the frame.
+"""
+
+import math
+import random
+from array import array
+from itertools import islice
+import pygame
+from soccer_game_field_diagnostics import SURFACES
+
+# Per kind: colors, size in logical pixels, life in frames,
+# speed, spread of the direction in radians around up,
+# gravity and drag per frame
+PARTICLE_KINDS = {
+    "confetti": {
+        "colors": [
+            (255, 215, 0),
+            (220, 40, 60),
+            (40, 120, 255),
+            (255, 255, 255),
+        ],
+        "size": 10,
+        "life": 90,
+        "speed": 9.0,
+        "spread": 1.2,
+        "gravity": 0.25,
+        "drag": 0.98,
+    },
+    "dust": {
+        "colors": [(170, 140, 90), (140, 115, 75)],
+        "size": 12,
+        "life": 40,
+        "speed": 3.0,
+        "spread": 3.2,
+        "gravity": -0.02,
+        "drag": 0.92,
+    },
+    "trail": {
+        "colors": [(255, 255, 255)],
+        "size": 8,
+        "life": 18,
+        "speed": 0.4,
+        "spread": 3.2,
+        "gravity": 0.0,
+        "drag": 0.9,
+    },
+}
+
+# Sprites per color, from opaque to faded, picked by life left
+FADE_STEPS = 4
+
+
+class ParticleSystem:
+    """
+    Pool of particles of every kind
+
+    Attributes:
+        capacity: integer size of the pool
+        budget: integer of particles allowed
+        alive at once, at most capacity
+        count: integer of particles alive, kept
+        in the first count slots of the arrays
+        x, y, vx, vy, life: float arrays of the
+        position, velocity and frames left of
+        each slot
+        kind, color: byte arrays of the kind and
+        color index of each slot
+        dropped: integer of particles not emitted
+        because of the budget
+    """
+
+    def __init__(self, capacity=4096, budget=None, seed=None):
+        self.capacity = capacity
+        self.budget = capacity if budget is None else min(budget, capacity)
+        self.count = 0
+        self.x = array("f", bytes(4 * capacity))
+        self.y = array("f", bytes(4 * capacity))
+        self.vx = array("f", bytes(4 * capacity))
+        self.vy = array("f", bytes(4 * capacity))
+        self.life = array("f", bytes(4 * capacity))
+        self.kind = array("B", bytes(capacity))
+        self.color = array("B", bytes(capacity))
+        self.dropped = 0
+        self.random = random.Random(seed)
+        self.kind_names = list(PARTICLE_KINDS)
+        self._kinds = [PARTICLE_KINDS[name] for name in self.kind_names]
+        # Per kind constants, looked up by kind index every frame
+        self._gravity = [k["gravity"] for k in self._kinds]
+        self._drag = [k["drag"] for k in self._kinds]
+        self._lives = [k["life"] for k in self._kinds]
+        self._half = [k["size"] / 2 for k in self._kinds]
+        # One [sprite, [x, y]] pair per slot, refilled for each blits
+        self._pairs = [[None, [0.0, 0.0]] for _ in range(capacity)]
+        self._sprites = None
+
+    def set_budget(self, budget):
+        """
+        Change the particles allowed alive,
+        removing the newest beyond it
+        """
+        self.budget = max(0, min(budget, self.capacity))
+        self.count = min(self.count, self.budget)
+
+    def clear(self):
+        """
+        Remove every particle
+        """
+        self.count = 0
+
+    def emit(self, name, x, y, amount):
+        """
+        Add particles of a kind at a position
+        Args:
+            name: string kind, a key of PARTICLE_KINDS
+            x: float logical x position
+            y: float logical y position
+            amount: integer of particles wanted
+        Returns:
+            Integer of particles added
+        """
+        free = self.budget - self.count
+        if free <= 0:
+            self.dropped += amount
+            return 0
+        # Scale down with the room left, so bursts thin out
+        # gradually as the budget fills instead of cutting off
+        wanted = amount * free // self.budget if self.budget else 0
+        added = min(max(wanted, 1), free)
+        self.dropped += amount - added
+
+        kind_index = self.kind_names.index(name)
+        kind = self._kinds[kind_index]
+        colors = len(kind["colors"])
+        rng = self.random
+        for _ in range(added):
+            i = self.count
+            spread = rng.uniform(-kind["spread"], kind["spread"]) / 2
+            angle = -math.pi / 2 + spread
+            speed = kind["speed"] * rng.uniform(0.4, 1.0)
+            self.x[i] = x
+            self.y[i] = y
+            self.vx[i] = speed * math.cos(angle)
+            self.vy[i] = speed * math.sin(angle)
+            self.life[i] = kind["life"] * rng.uniform(0.6, 1.0)
+            self.kind[i] = kind_index
+            self.color[i] = rng.randrange(colors)
+            self.count += 1
+        return added
+
+    def update(self):
+        """
+        Move every live particle one frame and
+        remove the ones that ran out of life
+        """
+        x, y, vx, vy, life = self.x, self.y, self.vx, self.vy, self.life
+        kind = self.kind
+        gravity = self._gravity
+        drag = self._drag
+        i = 0
+        count = self.count
+        while i < count:
+            left = life[i] - 1
+            if left <= 0:
+                # Move the last particle into this slot
+                count -= 1
+                x[i] = x[count]
+                y[i] = y[count]
+                vx[i] = vx[count]
+                vy[i] = vy[count]
+                life[i] = life[count]
+                kind[i] = kind[count]
+                self.color[i] = self.color[count]
+                continue
+            k = kind[i]
+            life[i] = left
+            vx[i] = vx[i] * drag[k]
+            vy[i] = vy[i] * drag[k] + gravity[k]
+            x[i] += vx[i]
+            y[i] += vy[i]
+            i += 1
+        self.count = count
+
+    def make_sprites(self, scale_x, scale_y):
+        """
+        Make the sprite of every kind, color and
+        fade step at the given scale, once
+        """
+        self._sprites = []
+        for kind in self._kinds:
+            size = (
+                max(1, round(kind["size"] * scale_x)),
+                max(1, round(kind["size"] * scale_y)),
+            )
+            by_color = []
+            for color in kind["colors"]:
+                steps = []
+                for step in range(FADE_STEPS):
+                    sprite = SURFACES.track(pygame.Surface(size), "particle")
+                    sprite.fill(color)
+                    sprite.set_alpha(255 * (step + 1) // FADE_STEPS)
+                    steps.append(sprite)
+                by_color.append(steps)
+            self._sprites.append(by_color)
+
+    def draw(self, renderer, scale_x, scale_y, camera_y=0.0):
+        """
+        Draw every live particle with one
+        batched blit
+        Args:
+            renderer: renderer of the view
+            scale_x: float internal pixels per logical x
+            scale_y: float internal pixels per logical y
+            camera_y: float logical y of the top of
+            the screen on the pitch
+        """
+        if self._sprites is None:
+            self.make_sprites(scale_x, scale_y)
+        if self.count:
+            self._fill_pairs(scale_x, scale_y, camera_y)
+            renderer.blits(islice(self._pairs, self.count))
+
+    def _fill_pairs(self, scale_x, scale_y, camera_y):
+        """
+        Set the sprite and top left position of
+        every live particle in its pair
+        """
+        sprites = self._sprites
+        pairs = self._pairs
+        x, y, life = self.x, self.y, self.life
+        kind, color = self.kind, self.color
+        lives, half = self._lives, self._half
+        last = FADE_STEPS - 1
+        for i in range(self.count):
+            k = kind[i]
+            pair = pairs[i]
+            step = min(last, int(life[i] * FADE_STEPS / lives[k]))
+            pair[0] = sprites[k][color[i]][step]
+            dest = pair[1]
+            dest[0] = (x[i] - half[k]) * scale_x
+            dest[1] = (y[i] - half[k] - camera_y) * scale_y
@@ -0,0 +1,157 @@
+"""
+Adaptive quality: a governor that watches
+how long frames take against the 60 FPS
+budget and steps the view's quality down
+through tiers while frames run over, and
+back up once there is headroom again.
+
+Stepping down needs a full window of slow
+frames, stepping up a longer run of fast
+ones, and the two thresholds are far apart,
+so one hitch or a frame time near the
+budget never makes the quality flicker.
+"""
+
+from collections import deque
+
+# Quality tiers from best to cheapest; each keeps the savings
+# of the tiers above it. animate runs and bobs the defenders,
+# hud_alpha blends the HUD bar, scale is the share of the
+# internal resolution drawn at and fps caps the frame rate
+QUALITY_TIERS = [
+    {
+        "name": "full",
+        "animate": True,
+        "hud_alpha": True,
+        "scale": 1.0,
+        "fps": 60,
+    },
+    {
+        "name": "still defenders",
+        "animate": False,
+        "hud_alpha": True,
+        "scale": 1.0,
+        "fps": 60,
+    },
+    {
+        "name": "opaque HUD",
+        "animate": False,
+        "hud_alpha": False,
+        "scale": 1.0,
+        "fps": 60,
+    },
+    {
+        "name": "low resolution",
+        "animate": False,
+        "hud_alpha": False,
+        "scale": 0.7,
+        "fps": 60,
+    },
+    {
+        "name": "30 FPS",
+        "animate": False,
+        "hud_alpha": False,
+        "scale": 0.7,
+        "fps": 30,
+    },
+]
+
+
+class QualityGovernor:
+    """
+    Picks a quality tier from the rolling
+    mean of recent frame times
+
+    Attributes:
+        tiers: list of tier dictionaries,
+        best first, see QUALITY_TIERS
+        tier: integer index of the current tier
+        budget: float seconds one frame may take
+        slow: share of the budget above which
+        the quality steps down
+        fast: share of the budget below which
+        the quality steps up
+        hold: integer of frames since the last
+        change needed before stepping up
+        times: deque of the recent frame times
+        changes: integer of tier changes made
+    """
+
+    def __init__(
+        self,
+        tiers=None,
+        budget=1 / 60,
+        window=60,
+        slow=1.0,
+        fast=0.6,
+        hold=300,
+    ):
+        self.tiers = QUALITY_TIERS if tiers is None else tiers
+        self.tier = 0
+        self.budget = budget
+        self.slow = slow
+        self.fast = fast
+        self.hold = hold
+        self.times = deque(maxlen=window)
+        self.total = 0.0
+        self.since_change = 0
+        self.changes = 0
+
+    def settings(self):
+        """
+        Return the dictionary of the current tier
+        """
+        return self.tiers[self.tier]
+
+    def mean(self):
+        """
+        Return the mean of the recent frame
+        times in seconds, 0.0 before any
+        """
+        if not self.times:
+            return 0.0
+        return self.total / len(self.times)
+
+    def record(self, seconds):
+        """
+        Add one frame time and change tier
+        when the recent frames call for it
+        Args:
+            seconds: float seconds of work the
+            frame took, without waiting for the
+            frame rate cap
+        Returns:
+            True if the tier changed
+        """
+        times = self.times
+        if len(times) == times.maxlen:
+            self.total -= times[0]
+        times.append(seconds)
+        self.total += seconds
+        self.since_change += 1
+        if len(times) < times.maxlen:
+            return False
+
+        mean = self.total / len(times)
+        if mean > self.budget * self.slow and self.tier < len(self.tiers) - 1:
+            self._change(1)
+            return True
+        if (
+            mean < self.budget * self.fast
+            and self.tier > 0
+            and self.since_change >= self.hold
+        ):
+            self._change(-1)
+            return True
+        return False
+
+    def _change(self, step):
+        """
+        Move step tiers down (positive) or up,
+        judging the new tier on fresh frames
+        """
+        self.tier += step
+        self.changes += 1
+        self.times.clear()
+        self.total = 0.0
+        self.since_change = 0
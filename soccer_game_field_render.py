@@ -0,0 +1,242 @@
+"""
+Render backends of the view. Both take
+blits in internal-resolution pixels and
+scale the finished frame to the window.
+
+SurfaceRenderer blits in software onto an
+offscreen Surface. TextureRenderer uploads
+every surface once as an SDL2 texture and
+draws each frame with texture copies, on the
+GPU or with SDL's software renderer.
+"""
+
+import weakref
+import pygame
+from soccer_game_field_diagnostics import SURFACES
+
+try:
+    from pygame._sdl2 import video as sdl2_video
+except ImportError:  # older pygame builds
+    sdl2_video = None
+
+
+class SurfaceRenderer:
+    """
+    Draws with Surface.blit onto a screen at
+    the internal resolution, scaled up to the
+    window once per frame when the sizes differ
+
+    Attributes:
+        window: the display Surface
+        screen: the Surface drawn on
+    """
+
+    name = "surface"
+
+    def __init__(self, window_size, internal_size, fullscreen=False):
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        self.window = pygame.display.set_mode(window_size, flags)
+        self.resize(internal_size)
+
+    def resize(self, internal_size):
+        """
+        Draw at a new internal resolution from
+        the next frame on, keeping the window
+        """
+        if tuple(internal_size) == self.window.get_size():
+            self.screen = self.window
+        else:
+            self.screen = SURFACES.track(
+                pygame.Surface(internal_size).convert(), "screen"
+            )
+
+    def get_size(self):
+        """
+        Return the internal resolution
+        """
+        return self.screen.get_size()
+
+    def blit(self, surface, dest):
+        """
+        Draw surface with its top left at dest,
+        a position or a rectangle
+        """
+        self.screen.blit(surface, dest)
+
+    def blits(self, pairs):
+        """
+        Draw many surfaces in one call
+        Args:
+            pairs: iterable of (surface, dest) pairs
+        """
+        self.screen.blits(pairs, doreturn=False)
+
+    def fill(self, color):
+        """
+        Fill the whole screen with a color
+        """
+        self.screen.fill(color)
+
+    def present(self):
+        """
+        Show the finished frame in the window
+        """
+        if self.screen is not self.window:
+            pygame.transform.scale(
+                self.screen, self.window.get_size(), self.window
+            )
+        pygame.display.update()
+
+
+class SubsurfaceRenderer(SurfaceRenderer):
+    """
+    Draws into one rectangle of a window
+    shared with other views, as in split
+    screen. Nothing is scaled, and present
+    does nothing: whoever owns the window
+    shows every part of it at once
+
+    Attributes:
+        window: the shared display Surface
+        screen: the subsurface drawn on
+        rect: Rect of the part of the window
+    """
+
+    name = "subsurface"
+
+    def __init__(self, window, rect):  # pylint: disable=super-init-not-called
+        self.window = window
+        self.rect = pygame.Rect(rect)
+        self.screen = window.subsurface(self.rect)
+
+    def resize(self, internal_size):
+        """
+        Panes keep the size of their part
+        of the window
+        """
+        raise pygame.error("split screen panes cannot be resized")
+
+    def present(self):
+        """
+        Leave presenting to the window's owner
+        """
+
+
+class TextureRenderer:
+    """
+    Draws with SDL2 texture copies. Each
+    surface is uploaded the first time it is
+    drawn and its texture kept as long as the
+    surface lives, so a surface must not be
+    changed once drawn. SDL scales the internal
+    resolution to the window.
+
+    Attributes:
+        window: the SDL2 Window
+        renderer: the SDL2 Renderer
+        uploads: integer of surfaces uploaded
+    """
+
+    name = "texture"
+
+    def __init__(self, window_size, internal_size, fullscreen=False, software=False):
+        if sdl2_video is None:
+            raise pygame.error("pygame._sdl2 is not available")
+        if fullscreen:
+            self.window = sdl2_video.Window(
+                "Mini Soccer Game", size=window_size, fullscreen_desktop=True
+            )
+        else:
+            self.window = sdl2_video.Window("Mini Soccer Game", size=window_size)
+        self.renderer = sdl2_video.Renderer(
+            self.window, accelerated=0 if software else -1
+        )
+        self.renderer.logical_size = tuple(internal_size)
+        self.size = tuple(internal_size)
+        self.textures = weakref.WeakKeyDictionary()
+        self.uploads = 0
+
+    def resize(self, internal_size):
+        """
+        Draw at a new internal resolution from
+        the next frame on, keeping the window
+        """
+        self.renderer.logical_size = tuple(internal_size)
+        self.size = tuple(internal_size)
+
+    def get_size(self):
+        """
+        Return the internal resolution
+        """
+        return self.size
+
+    def _texture(self, surface):
+        """
+        Return the texture of a surface,
+        uploading it the first time
+        """
+        texture = self.textures.get(surface)
+        if texture is None:
+            texture = sdl2_video.Texture.from_surface(self.renderer, surface)
+            self.textures[surface] = texture
+            self.uploads += 1
+        return texture
+
+    def blit(self, surface, dest):
+        """
+        Draw surface with its top left at dest,
+        a position or a rectangle
+        """
+        texture = self._texture(surface)
+        if isinstance(dest, pygame.Rect):
+            dest = dest.topleft
+        texture.draw(dstrect=(dest[0], dest[1], texture.width, texture.height))
+
+    def blits(self, pairs):
+        """
+        Draw many surfaces, uploading each
+        surface once
+        Args:
+            pairs: iterable of (surface, dest) pairs
+        """
+        for surface, dest in pairs:
+            self.blit(surface, dest)
+
+    def fill(self, color):
+        """
+        Fill the whole screen with a color
+        """
+        self.renderer.draw_color = tuple(color) + (255,) * (4 - len(color))
+        self.renderer.clear()
+
+    def present(self):
+        """
+        Show the finished frame in the window
+        """
+        self.renderer.present()
+
+
+def make_renderer(kind, window_size, internal_size, fullscreen=False):
+    """
+    Return the renderer of the given kind,
+    falling back to SurfaceRenderer when SDL2
+    textures cannot be used
+    Args:
+        kind: "surface", "texture", or
+        "texture-software" for SDL's software
+        renderer, as used in headless CI
+        window_size: tuple of the window size
+        internal_size: tuple of the resolution drawn at
+        fullscreen: True to fill the screen
+    """
+    if kind in ("texture", "texture-software"):
+        try:
+            return TextureRenderer(
+                window_size,
+                internal_size,
+                fullscreen,
+                software=kind == "texture-software",
+            )
+        except (pygame.error, RuntimeError) as e:
+            print("Texture renderer unavailable, using surfaces:", e)
+    return SurfaceRenderer(window_size, internal_size, fullscreen)
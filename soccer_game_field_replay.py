@@ -0,0 +1,457 @@
+"""
+Replays: runs recorded as the keys held on
+every step of the match, and an offline
+exporter turning a replay into video frames.
+
+A match plays the same for the same keys, so
+a replay is a few bytes per second of play.
+The exporter plays it back headless through
+SDL's dummy video driver, draws each frame at
+the chosen resolution and hands the raw frame
+buffers to a pool of worker processes, which
+write numbered PNGs or one raw RGB stream.
+
+    python soccer_game_field_replay.py replays/run.rpl --out clip
+    python soccer_game_field_replay.py replays/run.rpl --out clip.rgb \\
+        --format raw --size 640x640 --workers 8
+"""
+
+import argparse
+import concurrent.futures
+import multiprocessing
+import os
+import struct
+import time
+import zlib
+import pygame
+from soccer_game_field_controller import BotController
+from soccer_game_field_levels import default_levels
+from soccer_game_field_network import pack_keys
+from soccer_game_field_network import unpack_keys
+from soccer_game_field_render import SurfaceRenderer
+from soccer_game_field_splitscreen import Pane
+from soccer_game_field_view import UpFieldView
+
+# Header: magic, format version, level, pitch length, score,
+# digest of the level file, steps
+_HEADER = struct.Struct("<4sHHII32sI")
+_MAGIC = b"SRPL"
+_FORMAT = 2
+
+# Step flag stored above the four arrow key bits: the match
+# kept its defenders still, see Match.animate
+STILL = 0x10
+
+# Frames of the Game Over screen added after the last step
+GAME_OVER_FRAMES = 60
+
+
+class ReplayError(ValueError):
+    """
+    A replay file that cannot be read
+    """
+
+
+class Replay:
+    """
+    The steps of one recorded run
+
+    Attributes:
+        level: integer level the run started at
+        length: integer logical pitch length
+        score: integer final score of the run
+        digest: string hash of the level file
+        played with, None if unknown
+        steps: bytearray of one byte per match
+        step, the held keys from pack_keys and
+        the STILL flag
+    """
+
+    def __init__(self, level, length=1000, score=0, steps=None, digest=None):
+        self.level = level
+        self.length = length
+        self.score = score
+        self.digest = digest
+        self.steps = bytearray() if steps is None else bytearray(steps)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, user_input, animate=True):
+        """
+        Record the keys held for one step
+        Args:
+            user_input: mapping from the arrow
+            key constants to whether they are held
+            animate: Match.animate during the step
+        """
+        self.steps.append(pack_keys(user_input) | (0 if animate else STILL))
+
+    def inputs(self):
+        """
+        Yield the held keys and Match.animate
+        of every step, in order
+        """
+        for bits in self.steps:
+            yield unpack_keys(bits), not bits & STILL
+
+    def to_bytes(self):
+        """
+        Return the replay as the bytes of a file
+        """
+        digest = bytes(32)
+        if self.digest is not None:
+            digest = bytes.fromhex(self.digest)
+        header = _HEADER.pack(
+            _MAGIC,
+            _FORMAT,
+            self.level,
+            self.length,
+            self.score,
+            digest,
+            len(self.steps),
+        )
+        return header + bytes(self.steps)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Return the Replay of bytes made by to_bytes
+        """
+        try:
+            header = _HEADER.unpack_from(data)
+        except struct.error as e:
+            raise ReplayError(f"bad replay: {e}") from e
+        magic, version, level, length, score, digest, count = header
+        if magic != _MAGIC or version != _FORMAT:
+            raise ReplayError("not a replay of this version")
+        steps = data[_HEADER.size :]
+        if len(steps) != count:
+            raise ReplayError("replay is truncated")
+        digest = None if digest == bytes(32) else digest.hex()
+        return cls(level, length, score, steps, digest)
+
+    def check_levels(self, levels=None):
+        """
+        Raise ReplayError unless the replay was
+        recorded with the levels it will play
+        back with, as other levels play it out
+        differently
+        Args:
+            levels: LevelTable of the playback,
+            by default the shipped levels
+        """
+        levels = default_levels() if levels is None else levels
+        if self.digest is not None and self.digest != levels.digest:
+            raise ReplayError("the levels changed since the recording")
+
+    def save(self, path):
+        """
+        Write the replay to path, replacing
+        any file there only once complete
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Return the Replay saved at path
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+
+class ReplayRecorder:
+    """
+    Records every run the view plays and
+    saves the finished ones to a folder
+
+    Attributes:
+        directory: string folder replays go in
+        replay: Replay of the run being played,
+        None between runs
+        saved: list of string paths saved
+    """
+
+    def __init__(self, directory="replays"):
+        self.directory = directory
+        self.replay = None
+        self.saved = []
+
+    def start(self, level, length, digest=None):
+        """
+        Start recording a new run
+        Args:
+            level: integer starting level
+            length: integer logical pitch length
+            digest: string hash of the level file
+            of the match, see LevelTable
+        """
+        self.replay = Replay(level, length, digest=digest)
+
+    def add(self, user_input, animate=True):
+        """
+        Record the keys held for one step
+        of the current run
+        """
+        if self.replay is not None:
+            self.replay.add(user_input, animate)
+
+    def finish(self, score):
+        """
+        Save the current run, named by its
+        time and score, numbered when another
+        run of that name was saved already
+        Returns:
+            String path of the replay, None if
+            no run was being recorded or it
+            could not be saved
+        """
+        replay, self.replay = self.replay, None
+        if replay is None:
+            return None
+        replay.score = score
+        name = time.strftime("run-%Y%m%d-%H%M%S") + f"-score{score}"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, name + ".rpl")
+            number = 1
+            while os.path.exists(path):
+                number += 1
+                path = os.path.join(self.directory, f"{name}-{number}.rpl")
+            replay.save(path)
+        except OSError as e:
+            print("Could not save replay:", e)
+            return None
+        self.saved.append(path)
+        return path
+
+
+class ReplayBot(BotController):
+    """
+    Plays the steps of a replay back, one
+    step each time the match asks for keys,
+    refusing replays of other levels
+    """
+
+    def __init__(self, replay, levels=None):
+        replay.check_levels(levels)
+        super().__init__(level=replay.level, restarts=0)
+        self.steps = replay.inputs()
+
+    def get_ball_move(self, match):
+        """
+        Returns the keys held on the next
+        recorded step, setting the match's
+        animation as it was then
+        """
+        keys, animate = next(self.steps)
+        match.animate = animate
+        return keys
+
+
+# Raw stream each worker process writes to, see _start_worker
+_raw_file = None  # pylint: disable=invalid-name
+
+
+def _start_worker(raw_path):
+    """
+    Open the raw stream once per worker
+    """
+    global _raw_file  # pylint: disable=global-statement
+    if raw_path is not None:
+        _raw_file = open(raw_path, "r+b")  # pylint: disable=consider-using-with
+
+
+def _close_worker():
+    """
+    Close the raw stream of this process
+    """
+    global _raw_file  # pylint: disable=global-statement
+    if _raw_file is not None:
+        _raw_file.close()
+        _raw_file = None
+
+
+def encode_png(data, size, level=1):
+    """
+    Return the bytes of an RGB PNG image.
+    Fast zlib levels keep encoding several
+    times quicker than pygame.image.save
+    Args:
+        data: bytes of 24-bit RGB rows, top first
+        size: tuple of the width and height
+        level: integer zlib compression level
+    """
+    width, height = size
+    stride = width * 3
+    rows = b"".join(
+        b"\x00" + data[y * stride : (y + 1) * stride] for y in range(height)
+    )
+
+    def chunk(kind, body):
+        crc = zlib.crc32(kind + body)
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"IDAT", zlib.compress(rows, level))
+        + chunk(b"IEND", b"")
+    )
+
+
+def write_frame(index, data, size, out):
+    """
+    Write one frame from its raw RGB bytes:
+    into its place in the raw stream, or as
+    a numbered PNG in the folder out
+    Returns:
+        Integer index of the frame written
+    """
+    if _raw_file is not None:
+        _raw_file.seek(index * len(data))
+        _raw_file.write(data)
+        _raw_file.flush()
+    else:
+        path = os.path.join(out, f"frame_{index:06d}.png")
+        with open(path, "wb") as f:
+            f.write(encode_png(data, size))
+    return index
+
+
+def _frames(replay, size):
+    """
+    Play a replay headless, yielding the RGB
+    bytes of every frame drawn, pauses after
+    goals and tackles and the Game Over
+    screen included
+    """
+    view = UpFieldView(internal_size=size, renderer=SurfaceRenderer(size, size))
+    view._load_assets()  # pylint: disable=protected-access
+    view.save_scores = False
+    view.pitch_length = replay.length
+    pane = Pane(view, None, ReplayBot(replay))
+    pane.start(replay.level)
+    view.particles.random.seed(0)  # the same clip on every export
+    screen = view.renderer.screen
+    steps = 0
+    while not pane.over and (steps < len(replay) or pane.paused):
+        if not pane.paused:
+            steps += 1
+        pane.frame(None)
+        yield pygame.image.tobytes(screen, "RGB")
+    if pane.over:
+        frame = pygame.image.tobytes(screen, "RGB")
+        for _ in range(GAME_OVER_FRAMES):
+            yield frame
+
+
+def export_replay(replay, out, size=(1000, 1000), fmt="png", workers=None):
+    """
+    Render every frame of a replay and write
+    them with a pool of worker processes
+    Args:
+        replay: the Replay to export
+        out: string folder of the PNGs, or path
+        of the raw stream
+        size: tuple of the frame width and height
+        fmt: "png" for numbered PNGs or "raw" for
+        one stream of 24-bit RGB frames
+        workers: integer of worker processes, None
+        for one per CPU, 0 to write in this process
+    Returns:
+        Integer of frames written
+    """
+    replay.check_levels()
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    raw_path = None
+    if fmt == "raw":
+        raw_path = out
+        with open(raw_path, "wb"):
+            pass  # workers write into place
+    else:
+        os.makedirs(out, exist_ok=True)
+
+    if workers == 0:
+        _start_worker(raw_path)
+        count = 0
+        for index, data in enumerate(_frames(replay, size)):
+            write_frame(index, data, size, out)
+            count += 1
+        _close_worker()
+        return count
+
+    workers = workers or os.cpu_count() or 1
+    # Fresh interpreters: forking would copy the parent's SDL state
+    context = multiprocessing.get_context("spawn")
+    with concurrent.futures.ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_start_worker, initargs=(raw_path,)
+    ) as pool:
+        # Frames are megabytes each, so only a few are in flight
+        pending = set()
+        count = 0
+        for index, data in enumerate(_frames(replay, size)):
+            if len(pending) >= workers * 2:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    future.result()
+            pending.add(pool.submit(write_frame, index, data, size, out))
+            count += 1
+        for future in concurrent.futures.as_completed(pending):
+            future.result()
+    return count
+
+
+def parse_size(text):
+    """
+    Return a (width, height) tuple
+    from text such as 640x640
+    """
+    width, height = text.lower().split("x")
+    return (int(width), int(height))
+
+
+def main():
+    """
+    Parse the command line and export
+    a replay
+    """
+    parser = argparse.ArgumentParser(description="Export a replay as video")
+    parser.add_argument("replay")
+    parser.add_argument("--out", default="frames")
+    parser.add_argument("--size", type=parse_size, default=(1000, 1000))
+    parser.add_argument("--format", choices=("png", "raw"), default="png")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        replay = Replay.load(args.replay)
+        count = export_replay(
+            replay, args.out, args.size, args.format, args.workers
+        )
+    except ReplayError as e:
+        parser.error(str(e))
+    seconds = time.perf_counter() - start
+    print(
+        f"{count} frames in {seconds:.1f} s"
+        f" ({count / 60 / seconds:.1f}x real time at 60 FPS)"
+    )
+    if args.format == "raw":
+        width, height = args.size
+        print(
+            "Encode with: ffmpeg -f rawvideo -pix_fmt rgb24"
+            f" -s {width}x{height} -r 60 -i {args.out} clip.mp4"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Snapshots of the match in play, so a run
+survives a crash or power cut and carries
+on with --resume.
+
+Every second or so the game packs the whole
+match into a small binary record: level,
+score, lives, ball, every defender and the
+animation clock. Packing is all the frame
+pays for; a background thread checksums the
+record and writes it. Writes alternate
+between two files, each replaced atomically,
+so one good snapshot always survives a write
+cut short, and resuming takes the newest one
+whose checksum holds.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from soccer_game_field_levels import default_levels
+from soccer_game_field_model import Match
+
+# Header: magic, format version, sequence, level, lives, score,
+# pitch length, ball x, y, vx, vy, animation clock, animate,
+# digest of the level file, defender count
+_HEADER = struct.Struct("<4sHIIIII4dIB32sI")
+# Defender: x, y, vx, vy, bobbing phase, pursuer
+_DEFENDER = struct.Struct("<4dIB")
+_CRC = struct.Struct("<I")
+_MAGIC = b"SSNP"
+_FORMAT = 1
+SLOTS = ("match.0.snap", "match.1.snap")
+
+_CLEAR = object()
+_STOP = object()
+
+
+class SnapshotError(ValueError):
+    """
+    A snapshot that cannot be resumed
+    """
+
+
+def _digest(levels):
+    """
+    Return the 32 byte hash of the level
+    file of a LevelTable, zeros if unknown
+    """
+    if levels.digest is None:
+        return bytes(32)
+    return bytes.fromhex(levels.digest)
+
+
+def dump_match(match, sequence=0):
+    """
+    Return the snapshot of a match as bytes,
+    without its checksum
+    Args:
+        match: the Match to save
+        sequence: integer counting snapshots,
+        the newest resumes
+    """
+    parts = [
+        _HEADER.pack(
+            _MAGIC,
+            _FORMAT,
+            sequence,
+            match.level,
+            match.lives,
+            match.score,
+            match.length,
+            match.ball_x,
+            match.ball_y,
+            match.ball_vx,
+            match.ball_vy,
+            match.anim_counter,
+            match.animate,
+            _digest(match.levels),
+            len(match.defenders),
+        )
+    ]
+    pack = _DEFENDER.pack
+    for defender in match.defenders:
+        parts.append(
+            pack(
+                defender.x,
+                defender.y,
+                defender.vx,
+                defender.vy,
+                defender.phase,
+                defender.pursuer,
+            )
+        )
+    return b"".join(parts)
+
+
+def seal(data):
+    """
+    Return snapshot bytes with their
+    checksum appended
+    """
+    return data + _CRC.pack(zlib.crc32(data))
+
+
+def _unseal(data):
+    """
+    Return the header values and defender
+    records of sealed snapshot bytes
+    """
+    if len(data) < _HEADER.size + _CRC.size:
+        raise SnapshotError("snapshot is truncated")
+    body, (crc,) = data[: -_CRC.size], _CRC.unpack(data[-_CRC.size :])
+    if zlib.crc32(body) != crc:
+        raise SnapshotError("snapshot checksum does not match")
+    header = _HEADER.unpack_from(body)
+    if header[0] != _MAGIC or header[1] != _FORMAT:
+        raise SnapshotError("not a snapshot of this version")
+    records = body[_HEADER.size :]
+    if len(records) != header[-1] * _DEFENDER.size:
+        raise SnapshotError("snapshot defender count does not match")
+    return header, records
+
+
+def sequence_of(data):
+    """
+    Return the sequence number of snapshot
+    bytes, -1 if they are not a snapshot
+    """
+    try:
+        header = _HEADER.unpack_from(data)
+    except struct.error:
+        return -1
+    return header[2] if header[0] == _MAGIC else -1
+
+
+def load_match(data, levels=None):
+    """
+    Return the Match of sealed snapshot bytes
+    Args:
+        data: bytes from seal(dump_match(...))
+        levels: LevelTable the match was played
+        with, by default the shipped levels
+    """
+    header, records = _unseal(data)
+    (
+        _,
+        _,
+        _,
+        level,
+        lives,
+        score,
+        length,
+        ball_x,
+        ball_y,
+        ball_vx,
+        ball_vy,
+        anim_counter,
+        animate,
+        digest,
+        count,
+    ) = header
+    levels = default_levels() if levels is None else levels
+    if digest not in (bytes(32), _digest(levels)):
+        raise SnapshotError("the levels changed since the snapshot")
+
+    match = Match(level, lives=lives, length=length, levels=levels)
+    if len(match.defenders) != count:
+        raise SnapshotError("snapshot defenders do not fit the level")
+    match.score = score
+    match.ball_x, match.ball_y = ball_x, ball_y
+    match.ball_vx, match.ball_vy = ball_vx, ball_vy
+    match.anim_counter = anim_counter
+    match.animate = bool(animate)
+    for defender, values in zip(match.defenders, _DEFENDER.iter_unpack(records)):
+        defender.x, defender.y, defender.vx, defender.vy = values[:4]
+        defender.phase = values[4]
+        defender.pursuer = bool(values[5])
+    match.pursuers = [defender for defender in match.defenders if defender.pursuer]
+    return match
+
+
+def load_snapshot(directory, levels=None):
+    """
+    Return the Match of the newest good
+    snapshot in directory, None if there is
+    none to resume
+    """
+    found = []
+    for name in SLOTS:
+        try:
+            with open(os.path.join(directory, name), "rb") as f:
+                data = f.read()
+        except OSError:
+            continue
+        found.append((sequence_of(data), data))
+    for _, data in sorted(found, key=lambda item: item[0], reverse=True):
+        try:
+            return load_match(data, levels)
+        except SnapshotError as e:
+            print("Skipping snapshot:", e)
+    return None
+
+
+class SnapshotWriter:
+    """
+    Takes a snapshot of the match every few
+    frames and writes it on a background thread
+
+    Attributes:
+        directory: string folder of the two
+        snapshot files
+        interval: integer of frames between
+        snapshots
+        sequence: integer of the last snapshot
+        taken
+        written: integer of snapshots written
+    """
+
+    def __init__(self, directory="snapshot", interval=60):
+        self.directory = directory
+        self.interval = interval
+        self.frames = 0
+        self.sequence = 0
+        self.written = 0
+        self._pending = None
+        self._cond = threading.Condition()
+        self._thread = None
+        # Carry on numbering after the snapshots already there
+        for name in SLOTS:
+            try:
+                with open(os.path.join(directory, name), "rb") as f:
+                    head = f.read(_HEADER.size)
+            except OSError:
+                continue
+            self.sequence = max(self.sequence, sequence_of(head))
+
+    def start(self):
+        """
+        Start the writer thread
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="snapshot", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def offer(self, match, force=False):
+        """
+        Count a frame and snapshot the match
+        when the interval is up; only packing
+        it runs on the caller's frame
+        Args:
+            match: the Match being played
+            force: True to snapshot now, as after
+            a goal or a lost life
+        Returns:
+            True if a snapshot was taken
+        """
+        self.frames += 1
+        if not force and self.frames < self.interval:
+            return False
+        self.frames = 0
+        self.sequence += 1
+        self._hand_over((self.sequence, dump_match(match, self.sequence)))
+        return True
+
+    def clear(self):
+        """
+        Delete the snapshots once the run is
+        over, so there is nothing to resume
+        """
+        self._hand_over(_CLEAR)
+
+    def close(self, timeout=5.0):
+        """
+        Write the last snapshot taken and
+        stop the writer thread
+        """
+        if self._thread is None:
+            return
+        with self._cond:
+            # Wait for the thread to take the last snapshot
+            self._cond.wait_for(lambda: self._pending is None, timeout)
+        self._hand_over(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _hand_over(self, item):
+        """
+        Give the writer thread an item, replacing
+        one it has not taken yet: only the newest
+        snapshot is worth writing
+        """
+        with self._cond:
+            self._pending = item
+            self._cond.notify_all()
+
+    def _run(self):
+        """
+        Writer thread: write each snapshot
+        handed over into the older slot
+        """
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None)
+                item, self._pending = self._pending, None
+                self._cond.notify_all()
+            if item is _STOP:
+                return
+            try:
+                if item is _CLEAR:
+                    self._remove()
+                else:
+                    self._write(*item)
+            except OSError as e:
+                print("Error writing snapshot:", e)
+
+    def _write(self, sequence, data):
+        """
+        Replace the slot of a sequence number
+        with a sealed snapshot, synced to disk
+        """
+        path = os.path.join(self.directory, SLOTS[sequence % 2])
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(seal(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        self.written += 1
+
+    def _remove(self):
+        """
+        Delete both slots
+        """
+        for name in SLOTS:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
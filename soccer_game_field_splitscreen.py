@@ -0,0 +1,293 @@
+"""
+Split screen: two to four independent matches
+side by side in one window, one per player.
+
+Each player's match is an embedded UpFieldView
+drawing straight into its own part of the
+window; the split screen alone sets up pygame
+and handles the window's events. The views
+share the asset cache, their rescaled
+sprites and the sounds, every pane is drawn
+without rescaling and the window is shown
+once per frame for all of them.
+"""
+
+import os
+import time
+import weakref
+import pygame
+from soccer_game_field_model import Match
+from soccer_game_field_controller import EventDispatcher
+from soccer_game_field_render import SubsurfaceRenderer
+from soccer_game_field_stats import FrameStats
+from soccer_game_field_view import UpFieldView
+
+# Keys of each player, from the arrow key the match
+# reads to the key the player presses
+PLAYER_KEYS = [
+    {
+        pygame.K_LEFT: pygame.K_LEFT,
+        pygame.K_RIGHT: pygame.K_RIGHT,
+        pygame.K_UP: pygame.K_UP,
+        pygame.K_DOWN: pygame.K_DOWN,
+    },
+    {
+        pygame.K_LEFT: pygame.K_a,
+        pygame.K_RIGHT: pygame.K_d,
+        pygame.K_UP: pygame.K_w,
+        pygame.K_DOWN: pygame.K_s,
+    },
+    {
+        pygame.K_LEFT: pygame.K_j,
+        pygame.K_RIGHT: pygame.K_l,
+        pygame.K_UP: pygame.K_i,
+        pygame.K_DOWN: pygame.K_k,
+    },
+    {
+        pygame.K_LEFT: pygame.K_KP4,
+        pygame.K_RIGHT: pygame.K_KP6,
+        pygame.K_UP: pygame.K_KP8,
+        pygame.K_DOWN: pygame.K_KP5,
+    },
+]
+
+# Frames the match of a pane pauses for after a goal or tackle
+GOAL_PAUSE = 48
+TACKLE_PAUSE = 60
+
+
+def pane_rects(players, window_size):
+    """
+    Return one square Rect per player: side
+    by side for two or three, two by two for four
+    Args:
+        players: integer of players, 1 to 4
+        window_size: tuple of the window size
+    """
+    cols, rows = (2, 2) if players == 4 else (players, 1)
+    cell_w = window_size[0] // cols
+    cell_h = window_size[1] // rows
+    size = min(cell_w, cell_h)
+    rects = []
+    for index in range(players):
+        col, row = index % cols, index // cols
+        rect = pygame.Rect(0, 0, size, size)
+        rect.center = (col * cell_w + cell_w // 2, row * cell_h + cell_h // 2)
+        rects.append(rect)
+    return rects
+
+
+class Pane:
+    """
+    One player's match in split screen
+
+    Attributes:
+        view: UpFieldView drawing into the pane
+        keys: dictionary from the arrow key
+        constants to this player's keys
+        bot: BotController playing this pane,
+        None for a player on the keyboard
+        overlay: list of the surface and rect
+        drawn over the paused pane, or None
+        paused: integer of frames left to pause
+        over: True once the match has ended
+    """
+
+    # Panes drive their view from outside, as its own loop would
+    # pylint: disable=protected-access
+
+    def __init__(self, view, keys, bot=None):
+        self.view = view
+        self.keys = keys
+        self.bot = bot
+        self.overlay = None
+        self.paused = 0
+        self.over = False
+
+    def start(self, level):
+        """
+        Start a new match at a level
+        """
+        view = self.view
+        view.match = Match(level, length=view.pitch_length)
+        view._update_camera(snap=True)
+        view.particles.clear()
+        self.overlay = None
+        self.paused = 0
+        self.over = False
+
+    def frame(self, pressed):
+        """
+        Play and draw one frame of the pane
+        Args:
+            pressed: sequence of held keys from
+            pygame.key.get_pressed
+        """
+        if self.over:
+            return  # the Game Over screen stays as drawn
+        view = self.view
+        if self.paused:
+            self.paused -= 1
+            view._draw_paused(*self.overlay)
+            return
+
+        if self.bot is None:
+            user_input = {arrow: pressed[key] for arrow, key in self.keys.items()}
+        else:
+            user_input = self.bot.get_ball_move(view.match)
+        event = view.play_frame(user_input)
+
+        # The view's own effects, pausing only this pane
+        if event == "goal":
+            self.overlay = view._goal_effects()
+            self.paused = GOAL_PAUSE
+        elif event in ("tackle", "game_over"):
+            self.overlay = view._tackle_effects(event == "game_over")
+            if event == "game_over":
+                view._draw_game_over()
+                self.over = True
+            else:
+                self.paused = TACKLE_PAUSE
+
+
+class SplitScreen:
+    """
+    Hosts one pane per player in one window
+    and plays them all each frame
+
+    Attributes:
+        window: the display Surface
+        panes: list of Pane, one per player
+        events: EventDispatcher of the window
+        frame_stats: FrameStats of whole frames,
+        every pane included
+    """
+
+    def __init__(
+        self,
+        players=2,
+        window_size=(1920, 1080),
+        fullscreen=False,
+        bots=None,
+        headless=False,
+    ):
+        if not 1 <= players <= len(PLAYER_KEYS):
+            raise ValueError(f"players must be 1 to {len(PLAYER_KEYS)}")
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        # Initialize mixer first for more reliable audio timing
+        try:
+            pygame.mixer.pre_init(44100, -16, 2, 512)
+        except Exception as e:  # pylint: disable=broad-except
+            print("Mixer pre_init failed:", e)
+        pygame.init()
+        flags = pygame.FULLSCREEN if fullscreen else 0
+        self.window = pygame.display.set_mode(window_size, flags)
+        self.headless = headless
+        bots = bots or [None] * players
+
+        # Panes of one size share every rescaled sprite
+        sprite_cache = weakref.WeakKeyDictionary()
+        self.panes = []
+        for index, rect in enumerate(pane_rects(players, self.window.get_size())):
+            view = UpFieldView(
+                internal_size=rect.size,
+                renderer=SubsurfaceRenderer(self.window, rect),
+                sprite_cache=sprite_cache,
+                embedded=True,
+            )
+            view._load_assets()  # pylint: disable=protected-access
+            view.save_scores = bots[index] is None
+            self.panes.append(Pane(view, PLAYER_KEYS[index], bots[index]))
+        pygame.display.set_caption(f"Mini Soccer Game - {players} players")
+
+        # One mixer: the first pane loads the sounds, all play them
+        if not headless:
+            first = self.panes[0].view
+            first._load_sounds()  # pylint: disable=protected-access
+            for pane in self.panes[1:]:
+                pane.view.goal_sound = first.goal_sound
+                pane.view.hit_sound = first.hit_sound
+
+        self.events = EventDispatcher()
+        self.events.on(None, pygame.QUIT, self._quit)
+        self.events.on("game_over", pygame.KEYDOWN, self._game_over_key)
+        self.events.install()
+        self.want_restart = False
+        self.frame_stats = FrameStats()
+
+    def _quit(self, _event=None):
+        """
+        Leave the game
+        """
+        self.events.set_state("quit")
+
+    def _game_over_key(self, event):
+        """
+        Handle a key pressed once every
+        match has ended
+        """
+        if event.key == pygame.K_r:
+            self.want_restart = True
+            self.events.set_state("play")
+        elif event.key in (pygame.K_q, pygame.K_ESCAPE):
+            self._quit()
+
+    def set_pitch_length(self, length):
+        """
+        Set the pitch length of every pane's
+        next match
+        """
+        for pane in self.panes:
+            pane.view.pitch_length = length
+
+    def run(self, level=1, max_frames=None):
+        """
+        Play every pane until all matches end,
+        then restart on R or stop on Q / ESC
+        Args:
+            level: integer level every match starts at
+            max_frames: integer of frames to play
+            before returning, None to play until quit
+        Returns:
+            List of the final score of each pane
+        """
+        clock = pygame.time.Clock()
+        frames = 0
+        while True:
+            for pane in self.panes:
+                pane.start(level)
+            self.events.set_state("play")
+            while self.events.state == "play":
+                frame_start = time.perf_counter()
+                self.events.dispatch()
+                pressed = pygame.key.get_pressed()
+                # Panes share one high score, so none saves a stale one
+                best = max(pane.view.high_score for pane in self.panes)
+                for pane in self.panes:
+                    pane.view.high_score = best
+                    pane.frame(pressed)
+                    best = max(best, pane.view.high_score)
+                pygame.display.update()
+                self.frame_stats.record(time.perf_counter() - frame_start)
+                frames += 1
+                if max_frames is not None and frames >= max_frames:
+                    return self.scores()
+                if all(pane.over for pane in self.panes):
+                    self.events.set_state("game_over")
+                clock.tick(0 if self.headless else 60)
+
+            if all(pane.bot is not None for pane in self.panes):
+                return self.scores()
+            self.want_restart = False
+            while self.events.state == "game_over":
+                self.events.wait(500)
+            if not self.want_restart:
+                return self.scores()
+
+    def scores(self):
+        """
+        Return the score of each pane's match
+        """
+        return [pane.view.match.score for pane in self.panes]
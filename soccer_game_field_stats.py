@@ -0,0 +1,74 @@
+"""
+File contains the running statistics
+the game keeps about itself while it
+plays, such as how long each frame took
+"""
+
+import math
+
+
+class FrameStats:
+    """
+    Running frame-time statistics kept in
+    constant memory, so they can be
+    collected for hours of play
+
+    Attributes:
+        budget: float seconds one frame may take
+        count: integer of frames recorded
+        total: float seconds of all frames
+        worst: float seconds of the slowest frame
+        over_budget: integer of frames slower
+        than the budget
+        buckets: list of integer frame counts,
+        one per upper bound in bucket_bounds
+    """
+
+    bucket_bounds = (0.001, 0.002, 0.004, 0.008, 0.0167, 0.033, 0.1, math.inf)
+
+    def __init__(self, budget=1 / 60):
+        self.budget = budget
+        self.count = 0
+        self.total = 0.0
+        self.worst = 0.0
+        self.over_budget = 0
+        self.buckets = [0] * len(self.bucket_bounds)
+
+    def record(self, seconds):
+        """
+        Add one frame time to the statistics
+        Args:
+            seconds: float seconds the frame took
+        Return: No returns
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.worst:
+            self.worst = seconds
+        if seconds > self.budget:
+            self.over_budget += 1
+        for index, bound in enumerate(self.bucket_bounds):
+            if seconds <= bound:
+                self.buckets[index] += 1
+                break
+
+    def mean(self):
+        """
+        Return the average frame time in
+        seconds, 0.0 if nothing was recorded
+        """
+        if self.count == 0:
+            return 0.0
+        return self.total / self.count
+
+    def summary(self):
+        """
+        Return a dictionary of the statistics
+        with times in milliseconds
+        """
+        return {
+            "frames": self.count,
+            "mean_ms": round(self.mean() * 1000, 3),
+            "worst_ms": round(self.worst * 1000, 3),
+            "over_budget": self.over_budget,
+        }
@@ -0,0 +1,224 @@
+"""
+Session telemetry. The game records events
+(run start, goals, tackles, game over with
+frame-time summaries, high score changes,
+quitting)
+into a bounded queue; a background thread
+writes them as gzip-compressed JSON lines,
+one gzip member per batch, starting a new
+file when one reaches its size limit. When
+the queue is full new events are dropped
+and counted, so recording never blocks a
+frame, even on slow storage.
+"""
+
+import gzip
+import json
+import os
+import queue
+import threading
+import time
+
+_STOP = object()
+
+
+class TelemetryWriter:
+    """
+    Buffered writer of telemetry events to
+    size-rotated .jsonl.gz files
+
+    Attributes:
+        directory: string folder the files go in
+        max_bytes: integer compressed size at which
+        a file is closed and a new one started
+        keep: integer of newest files kept, older
+        files are deleted
+        dropped: integer of events dropped because
+        the queue was full
+        written: integer of events written
+    """
+
+    def __init__(
+        self,
+        directory="telemetry",
+        max_bytes=1024 * 1024,
+        keep=50,
+        queue_size=4096,
+        flush_interval=1.0,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.written = 0
+        self._dropped_reported = 0
+        self._raw = None
+        self._file_index = 0
+        now = time.time()
+        millis = int(now * 1000) % 1000
+        self._session = time.strftime(
+            "session-%Y%m%d-%H%M%S", time.localtime(now)
+        )
+        self._session += f"{millis:03d}"
+        self._thread = None
+
+    def start(self):
+        """
+        Start the writer thread
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(
+            target=self._run, name="telemetry", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def record(self, kind, **fields):
+        """
+        Queue one event without ever waiting
+        Args:
+            kind: string kind of the event
+            fields: values stored with the event
+        Returns:
+            True if queued, False if dropped
+        """
+        event = {"time": round(time.time(), 3), "kind": kind}
+        event.update(fields)
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def close(self, timeout=5.0):
+        """
+        Write every queued event, close the
+        file and stop the writer thread
+        """
+        if self._thread is None:
+            return
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        """
+        Writer thread: take events in batches,
+        write them and flush once per batch
+        """
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if _STOP in batch:
+                stopping = True
+                batch = [event for event in batch if event is not _STOP]
+            if self.dropped > self._dropped_reported:
+                # Leave a record of what the full queue cost
+                count = self.dropped - self._dropped_reported
+                self._dropped_reported += count
+                batch.append(
+                    {
+                        "time": round(time.time(), 3),
+                        "kind": "dropped",
+                        "count": count,
+                    }
+                )
+            if batch:
+                self._write(batch)
+        self._close_file()
+
+    def _write(self, batch):
+        """
+        Append a batch of events, rotating the
+        file first when it is full
+        """
+        if self._raw is None:
+            try:
+                self._open_file()
+            except OSError as e:
+                # Drop the batch and try a new file with the next one
+                print("Error opening telemetry file:", e)
+                return
+        lines = "".join(
+            json.dumps(event, separators=(",", ":")) + "\n" for event in batch
+        )
+        try:
+            # A whole gzip member per batch: a crash loses at most the
+            # current batch, and readers can start at any member
+            with gzip.GzipFile(fileobj=self._raw, mode="wb") as member:
+                member.write(lines.encode("utf-8"))
+            self._raw.flush()
+        except OSError as e:
+            print("Error writing telemetry:", e)
+            return
+        self.written += len(batch)
+        if self._raw.tell() >= self.max_bytes:
+            self._close_file()
+
+    def _open_file(self):
+        """
+        Start a new file, named after the
+        session and numbered, so the files of a
+        session sort together and in order
+        """
+        self._file_index += 1
+        name = f"{self._session}-{os.getpid()}-{self._file_index:04d}.jsonl.gz"
+        self._raw = open(os.path.join(self.directory, name), "wb")
+        self._prune()
+
+    def _close_file(self):
+        """
+        Finish the current file
+        """
+        if self._raw is not None:
+            self._raw.close()
+            self._raw = None
+
+    def _prune(self):
+        """
+        Delete the oldest files beyond keep
+        """
+        files = sorted(
+            name
+            for name in os.listdir(self.directory)
+            if name.endswith(".jsonl.gz")
+        )
+        # Not files[:-keep]: with keep at 0 that keeps them all
+        for name in files[: max(0, len(files) - self.keep)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+
+def read_events(path):
+    """
+    Return the events of one telemetry file
+    as a list of dictionaries, skipping a
+    last line cut short by a crash
+    """
+    events = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    except (OSError, EOFError):
+        pass
+    return events
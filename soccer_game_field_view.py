@@ -6,21 +6,47 @@ Pygame window
 """
 
 import sys
-import math
 import json
 import os
+import time
+import weakref
 import pygame
 from soccer_game_field_model import defend_move  # kept for compatibility
-from soccer_game_field_model import initialize_def
 from soccer_game_field_model import ball_move  # kept for compatibility / tests
-from soccer_game_field_model import Level
-from soccer_game_field_model import make_def_dict
-from soccer_game_field_model import level_images
-from soccer_game_field_model import make_level_rect
+from soccer_game_field_model import Match
+from soccer_game_field_model import ASSET_CACHE
 from soccer_game_field_controller import get_ball_move
+from soccer_game_field_controller import EventDispatcher
+from soccer_game_field_stats import FrameStats
+from soccer_game_field_render import make_renderer
+from soccer_game_field_diagnostics import SURFACES
+from soccer_game_field_particles import ParticleSystem
+from soccer_game_field_quality import QUALITY_TIERS
 
 HIGHSCORE_FILE = "highscore.json"
 
+# Sounds: background crowd ambience, goal and tackle
+MUSIC_FILE = "sounds/crowd-cheering-379666.wav"
+GOAL_SOUND_FILE = "sounds/west-ham-bubbles-77370.wav"
+HIT_SOUND_FILE = "sounds/kick-362036.wav"
+
+# Every position in the game is in logical pixels of a 1000x1000
+# field; the view scales them to its internal resolution
+LOGICAL_SIZE = (1000, 1000)
+
+# Steps a second the match is made for: Match.step moves
+# everything by a fixed amount, so slower frame rates take
+# several steps a frame to keep the game's speed
+STEP_RATE = 60
+
+# The pitch background is drawn in strips of this logical
+# height; only the strips inside the camera are drawn
+TILE_HEIGHT = 250
+
+# Logical pixels the camera keeps between its top and the ball,
+# so the ball sits low on screen with the pitch ahead in view
+CAMERA_LEAD = 650
+
 
 def load_high_score():
     """
@@ -58,44 +84,253 @@ class UpFieldView:
     instances and variables on the Pygame Window
     """
 
-    def __init__(self):
-        # Initialize mixer first for more reliable audio timing
-        try:
-            pygame.mixer.pre_init(44100, -16, 2, 512)
-        except Exception as e:
-            print("Mixer pre_init failed:", e)
-
-        pygame.init()
-        pygame.display.set_caption("Mini Soccer Game")
-
-        # Main screen
-        self.screen = pygame.display.set_mode((1000, 1000))
-
-        # Level graphics
-        self.level_dict = level_images()
+    def __init__(
+        self,
+        headless=False,
+        internal_size=LOGICAL_SIZE,
+        window_size=LOGICAL_SIZE,
+        fullscreen=False,
+        renderer="surface",
+        sprite_cache=None,
+        embedded=False,
+    ):
+        # Headless runs simulate without a window or sound card
+        self.headless = headless
+        if headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        # Embedded views, such as split screen panes, draw into a
+        # window their owner set up and whose events it handles
+        self.embedded = embedded
+        if not embedded:
+            # Initialize mixer first for more reliable audio timing
+            try:
+                pygame.mixer.pre_init(44100, -16, 2, 512)
+            except Exception as e:
+                print("Mixer pre_init failed:", e)
+
+            pygame.init()
+            pygame.display.set_caption("Mini Soccer Game")
+
+        # Renderer drawing at the internal resolution and scaling
+        # the frame to the window, see soccer_game_field_render;
+        # split screens hand each view a renderer of its own part
+        if isinstance(renderer, str):
+            renderer = make_renderer(
+                renderer, window_size, internal_size, fullscreen
+            )
+        self.renderer = renderer
+        self.internal_size = tuple(internal_size)
+        self.scale_x = internal_size[0] / LOGICAL_SIZE[0]
+        self.scale_y = internal_size[1] / LOGICAL_SIZE[1]
+
+        # Sprites rescaled to the internal resolution, by source
+        # surface, shared between views of the same size when given
+        if sprite_cache is None:
+            sprite_cache = weakref.WeakKeyDictionary()
+        self._scaled = sprite_cache
+
+        # Every pygame event goes through the dispatcher; menus
+        # idle on it, redrawing at least every idle_timeout ms
+        self.events = EventDispatcher()
+        self.events.on(None, pygame.QUIT, self._quit_game)
+        self.events.on("menu", pygame.KEYDOWN, self._menu_key)
+        self.events.on("game_over", pygame.KEYDOWN, self._game_over_key)
+        # P or ESC pauses; losing focus or minimizing pauses too,
+        # and getting it back resumes only what it paused
+        self.events.on("play", pygame.KEYDOWN, self._play_key)
+        self.events.on("paused", pygame.KEYDOWN, self._paused_key)
+        self.events.on("play", pygame.WINDOWFOCUSLOST, self._auto_pause)
+        self.events.on("play", pygame.WINDOWMINIMIZED, self._auto_pause)
+        self.events.on("paused", pygame.WINDOWFOCUSGAINED, self._auto_resume)
+        self.events.on("paused", pygame.WINDOWRESTORED, self._auto_resume)
+        if not embedded:
+            self.events.install()
+        self.auto_paused = False
+        self.duck_volume = 0.2  # share of the music volume while paused
+        self.idle_timeout = 500
+        self.menu_level = 1
+        self.want_restart = False
+
+        # Pitch length of new matches, the top of the camera on
+        # the pitch and the background tiles, see _draw_field
+        self.pitch_length = LOGICAL_SIZE[1]
+        self.camera_y = 0.0
+        self._tiles = {}
+
+        # HUD bar and texts, kept between frames, see _draw_hud
+        self._hud_bg = None
+        self._texts = {}
 
         # HUD fonts
-        self.font = pygame.font.SysFont("arial", 32, bold=True)
-        self.big_font = pygame.font.SysFont("arial", 72, bold=True)
-        self.small_font = pygame.font.SysFont("arial", 24)
+        self._make_fonts()
 
-        # Game state
-        self.score = 0
-        self.lives = 3
+        # Game state: the match being played, see Match
+        self.match = None
         self.high_score = load_high_score()  # load saved high score if exists
+        self.save_scores = True  # bots never overwrite the saved high score
+
+        # Images drawn each frame, see _load_assets
+        self.assets = None
 
-        # Ball physics state (center position & velocity)
-        self.ball_x = 500.0
-        self.ball_y = 950.0
-        self.ball_vx = 0.0
-        self.ball_vy = 0.0
+        # Confetti, dust and ball trail, see soccer_game_field_particles
+        self.particles = ParticleSystem(budget=2000)
 
         # Sound placeholders
         self.goal_sound = None
         self.hit_sound = None
 
-        # Global animation counter for smooth animation
-        self.anim_counter = 0
+        # Frame times of every frame played and the frame rate,
+        # written only by the game loop (see soccer_game_field_metrics)
+        self.frame_stats = FrameStats()
+        self.fps = 0.0
+
+        # MemoryDiagnostics sampled at every level and run, when on
+        self.diagnostics = None
+
+        # TelemetryWriter recording the session, when on, and the
+        # frame times of the current run it reports at game over
+        self.telemetry = None
+        self.run_stats = FrameStats()
+
+        # QualityGovernor lowering the quality on slow machines,
+        # when on, the settings of its tier and whether F3 shows
+        # the tier on screen (see soccer_game_field_quality)
+        self.quality = None
+        self.quality_settings = QUALITY_TIERS[0]
+        self.show_quality = False
+
+        # ReplayRecorder saving every run played, when on
+        # (see soccer_game_field_replay)
+        self.recorder = None
+
+        # HotReloader swapping in changed images, sounds and
+        # levels between frames, in dev mode
+        # (see soccer_game_field_hotreload)
+        self.hot_reload = None
+
+        # SnapshotWriter saving the match in play, when on, and
+        # a restored Match to play before the start menu
+        # (see soccer_game_field_snapshot)
+        self.snapshots = None
+        self.resume = None
+
+        # Whether max_frames stopped a run mid-way, and whether
+        # the run is recorded, for display_game(carry_on=True)
+        self._run_open = False
+        self._recording = False
+
+    # -----------------------
+    # RESOLUTION HELPERS
+    # -----------------------
+
+    def _px(self, pos):
+        """
+        Convert a logical (x, y) position or
+        (width, height) size to internal pixels
+        """
+        return (round(pos[0] * self.scale_x), round(pos[1] * self.scale_y))
+
+    def _px_y(self, value):
+        """
+        Convert a logical height, such as a
+        font size, to internal pixels
+        """
+        return max(1, round(value * self.scale_y))
+
+    def _make_fonts(self):
+        """
+        Make the HUD fonts at the
+        internal resolution
+        """
+        self.font = pygame.font.SysFont("arial", self._px_y(32), bold=True)
+        self.big_font = pygame.font.SysFont("arial", self._px_y(72), bold=True)
+        self.small_font = pygame.font.SysFont("arial", self._px_y(24))
+
+    def _set_internal_size(self, size):
+        """
+        Draw at a new internal resolution,
+        remaking everything drawn at the old one
+        Args:
+            size: tuple of the new width and height
+        Returns:
+            False if the renderer cannot be resized,
+            as with split screen panes, else True
+        """
+        try:
+            self.renderer.resize(size)
+        except pygame.error as e:
+            print("Internal resolution kept:", e)
+            return False
+        self.scale_x = size[0] / LOGICAL_SIZE[0]
+        self.scale_y = size[1] / LOGICAL_SIZE[1]
+        self._make_fonts()
+        self._hud_bg = None
+        self._texts = {}
+        self._tiles = {}
+        if self.assets is not None:
+            self.assets = None
+            self._load_assets()
+        self.particles.make_sprites(self.scale_x, self.scale_y)
+        return True
+
+    def _reload_images(self):
+        """
+        Load the images drawn again after some
+        changed on disk, keeping the match
+        """
+        self._tiles = {}
+        if self.assets is not None:
+            self.assets = None
+            self._load_assets()
+        if self.match is not None:
+            self.match.reload_images()
+
+    def _apply_quality(self, settings):
+        """
+        Switch to the settings of a quality tier
+        Args:
+            settings: dictionary of a tier, see
+            QUALITY_TIERS
+        """
+        if settings["hud_alpha"] != self.quality_settings["hud_alpha"]:
+            self._hud_bg = None
+        self.quality_settings = settings
+        if self.match is not None:
+            self.match.animate = settings["animate"]
+        size = (
+            max(1, round(self.internal_size[0] * settings["scale"])),
+            max(1, round(self.internal_size[1] * settings["scale"])),
+        )
+        if size != tuple(self.renderer.get_size()):
+            self._set_internal_size(size)
+
+    def _world_px(self, pos):
+        """
+        Convert a logical (x, y) position on
+        the pitch to internal pixels on screen
+        """
+        return self._px((pos[0], pos[1] - self.camera_y))
+
+    def _fit(self, surface, size):
+        """
+        Return surface scaled to a logical
+        size at the internal resolution,
+        cached per source surface
+        Args:
+            surface: the source surface
+            size: tuple of the logical width and height
+        """
+        size = self._px(size)
+        if surface.get_size() == size:
+            return surface
+        sizes = self._scaled.setdefault(surface, {})
+        if size not in sizes:
+            sizes[size] = SURFACES.track(
+                pygame.transform.smoothscale(surface, size), "scaled"
+            )
+        return sizes[size]
 
     # -----------------------
     # ASSET LOADING HELPERS
@@ -105,17 +340,22 @@ class UpFieldView:
         """
         Load goal image and rect
         """
-        goal = pygame.image.load("images/soccergoal.png")
-        goal = pygame.transform.scale(goal, (200, 200))
-        goal_rect = goal.get_rect(center=(500, 100))
+        goal = ASSET_CACHE.image("images/soccergoal.png", self._px((200, 200)))
+        goal_rect = goal.get_rect(center=self._px((500, 100)))
         return [goal, goal_rect]
 
     def _load_background(self):
         """
-        Load background field and rect
+        Load background field and rect, or a plain
+        green field when the image is missing
         """
-        background = pygame.image.load("images/background.png")
-        background = pygame.transform.scale(background, (1000, 1000))
+        try:
+            background = ASSET_CACHE.image(
+                "images/background.png", self._px(LOGICAL_SIZE)
+            )
+        except (FileNotFoundError, pygame.error):
+            background = SURFACES.track(pygame.Surface(self._px(LOGICAL_SIZE)), "asset")
+            background.fill((0, 100, 0))
         background_rect = background.get_rect()
         return [background, background_rect]
 
@@ -123,19 +363,31 @@ class UpFieldView:
         """
         Load level up graphic and rect
         """
-        level_up = pygame.image.load("images/level_up.png")
-        level_up = pygame.transform.scale(level_up, (600, 600))
-        level_up_rect = level_up.get_rect(center=(500, 500))
+        level_up = ASSET_CACHE.image("images/level_up.png", self._px((600, 600)))
+        level_up_rect = level_up.get_rect(center=self._px((500, 500)))
         return [level_up, level_up_rect]
 
     def _load_ball_pic(self):
         """
         Load soccer ball image
         """
-        ball = pygame.image.load("images/soccerball.png")
-        ball = pygame.transform.scale(ball, (50, 50))
+        ball = ASSET_CACHE.image("images/soccerball.png", self._px((50, 50)))
         return ball
 
+    def _load_assets(self):
+        """
+        Load every image drawn during play once,
+        keyed by name, into self.assets
+        """
+        if self.assets is None:
+            self.assets = {
+                "goal": self._load_goal(),
+                "background": self._load_background(),
+                "level_up": self._load_level_up(),
+                "ball": self._load_ball_pic(),
+            }
+        return self.assets
+
     def _load_sounds(self):
         """
         Load background music and sound effects.
@@ -150,8 +402,8 @@ class UpFieldView:
 
         # Background crowd ambience (looping)
         try:
-            print("Loading music: sounds/crowd-cheering-379666.wav")
-            pygame.mixer.music.load("sounds/crowd-cheering-379666.wav")
+            print("Loading music:", MUSIC_FILE)
+            pygame.mixer.music.load(MUSIC_FILE)
             pygame.mixer.music.set_volume(0.3)
             pygame.mixer.music.play(-1)
             print("Background music started.")
@@ -160,8 +412,8 @@ class UpFieldView:
 
         # Goal sound
         try:
-            print("Loading goal sound: sounds/west-ham-bubbles-77370.wav")
-            self.goal_sound = pygame.mixer.Sound("sounds/west-ham-bubbles-77370.wav")
+            print("Loading goal sound:", GOAL_SOUND_FILE)
+            self.goal_sound = pygame.mixer.Sound(GOAL_SOUND_FILE)
             self.goal_sound.set_volume(0.8)
         except Exception as e:
             print("Error loading goal sound:", e)
@@ -169,449 +421,767 @@ class UpFieldView:
 
         # Hit / tackle sound
         try:
-            print("Loading hit sound: sounds/kick-362036.wav")
-            self.hit_sound = pygame.mixer.Sound("sounds/kick-362036.wav")
+            print("Loading hit sound:", HIT_SOUND_FILE)
+            self.hit_sound = pygame.mixer.Sound(HIT_SOUND_FILE)
             self.hit_sound.set_volume(0.7)
         except Exception as e:
             print("Error loading hit sound:", e)
             self.hit_sound = None
 
+    def _reload_sound(self, path):
+        """
+        Load a sound file again after it changed
+        on disk. A file that cannot be read yet
+        raises pygame.error and the old sound is
+        kept, for the caller to try it again
+        Args:
+            path: string path of the changed file
+        Returns:
+            True if path is one of the game's sounds
+        """
+        if not pygame.mixer.get_init():
+            return False
+        path = os.path.abspath(path)
+        if path == os.path.abspath(MUSIC_FILE):
+            pygame.mixer.music.load(MUSIC_FILE)
+            pygame.mixer.music.play(-1)
+            return True
+        for name, file, volume in (
+            ("goal_sound", GOAL_SOUND_FILE, 0.8),
+            ("hit_sound", HIT_SOUND_FILE, 0.7),
+        ):
+            if path == os.path.abspath(file):
+                sound = pygame.mixer.Sound(file)
+                sound.set_volume(volume)
+                setattr(self, name, sound)
+                return True
+        return False
+
     # -----------------------
     # UI HELPERS
     # -----------------------
 
+    def _text(self, text, color):
+        """
+        Return text rendered in the HUD font,
+        rendering each text only once while it
+        stays on screen
+        """
+        key = (text, color)
+        surface = self._texts.get(key)
+        if surface is None:
+            if len(self._texts) > 64:
+                self._texts.clear()
+            surface = SURFACES.track(self.font.render(text, True, color), "hud")
+            self._texts[key] = surface
+        return surface
+
     def _draw_hud(self, level):
         """
         Draws the HUD at the top: Level, Score, High Score, Lives
         """
-        # Semi-transparent black bar
-        hud_bg = pygame.Surface((1000, 60))
-        hud_bg.set_alpha(160)
-        hud_bg.fill((0, 0, 0))
-        self.screen.blit(hud_bg, (0, 0))
-
-        level_text = self.font.render(f"Level: {level}", True, (255, 255, 255))
-        score_text = self.font.render(f"Score: {self.score}", True, (255, 255, 255))
-        high_text = self.font.render(f"High: {self.high_score}", True, (255, 255, 255))
-        lives_hearts = "♥" * self.lives if self.lives > 0 else "0"
-        lives_text = self.font.render(f"Lives: {lives_hearts}", True, (255, 0, 0))
-
-        self.screen.blit(level_text, (20, 15))
-        self.screen.blit(score_text, (260, 15))
-        self.screen.blit(high_text, (520, 15))
-        self.screen.blit(lives_text, (800, 15))
-
-    def _reset_ball_position(self):
+        # Semi-transparent black bar, made once; opaque at
+        # lower quality, where blending it costs too much
+        if self._hud_bg is None:
+            self._hud_bg = SURFACES.track(pygame.Surface(self._px((1000, 60))), "hud")
+            if self.quality_settings["hud_alpha"]:
+                self._hud_bg.set_alpha(160)
+            self._hud_bg.fill((0, 0, 0))
+        self.renderer.blit(self._hud_bg, (0, 0))
+
+        level_text = self._text(f"Level: {level}", (255, 255, 255))
+        score_text = self._text(f"Score: {self.match.score}", (255, 255, 255))
+        high_text = self._text(f"High: {self.high_score}", (255, 255, 255))
+        lives = self.match.lives
+        lives_hearts = "♥" * lives if lives > 0 else "0"
+        lives_text = self._text(f"Lives: {lives_hearts}", (255, 0, 0))
+
+        self.renderer.blit(level_text, self._px((20, 15)))
+        self.renderer.blit(score_text, self._px((260, 15)))
+        self.renderer.blit(high_text, self._px((520, 15)))
+        self.renderer.blit(lives_text, self._px((800, 15)))
+
+    def _draw_quality(self):
         """
-        Reset ball to starting position and stop movement
+        Draw the debug overlay of the quality
+        governor: its tier and frame times
         """
-        self.ball_x = 500.0
-        self.ball_y = 900.0
-        self.ball_vx = 0.0
-        self.ball_vy = 0.0
+        governor = self.quality
+        text = self._text(
+            f"Quality {governor.tier}: {self.quality_settings['name']}"
+            f" ({governor.mean() * 1000:.0f} ms)",
+            (255, 255, 0),
+        )
+        self.renderer.blit(text, self._px((20, 70)))
 
     def _start_menu(self):
         """
         Simple start menu where the player chooses starting level
         using LEFT / RIGHT and presses ENTER to start.
+        The menu idles until a key is pressed.
         Returns the chosen starting level (1–5).
         """
-        level = 1
-        clock = pygame.time.Clock()
-
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RIGHT:
-                        level = min(5, level + 1)
-                    elif event.key == pygame.K_LEFT:
-                        level = max(1, level - 1)
-                    elif event.key == pygame.K_RETURN:
-                        # Reset core game state before starting
-                        self.score = 0
-                        self.lives = 3
-                        self._reset_ball_position()
-                        return level
-
-            # Draw menu screen
-            self.screen.fill((0, 100, 0))
-
-            title = self.big_font.render("Mini Soccer Game", True, (255, 255, 255))
-            subtitle = self.small_font.render(
-                "Use LEFT / RIGHT to choose starting level, ENTER to start",
-                True,
-                (255, 255, 255),
-            )
-            level_text = self.font.render(
-                f"Starting Level: {level}", True, (255, 215, 0)
-            )
-            hint = self.small_font.render(
-                "Use arrow keys in game to move the ball and score!",
-                True,
-                (255, 255, 255),
-            )
-
-            title_rect = title.get_rect(center=(500, 300))
-            subtitle_rect = subtitle.get_rect(center=(500, 380))
-            level_rect = level_text.get_rect(center=(500, 450))
-            hint_rect = hint.get_rect(center=(500, 520))
-
-            self.screen.blit(title, title_rect)
-            self.screen.blit(subtitle, subtitle_rect)
-            self.screen.blit(level_text, level_rect)
-            self.screen.blit(hint, hint_rect)
-
-            pygame.display.update()
-            clock.tick(30)
+        self.menu_level = 1
+        self.events.set_state("menu")
+        while self.events.state == "menu":
+            self._draw_menu()
+            self.events.wait(self.idle_timeout)
+        return self.menu_level
+
+    def _menu_key(self, event):
+        """
+        Handle a key pressed in the start menu
+        """
+        if event.key == pygame.K_RIGHT:
+            self.menu_level = min(5, self.menu_level + 1)
+        elif event.key == pygame.K_LEFT:
+            self.menu_level = max(1, self.menu_level - 1)
+        elif event.key == pygame.K_RETURN:
+            self.events.set_state("play")
+
+    def _draw_menu(self):
+        """
+        Draw the start menu screen
+        """
+        self.renderer.fill((0, 100, 0))
+
+        title = self.big_font.render("Mini Soccer Game", True, (255, 255, 255))
+        subtitle = self.small_font.render(
+            "Use LEFT / RIGHT to choose starting level, ENTER to start",
+            True,
+            (255, 255, 255),
+        )
+        level_text = self.font.render(
+            f"Starting Level: {self.menu_level}", True, (255, 215, 0)
+        )
+        hint = self.small_font.render(
+            "Use arrow keys in game to move the ball and score!",
+            True,
+            (255, 255, 255),
+        )
+
+        title_rect = title.get_rect(center=self._px((500, 300)))
+        subtitle_rect = subtitle.get_rect(center=self._px((500, 380)))
+        level_rect = level_text.get_rect(center=self._px((500, 450)))
+        hint_rect = hint.get_rect(center=self._px((500, 520)))
+
+        self.renderer.blit(title, title_rect)
+        self.renderer.blit(subtitle, subtitle_rect)
+        self.renderer.blit(level_text, level_rect)
+        self.renderer.blit(hint, hint_rect)
+
+        self.renderer.present()
+
+    def _ball_defend_collide(self, game_over):
+        """
+        Handle collision between ball and defender
+        after the match took a life, showing the
+        "life lost" message for a second
+        Args:
+            game_over: True if the last life was lost
+        """
+        overlay = self._tackle_effects(game_over)
+        if overlay is not None:
+            self._play_effects(1000, *overlay)
 
-    def _ball_defend_collide(self):
+    def _tackle_effects(self, game_over):
         """
-        Handle collision between ball and defender:
-        lose a life, reset ball, or game over.
-        Returns True if this collision caused game over, else False.
+        Play the hit sound, then save the high
+        score on game over or make the "life
+        lost" message
+        Args:
+            game_over: True if the last life was lost
+        Return:
+            List of the message and its rect to
+            show, None on game over or headless
         """
-        self.lives -= 1
         if self.hit_sound:
             self.hit_sound.play()
 
-        if self.lives <= 0:
-            # Update high score if needed
-            if self.score > self.high_score:
-                self.high_score = self.score
+        if game_over:
+            self._update_high_score()
+            return None
+        if self.headless:
+            return None
+        msg = self._text("You were tackled! Life -1", (255, 255, 255))
+        return [msg, msg.get_rect(center=self._px((500, 500)))]
+
+    def _update_high_score(self):
+        """
+        Raise the high score to the match score
+        if it is higher, saving it to disk unless
+        a bot is playing
+        """
+        if self.match.score > self.high_score:
+            if self.telemetry is not None:
+                self.telemetry.record(
+                    "high_score",
+                    previous=self.high_score,
+                    new=self.match.score,
+                    saved=self.save_scores,
+                )
+            self.high_score = self.match.score
+            if self.save_scores:
                 save_high_score(self.high_score)
-            return True  # signal game over
+
+    def _record_event(self, event):
+        """
+        Record a match event in the telemetry,
+        with the run's frame times at game over
+        Args:
+            event: string returned by Match.step
+        """
+        match = self.match
+        if event == "goal":
+            self.telemetry.record("goal", level=match.level, score=match.score)
+        elif event == "tackle":
+            self.telemetry.record("tackle", level=match.level, lives=match.lives)
         else:
-            # Show "life lost" message and reset ball
-            msg = self.font.render("You were tackled! Life -1", True, (255, 255, 255))
-            msg_rect = msg.get_rect(center=(500, 500))
-            self.screen.blit(msg, msg_rect)
-            pygame.display.update()
-            pygame.time.wait(1000)
-            self._reset_ball_position()
-            return False
+            self.telemetry.record(
+                "game_over",
+                level=match.level,
+                score=match.score,
+                frames=self.run_stats.summary(),
+            )
+
+    def _score_goal(self):
+        """
+        Celebrate a goal, flashing level up
+        for a moment
+        """
+        overlay = self._goal_effects()
+        if overlay is not None:
+            self._play_effects(800, *overlay)
+
+    def _goal_effects(self):
+        """
+        Save the high score, play the goal
+        sound and throw confetti
+        Return:
+            List of the level up surface and its
+            rect to show, None when headless
+        """
+        self._update_high_score()
+        if self.goal_sound:
+            self.goal_sound.play()
+        if self.headless:
+            return None
+        goal_x, goal_y = self.match.goal_rect.center
+        self.particles.emit("confetti", goal_x, goal_y, 400)
+        return self.assets["level_up"]
+
+    def _play_effects(self, duration, overlay, overlay_rect):
+        """
+        Pause the match for a while, playing the
+        particle effects under an overlay
+        Args:
+            duration: integer milliseconds to pause
+            overlay: Surface drawn over the field
+            overlay_rect: Rect the overlay is drawn at
+        """
+        clock = pygame.time.Clock()
+        end = pygame.time.get_ticks() + duration
+        while pygame.time.get_ticks() < end:
+            self.events.dispatch()
+            self._draw_paused(overlay, overlay_rect)
+            self.renderer.present()
+            clock.tick(60)
+
+    def _draw_paused(self, overlay, overlay_rect):
+        """
+        Draw one frame of the paused match:
+        the particles play on under an overlay
+        """
+        self.particles.update()
+        self._update_camera()
+        self._draw_field()
+        self.particles.draw(self.renderer, self.scale_x, self.scale_y, self.camera_y)
+        self._draw_hud(self.match.level)
+        self.renderer.blit(overlay, overlay_rect)
 
     def _game_over_screen(self):
         """
         Show a Game Over screen and let the player choose:
         R = restart,  Q or ESC = quit.
+        The screen idles until a key is pressed.
         Returns True if the player wants to restart, False to quit.
         """
-        clock = pygame.time.Clock()
-        glow_color = (239, 68, 68)  # red
+        self.want_restart = False
+        self.events.set_state("game_over")
+        while self.events.state == "game_over":
+            self._draw_game_over()
+            self.events.wait(self.idle_timeout)
+        return self.want_restart
+
+    def _game_over_key(self, event):
+        """
+        Handle a key pressed on the Game Over screen
+        """
+        if event.key == pygame.K_r:
+            self.want_restart = True
+            self.events.set_state("menu")
+        elif event.key in (pygame.K_q, pygame.K_ESCAPE):
+            self.events.set_state("quit")
 
-        while True:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_r:
-                        return True
-                    if event.key in (pygame.K_q, pygame.K_ESCAPE):
-                        return False
-
-            # Dark overlay
-            overlay = pygame.Surface((1000, 1000))
-            overlay.set_alpha(215)
-            overlay.fill((3, 7, 18))  # very dark navy
-            self.screen.blit(overlay, (0, 0))
-
-            # Glowing frame
-            frame = pygame.Surface((700, 420), pygame.SRCALPHA)
-            pygame.draw.rect(frame, (15, 23, 42, 230), frame.get_rect(), border_radius=24)
-            pygame.draw.rect(frame, (248, 113, 113, 180), frame.get_rect(), 2, border_radius=24)
-            self.screen.blit(frame, (150, 260))
-
-            title = self.big_font.render("GAME OVER", True, glow_color)
-            score_text = self.font.render(
-                f"Final Score: {self.score}", True, (248, 250, 252)
-            )
-            high_text = self.font.render(
-                f"High Score: {self.high_score}", True, (190, 242, 100)
-            )
-            prompt = self.small_font.render(
-                "Press R to play again, or Q / ESC to quit",
-                True,
-                (209, 213, 219),
-            )
+    def _play_key(self, event):
+        """
+        Handle a key pressed while playing
+        """
+        if event.key == pygame.K_F3:
+            self.show_quality = not self.show_quality
+        elif event.key in (pygame.K_p, pygame.K_ESCAPE):
+            self.auto_paused = False
+            self.events.set_state("paused")
 
-            title_rect = title.get_rect(center=(500, 320))
-            score_rect = score_text.get_rect(center=(500, 395))
-            high_rect = high_text.get_rect(center=(500, 440))
-            prompt_rect = prompt.get_rect(center=(500, 505))
+    def _paused_key(self, event):
+        """
+        Handle a key pressed while paused
+        """
+        if event.key in (pygame.K_p, pygame.K_ESCAPE, pygame.K_SPACE):
+            self.events.set_state("play")
 
-            self.screen.blit(title, title_rect)
-            self.screen.blit(score_text, score_rect)
-            self.screen.blit(high_text, high_rect)
-            self.screen.blit(prompt, prompt_rect)
+    def _auto_pause(self, _event=None):
+        """
+        Pause when the window loses focus
+        or is minimized
+        """
+        self.auto_paused = True
+        self.events.set_state("paused")
 
-            pygame.display.update()
-            clock.tick(30)
+    def _auto_resume(self, _event=None):
+        """
+        Resume when the window comes back,
+        if losing it was what paused the game
+        """
+        if self.auto_paused:
+            self.auto_paused = False
+            self.events.set_state("play")
 
-    def _quit_game(self):
+    def _suspend(self):
         """
-        Handle QUIT events during the main game loop.
+        Hold the match while paused: draw the
+        pause screen once, duck the audio and
+        block on the event queue until resumed,
+        so a paused game uses next to no CPU
         """
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+        self._draw_field()
+        self._draw_hud(self.match.level)
+        shade = SURFACES.track(pygame.Surface(self.renderer.get_size()), "overlay")
+        shade.set_alpha(160)
+        shade.fill((0, 0, 0))
+        self.renderer.blit(shade, (0, 0))
+        title = self.big_font.render("PAUSED", True, (255, 255, 255))
+        prompt = self.small_font.render("Press P to resume", True, (209, 213, 219))
+        self.renderer.blit(title, title.get_rect(center=self._px((500, 450))))
+        self.renderer.blit(prompt, prompt.get_rect(center=self._px((500, 530))))
+        self.renderer.present()
+
+        volume = None
+        if pygame.mixer.get_init():
+            volume = pygame.mixer.music.get_volume()
+            pygame.mixer.music.set_volume(volume * self.duck_volume)
+            pygame.mixer.pause()  # sound effects stop where they are
+        while self.events.state == "paused":
+            self.events.wait()
+        if volume is not None:
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.unpause()
+
+    def _draw_game_over(self):
+        """
+        Draw the Game Over screen over the last
+        frame of the match
+        """
+        glow_color = (239, 68, 68)  # red
+        self._draw_field()
+        self._draw_hud(self.match.level)
+
+        # Dark overlay
+        overlay = SURFACES.track(pygame.Surface(self.renderer.get_size()), "overlay")
+        overlay.set_alpha(215)
+        overlay.fill((3, 7, 18))  # very dark navy
+        self.renderer.blit(overlay, (0, 0))
+
+        # Glowing frame
+        frame = SURFACES.track(
+            pygame.Surface(self._px((700, 420)), pygame.SRCALPHA), "overlay"
+        )
+        radius = self._px_y(24)
+        pygame.draw.rect(frame, (15, 23, 42, 230), frame.get_rect(), border_radius=radius)
+        pygame.draw.rect(frame, (248, 113, 113, 180), frame.get_rect(), 2, border_radius=radius)
+        self.renderer.blit(frame, self._px((150, 260)))
+
+        title = self.big_font.render("GAME OVER", True, glow_color)
+        score_text = self.font.render(
+            f"Final Score: {self.match.score}", True, (248, 250, 252)
+        )
+        high_text = self.font.render(
+            f"High Score: {self.high_score}", True, (190, 242, 100)
+        )
+        prompt = self.small_font.render(
+            "Press R to play again, or Q / ESC to quit",
+            True,
+            (209, 213, 219),
+        )
+
+        title_rect = title.get_rect(center=self._px((500, 320)))
+        score_rect = score_text.get_rect(center=self._px((500, 395)))
+        high_rect = high_text.get_rect(center=self._px((500, 440)))
+        prompt_rect = prompt.get_rect(center=self._px((500, 505)))
+
+        self.renderer.blit(title, title_rect)
+        self.renderer.blit(score_text, score_rect)
+        self.renderer.blit(high_text, high_rect)
+        self.renderer.blit(prompt, prompt_rect)
+
+        self.renderer.present()
+
+    def _quit_game(self, _event=None):
+        """
+        Handle QUIT events in every state
+        """
+        if self.telemetry is not None:
+            # Lets the stats close a run left without its game over
+            self.telemetry.record("quit")
+        pygame.quit()
+        sys.exit()
 
     # -----------------------
     # MAIN GAME LOOP
     # -----------------------
 
-    def display_game(self):
+    def _update_camera(self, snap=False):
+        """
+        Move the camera toward the ball,
+        keeping it on the pitch
+        Args:
+            snap: True to jump there at once,
+            as at the start of a match
+        """
+        target = self.match.ball_y - CAMERA_LEAD
+        target = max(0.0, min(target, self.match.length - LOGICAL_SIZE[1]))
+        if snap:
+            self.camera_y = target
+        else:
+            self.camera_y += (target - self.camera_y) * 0.2
+
+    def _tile_top(self, row):
+        """
+        Return the internal pixel y of the top
+        of a tile row on the whole pitch
+        """
+        rows = LOGICAL_SIZE[1] // TILE_HEIGHT
+        screens, row_in_screen = divmod(row, rows)
+        screen_height = self.assets["background"][0].get_height()
+        return screens * screen_height + round(
+            row_in_screen * TILE_HEIGHT * self.scale_y
+        )
+
+    def _tile(self, row):
+        """
+        Return the background tile of a row,
+        cut from the background image once. The
+        image repeats down longer pitches, so
+        rows a screen apart share their tile
+        """
+        rows = LOGICAL_SIZE[1] // TILE_HEIGHT
+        key = row % rows
+        tile = self._tiles.get(key)
+        if tile is None:
+            background = self.assets["background"][0]
+            top = self._tile_top(key)
+            height = self._tile_top(key + 1) - top
+            area = pygame.Rect(0, top, background.get_width(), height)
+            tile = SURFACES.track(background.subsurface(area).copy(), "tile")
+            self._tiles[key] = tile
+        return tile
+
+    def _draw_field(self):
+        """
+        Draw the part of the pitch inside the
+        camera: background tiles, goal, level
+        badge, ball and the defenders on screen.
+        Defenders off screen are skipped.
+        """
+        match = self.match
+        goal_list = self.assets["goal"]
+        ball = self.assets["ball"]
+        camera_px = round(self.camera_y * self.scale_y)
+        first_row = int(self.camera_y // TILE_HEIGHT)
+        last_row = int((self.camera_y + LOGICAL_SIZE[1] - 1) // TILE_HEIGHT)
+        for row in range(first_row, last_row + 1):
+            self.renderer.blit(self._tile(row), (0, self._tile_top(row) - camera_px))
+        if goal_list[1].bottom > camera_px:
+            self.renderer.blit(goal_list[0], goal_list[1].move(0, -camera_px))
+
+        # Level badge named by the level's definition
+        badge = ASSET_CACHE.image(match.levels.get(match.level).badge)
+        level_image = self._fit(badge, (100, 100))
+        self.renderer.blit(
+            level_image, level_image.get_rect(center=self._px((900, 100)))
+        )
+
+        ball_center = self._world_px((int(match.ball_x), int(match.ball_y)))
+        self.renderer.blit(ball, ball.get_rect(center=ball_center))
+
+        top = self.camera_y
+        bottom = self.camera_y + LOGICAL_SIZE[1]
+        for defender in match.defenders:
+            current_img, defender_x, draw_y = match.defender_sprite(defender)
+            half = current_img.get_height() / 2
+            if draw_y + half < top or draw_y - half > bottom:
+                continue
+            sprite = self._fit(current_img, current_img.get_size())
+            center = self._world_px((defender_x, draw_y))
+            self.renderer.blit(sprite, sprite.get_rect(center=center))
+
+    # -----------------------
+    # MAIN GAME LOOP
+    # -----------------------
+
+    def play_frame(self, user_input):
+        """
+        Step the match one frame and, unless
+        headless, draw it with its effects and
+        HUD, leaving presenting to the caller
+        Args:
+            user_input: mapping from the arrow
+            key constants to whether they are held
+        Returns:
+            The event of Match.step
+        """
+        event = self.step_match(user_input)
+        self.draw_frame()
+        return event
+
+    def frame_steps(self):
+        """
+        Return the number of match steps each
+        frame takes at the current quality, two
+        at 30 frames a second
+        """
+        return max(1, round(STEP_RATE / self.quality_settings["fps"]))
+
+    def step_match(self, user_input):
+        """
+        Step the match and its effects once
+        Args:
+            user_input: mapping from the arrow
+            key constants to whether they are held
+        Returns:
+            The event of Match.step
+        """
+        match = self.match
+        ball_pos = (match.ball_x, match.ball_y)
+        event = match.step(user_input)
+        if not self.headless:
+            if (match.ball_x, match.ball_y) != ball_pos:
+                self.particles.emit("trail", *ball_pos, 1)
+            if event in ("tackle", "game_over"):
+                self.particles.emit("dust", *ball_pos, 60)
+            self.particles.update()
+        return event
+
+    def draw_frame(self):
+        """
+        Unless headless, draw the match with its
+        effects and HUD, leaving presenting to
+        the caller
+        """
+        if self.headless:
+            return
+        self._update_camera()
+        self._draw_field()
+        self.particles.draw(
+            self.renderer, self.scale_x, self.scale_y, self.camera_y
+        )
+        # HUD: shows Level, Score, High Score, Lives
+        self._draw_hud(self.match.level)
+        if self.show_quality and self.quality is not None:
+            self._draw_quality()
+
+    def _start_run(self, bot):
+        """
+        Set up a new run: the level from the
+        start menu or the bot, or the match to
+        resume, and everything counting the run
+        Args:
+            bot: BotController playing, None for
+            a human player
+        """
+        # --- Start menu to choose level ---
+        resumed = self.resume is not None
+        if resumed:
+            self.match, self.resume = self.resume, None
+            # It keeps its own length; later runs use pitch_length
+            level = self.match.level
+        elif bot is None:
+            level = self._start_menu()
+        else:
+            level = bot.choose_level()
+        if not resumed:
+            self.match = Match(level, length=self.pitch_length)
+        self.match.animate = self.quality_settings["animate"]
+        self._update_camera(snap=True)
+        self.events.set_state("play")
+        if self.diagnostics is not None:
+            self.diagnostics.run_started(level)
+        self.run_stats = FrameStats()
+        self.particles.clear()
+        if self.telemetry is not None:
+            self.telemetry.record("run_start", level=level, bot=bot is not None)
+        # A replay starts from a new match, so resumed runs are not kept
+        self._recording = self.recorder is not None and not resumed
+        if self._recording:
+            self.recorder.start(
+                level, self.match.length, self.match.levels.digest
+            )
+
+    def display_game(self, bot=None, max_frames=None, carry_on=False):
         """
         Runs the game loop, allowing multiple runs:
         - Start menu
         - Play until game over
         - Game Over screen: restart or quit
+        With a bot (see BotController) the bot picks
+        the level, plays and decides whether to
+        restart. Headless views skip drawing and
+        run as fast as they can.
+        Args:
+            bot: BotController playing instead of
+            the keyboard, None for a human player
+            max_frames: integer of frames to play
+            before returning, None to play until quit
+            carry_on: True to play on with the run
+            max_frames stopped last time, if any,
+            instead of starting a new one
+        Returns:
+            The view's FrameStats when a bot stops
+            playing or max_frames is reached
         """
 
         clock = pygame.time.Clock()
 
         # Load assets once
-        goal_list = self._load_goal()
-        background_list = self._load_background()
-        level_up_list = self._load_level_up()
-        ball = self._load_ball_pic()
-        self._load_sounds()
-
-        # How the striker reacts to defenders
-        danger_radius = 180.0      # pixels
-        max_escape_force = 1.2     # how strong the "dribble away" assist is
+        if not self.headless:
+            self._load_assets()
+            self._load_sounds()
 
+        self.save_scores = bot is None
+        frames = 0
+        carry_on = carry_on and self._run_open
         while True:  # Outer loop: allows replay without restarting Python
-            # --- Start menu to choose level ---
-            level = self._start_menu()
-
-            # Initialize level, defenders, and difficulty
-            level_stats = Level(level)
-            number_def = level_stats.create_numdef()
-            base_vel = level_stats.create_newvel()
-            max_speed = base_vel / 2.0
-
-            new_defend_dict = make_def_dict(number_def)
-            stats_dict = initialize_def(new_defend_dict)
-
-            # Defender velocities: move horizontally AND vertically, always moving
-            defender_vel = {}
-            for i in stats_dict:
-                # vary speed a bit per defender & level
-                vx = (1.5 + 0.2 * level) * (1 if i % 2 == 0 else -1)
-                vy = (1.0 + 0.15 * level) * (1 if i % 3 == 0 else -1)
-                defender_vel[i] = [vx, vy]
-
-            # defender animation frames (simple 2-frame "run" cycle)
-            defender_anim = {}
-            for i, entry in stats_dict.items():
-                base_img = entry[0]
-                # Slightly rotated version for "step" frame
-                alt_img = pygame.transform.rotate(base_img, 8 if i % 2 == 0 else -8)
-                defender_anim[i] = {
-                    "frames": [base_img, alt_img],
-                }
-
-            # Ensure ball is reset at the start of each run
-            self._reset_ball_position()
+            if carry_on:
+                carry_on = False  # the run max_frames stopped plays on
+            else:
+                self._start_run(bot)
+            self._run_open = False
+            recording = self._recording
 
             # -------- One full run of the game --------
             running = True
             while running:
-                self._quit_game()
-                self.anim_counter += 1
-
-                # --- Ball physics with smooth motion ---
-                user_input = get_ball_move()
-                acceleration = 1.0
-                if user_input[pygame.K_LEFT]:
-                    self.ball_vx -= acceleration
-                if user_input[pygame.K_RIGHT]:
-                    self.ball_vx += acceleration
-                if user_input[pygame.K_UP]:
-                    self.ball_vy -= acceleration
-                if user_input[pygame.K_DOWN]:
-                    self.ball_vy += acceleration
-
-                # Apply friction
-                friction = 0.90
-                self.ball_vx *= friction
-                self.ball_vy *= friction
-
-                # Limit maximum speed
-                speed = (self.ball_vx ** 2 + self.ball_vy ** 2) ** 0.5
-                if speed > max_speed and speed > 0:
-                    scale = max_speed / speed
-                    self.ball_vx *= scale
-                    self.ball_vy *= scale
-
-                # Update ball position
-                self.ball_x += self.ball_vx
-                self.ball_y += self.ball_vy
-
-                # Keep ball within field bounds
-                self.ball_x = max(100, min(self.ball_x, 900))
-                self.ball_y = max(150, min(self.ball_y, 950))
-
-                # --- Drawing section ---
-                self.screen.blit(background_list[0], background_list[1])
-                self.screen.blit(goal_list[0], goal_list[1])
-
-                # Level graphic (cap at 6 in case level > 6)
-                display_level = min(level, 6)
-                level_list = make_level_rect(display_level, self.level_dict)
-                self.screen.blit(level_list[0], level_list[1])
-
-                # Ball
-                ball_coord = ball.get_rect(
-                    center=(int(self.ball_x), int(self.ball_y))
-                )
-                self.screen.blit(ball, ball_coord)
-
-                # Track nearest defender to the ball each frame
-                nearest_def_x = None
-                nearest_def_y = None
-                nearest_dist_sq = None
-
-                # Defenders: CONSTANT PATTERNS (horizontal + vertical) + ANIMATION
-                for i in stats_dict:
-                    defender_entry = stats_dict[i]
-                    defender_x = defender_entry[1]
-                    defender_y = defender_entry[2]
-                    vx, vy = defender_vel[i]
-
-                    # Move defender
-                    defender_x += vx
-                    defender_y += vy
-
-                    # Bounce horizontally between 150 and 850
-                    if defender_x <= 150 or defender_x >= 850:
-                        vx = -vx
-                        defender_x += vx  # move back inside after bounce
-
-                    # Bounce vertically between 200 and 800
-                    if defender_y <= 200 or defender_y >= 800:
-                        vy = -vy
-                        defender_y += vy
-
-                    defender_entry[1] = defender_x
-                    defender_entry[2] = defender_y
-                    defender_vel[i] = [vx, vy]
-
-                    # --- Animation: choose frame + bobbing ---
-                    anim = defender_anim[i]
-                    # Switch frame every 10 ticks
-                    frame_id = 0 if (self.anim_counter // 10) % 2 == 0 else 1
-                    current_img = anim["frames"][frame_id]
-
-                    # Bobbing offset (small up/down sine wave)
-                    bob_offset = int(
-                        3 * math.sin((self.anim_counter + i * 7) / 12.0)
-                    )
-                    draw_y = defender_y + bob_offset
-
-                    # Track nearest defender (using bobbed draw_y for realism)
-                    dx_ball = self.ball_x - defender_x
-                    dy_ball = self.ball_y - draw_y
-                    dist_sq = dx_ball * dx_ball + dy_ball * dy_ball
-                    if nearest_dist_sq is None or dist_sq < nearest_dist_sq:
-                        nearest_dist_sq = dist_sq
-                        nearest_def_x = defender_x
-                        nearest_def_y = draw_y
-
-                    # Draw defender
-                    self.screen.blit(current_img, (defender_x, draw_y))
-                    defender_coord = current_img.get_rect(
-                        center=(defender_x, draw_y)
-                    )
-
-                    # Collision check
-                    if ball_coord.colliderect(defender_coord):
-                        game_over = self._ball_defend_collide()
-                        if game_over:
-                            running = False
-                        # Either way, stop processing defenders this frame
+                frame_start = time.perf_counter()
+                self.events.dispatch()
+                if self.hot_reload is not None:
+                    self.hot_reload.apply()
+                if self.events.state == "paused":
+                    if bot is None and not self.headless:
+                        self._suspend()
+                        clock.tick()  # the pause is not a frame
+                        continue
+                    self.events.set_state("play")  # bots play on
+
+                # Each step takes its own input, so bots and
+                # replays see every step they would at 60 FPS
+                event = None
+                for _ in range(self.frame_steps()):
+                    if bot is None:
+                        user_input = get_ball_move()
+                    else:
+                        user_input = bot.get_ball_move(self.match)
+                    if recording:
+                        self.recorder.add(user_input, self.match.animate)
+                    event = self.step_match(user_input)
+                    if event is not None:
                         break
-
-                # If game ended this frame, skip the rest and go to Game Over screen
-                if not running:
-                    # Draw HUD once more behind the Game Over overlay
-                    self._draw_hud(level)
-                    pygame.display.update()
-                    continue
-
-                # --- Auto-escape / dribble assist when defender is close ---
-                if nearest_def_x is not None:
-                    dx = self.ball_x - nearest_def_x
-                    dy = self.ball_y - nearest_def_y
-                    dist_sq = dx * dx + dy * dy
-
-                    if dist_sq > 0 and dist_sq < danger_radius * danger_radius:
-                        dist = dist_sq ** 0.5
-                        ux = dx / dist
-                        uy = dy / dist
-
-                        # Stronger escape when they are very close
-                        closeness = (danger_radius - dist) / danger_radius  # 0..1
-                        escape_strength = max_escape_force * closeness
-
-                        # Add escape force to ball velocity
-                        self.ball_vx += ux * escape_strength
-                        self.ball_vy += uy * escape_strength
-
-                # Goal collision: level up
-                if ball_coord.colliderect(goal_list[1]):
-                    self.score += 1
-                    if self.score > self.high_score:
-                        self.high_score = self.score
-                        save_high_score(self.high_score)
-                    if self.goal_sound:
-                        self.goal_sound.play()
-
-                    self.screen.blit(level_up_list[0], level_up_list[1])
-                    pygame.display.update()
-                    pygame.time.wait(800)
-
-                    # Increase difficulty: next level, more defenders + faster
-                    level += 1
-                    level_stats = Level(level)
-                    number_def = level_stats.create_numdef()
-                    base_vel = level_stats.create_newvel()
-                    max_speed = base_vel / 2.0
-
-                    new_defend_dict = make_def_dict(number_def)
-                    stats_dict = initialize_def(new_defend_dict)
-
-                    # Rebuild defender velocities for new defenders
-                    defender_vel = {}
-                    for i in stats_dict:
-                        vx = (1.5 + 0.2 * level) * (1 if i % 2 == 0 else -1)
-                        vy = (1.0 + 0.15 * level) * (1 if i % 3 == 0 else -1)
-                        defender_vel[i] = [vx, vy]
-
-                    # Rebuild animation frames for new defenders
-                    defender_anim = {}
-                    for i, entry in stats_dict.items():
-                        base_img = entry[0]
-                        alt_img = pygame.transform.rotate(
-                            base_img, 8 if i % 2 == 0 else -8
-                        )
-                        defender_anim[i] = {"frames": [base_img, alt_img]}
-
-                    self._reset_ball_position()
-
-                # HUD: now shows Level, Score, High Score, Lives
-                self._draw_hud(level)
-
-                pygame.display.update()
-                clock.tick(60)
+                self.draw_frame()
+                # Goals and tackles draw over this frame first
+                if not self.headless and event not in ("goal", "tackle"):
+                    self.renderer.present()
+                frame_time = time.perf_counter() - frame_start
+                self.frame_stats.record(frame_time)
+                self.run_stats.record(frame_time)
+                frames += 1
+                if (
+                    self.quality is not None
+                    and not self.headless
+                    and self.quality.record(frame_time)
+                ):
+                    self._apply_quality(self.quality.settings())
+
+                if event == "goal":
+                    self._score_goal()
+                    if self.diagnostics is not None:
+                        self.diagnostics.level_started(self.match.level)
+                elif event in ("tackle", "game_over"):
+                    self._ball_defend_collide(event == "game_over")
+                    running = event != "game_over"
+                    if not running and self.diagnostics is not None:
+                        self.diagnostics.run_ended(self.match.level)
+                    if not running and recording:
+                        self.recorder.finish(self.match.score)
+                if event is not None and self.telemetry is not None:
+                    self._record_event(event)
+                if self.snapshots is not None:
+                    if running:
+                        # Goals and tackles are saved at once
+                        self.snapshots.offer(self.match, force=event is not None)
+                    else:
+                        self.snapshots.clear()
+
+                if max_frames is not None and frames >= max_frames:
+                    self._run_open = running
+                    return self.frame_stats
+                # Headless runs uncapped; tick still measures the rate
+                clock.tick(0 if self.headless else self.quality_settings["fps"])
+                self.fps = clock.get_fps()
 
             # -------- After a run ends (GAME OVER) --------
+            if bot is not None:
+                if not bot.want_restart():
+                    return self.frame_stats
+                continue
             want_restart = self._game_over_screen()
             if not want_restart:
                 pygame.quit()
                 sys.exit()
             # else: loop back to outer while True and show start menu again
+
+    def draw_head_to_head(self, client):
+        """
+        Draw one frame of a networked head-to-head
+        match: the local match from the client's
+        latest snapshot and prediction, plus the
+        opponent's ball and score
+        Args:
+            client: HeadToHeadClient of this player
+        """
+        self._load_assets()
+        self.events.dispatch()
+        self.match = client.match
+        self._update_camera()
+        self._draw_field()
+
+        ghost = SURFACES.track(self.assets["ball"].copy(), "overlay")
+        ghost.set_alpha(110)
+        opp_x, opp_y, opp_score = client.opponent
+        ghost_center = self._world_px((int(opp_x), int(opp_y)))
+        self.renderer.blit(ghost, ghost.get_rect(center=ghost_center))
+
+        self._draw_hud(self.match.level)
+        rival = self.small_font.render(
+            f"Opponent: {opp_score}", True, (255, 215, 0)
+        )
+        self.renderer.blit(rival, self._px((20, 70)))
+        self.renderer.present()
@@ -0,0 +1,132 @@
+"""
+Unit tests for the gameplay statistics in
+soccer_game_field_aggregate file
+"""
+
+import os
+import time
+from soccer_game_field_aggregate import StatsAggregator
+from soccer_game_field_aggregate import update_stats
+from soccer_game_field_telemetry import TelemetryWriter
+
+
+def _play(directory, runs, max_bytes=1024 * 1024):
+    """
+    Write telemetry of runs, each a tuple of
+    the starting level, goals and whether a
+    bot played, with a tackle before each goal.
+    Small files get each goal as its own batch,
+    so runs spread over several files
+    """
+    writer = TelemetryWriter(
+        directory, max_bytes=max_bytes, keep=1000, flush_interval=0.01
+    ).start()
+    for start, goals, bot in runs:
+        writer.record("run_start", level=start, bot=bot)
+        for goal in range(goals):
+            writer.record("tackle", level=start + goal, lives=2)
+            writer.record("goal", level=start + goal + 1, score=goal + 1)
+            if max_bytes < 1024:
+                time.sleep(0.02)
+        writer.record("game_over", level=start + goals, score=goals)
+    writer.close()
+
+
+def test_runs_counted_per_starting_level(tmp_path):
+    """
+    Test that human runs are added up by
+    starting level, bots only counted, and
+    the leaderboard sorted by score
+    """
+    telemetry = str(tmp_path / "telemetry")
+    _play(telemetry, [(1, 3, False), (1, 5, False), (2, 0, False), (4, 9, True)])
+    aggregator = update_stats(telemetry, str(tmp_path / "stats"))
+    stats = aggregator.stats
+    assert (stats["runs"], stats["bot_runs"]) == (3, 1)
+    assert (stats["goals"], stats["tackles"]) == (8, 8)
+    assert stats["by_start"]["1"]["total_score"] == 8
+    assert stats["by_start"]["1"]["best"] == 5
+    assert stats["by_start"]["2"]["scores"] == {"0": 1}
+    assert stats["levels_reached"] == {"4": 1, "6": 1, "2": 1}
+    assert [entry["score"] for entry in stats["leaderboard"]] == [5, 3, 0]
+    with open(str(tmp_path / "stats" / "index.html"), encoding="utf-8") as f:
+        assert "Leaderboard" in f.read()
+
+
+def test_growing_file_read_from_its_new_members(tmp_path):
+    """
+    Test that a file still being written is
+    read from the first member not yet counted,
+    not decompressed again from its start
+    """
+    telemetry = str(tmp_path / "telemetry")
+    writer = TelemetryWriter(telemetry, flush_interval=0.01).start()
+    writer.record("run_start", level=1, bot=False)
+    time.sleep(0.1)
+    aggregator = StatsAggregator(str(tmp_path / "checkpoint.json"))
+    assert aggregator.update(telemetry) == 1
+    (name,) = os.listdir(telemetry)
+    size = os.path.getsize(os.path.join(telemetry, name))
+    assert aggregator.files[name]["member"] == size
+
+    writer.record("goal", level=2, score=1)
+    writer.record("game_over", level=2, score=1)
+    writer.close()
+    assert aggregator.update(telemetry) == 2
+    grown = os.path.getsize(os.path.join(telemetry, name))
+    assert aggregator.bytes_read == grown - size
+    assert aggregator.stats["runs"] == 1
+
+
+def test_update_reads_only_new_events(tmp_path):
+    """
+    Test that a second update reads nothing
+    new, a third only the new session, and
+    the totals match a full rescan, with runs
+    spread over several small files
+    """
+    telemetry = str(tmp_path / "telemetry")
+    out = str(tmp_path / "stats")
+    _play(telemetry, [(1, 30, False)], max_bytes=200)
+    assert len(os.listdir(telemetry)) > 1
+    first = update_stats(telemetry, out)
+    assert first.stats["runs"] == 1
+    assert update_stats(telemetry, out).events_read == 0
+
+    _play(telemetry, [(3, 2, False)], max_bytes=200)
+    third = update_stats(telemetry, out)
+    assert third.events_read == 2 + 2 * 2
+    full = StatsAggregator(str(tmp_path / "fresh.json"))
+    full.update(telemetry)
+    assert third.stats == full.stats
+
+
+def test_runs_never_ended_dropped_from_checkpoint(tmp_path):
+    """
+    Test that a run quit mid-way, and one
+    whose session files are gone without a
+    game over, are counted as abandoned and
+    no longer kept in the checkpoint
+    """
+    telemetry = str(tmp_path / "telemetry")
+    for ends in ("quit", None):
+        writer = TelemetryWriter(telemetry, keep=1000).start()
+        writer.record("run_start", level=1, bot=False)
+        writer.record("goal", level=2, score=1)
+        if ends is not None:
+            writer.record(ends)
+        writer.close()
+        time.sleep(0.01)  # sessions are named to the millisecond
+    stats_dir = str(tmp_path / "stats")
+    aggregator = update_stats(telemetry, stats_dir)
+    assert aggregator.stats["abandoned"] == 1
+    assert len(aggregator.open_runs) == 1
+
+    # The writer prunes the crashed session's files
+    for name in os.listdir(telemetry):
+        os.remove(os.path.join(telemetry, name))
+    aggregator = update_stats(telemetry, stats_dir)
+    assert aggregator.stats["abandoned"] == 2
+    assert aggregator.stats["runs"] == 0
+    saved = StatsAggregator(os.path.join(stats_dir, "checkpoint.json"))
+    assert not saved.open_runs
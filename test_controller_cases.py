@@ -3,7 +3,15 @@ Unit tests for public methods in
 soccer_game_field_controller file
 """
 
+import os
+import pygame
+import pytest
+from soccer_game_field_controller import BotController
 from soccer_game_field_controller import FieldController
+from soccer_game_field_controller import EventDispatcher
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_model import Match
+from soccer_game_field_view import UpFieldView
 
 
 def test_get_level_inbounds(monkeypatch):
@@ -29,3 +37,90 @@ def test_get_level_inbounds(monkeypatch):
     monkeypatch.setattr("builtins.input", mock_input)
     assert field_c_instance.get_level() == 3
 
+
+
+def test_evasive_bot_heads_for_goal():
+    """
+    Test that with no defender near, the
+    bot pushes the ball up towards the goal
+    """
+    match = Match(1)
+    match.nearest_def = None
+    keys = EvasiveBot().get_ball_move(match)
+    assert keys[pygame.K_UP] and not keys[pygame.K_DOWN]
+
+
+def test_bot_restarts_run_out():
+    """
+    Test that a bot allowed one restart
+    plays again once, then quits
+    """
+    bot = EvasiveBot(restarts=1)
+    assert bot.want_restart() is True
+    assert bot.want_restart() is False
+
+
+def test_bot_must_choose_its_moves():
+    """
+    Test that a bot without get_ball_move
+    cannot be made
+    """
+    with pytest.raises(TypeError):
+        BotController()
+
+
+def test_carry_on_keeps_the_run_across_chunks():
+    """
+    Test that playing in chunks with carry_on
+    plays one run on instead of starting again
+    """
+    view = UpFieldView(headless=True)
+    bot = EvasiveBot(level=2)
+    view.display_game(bot=bot, max_frames=5, carry_on=True)
+    match = view.match
+    steps = match.anim_counter
+    view.display_game(bot=bot, max_frames=5, carry_on=True)
+    assert view.match is match
+    assert match.anim_counter > steps
+    view.display_game(bot=bot, max_frames=5)
+    assert view.match is not match
+
+
+def test_dispatcher_keeps_keys_across_states():
+    """
+    Test that a key pressed right after the
+    key that leaves the menu is handled by
+    the next screen instead of being dropped
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    dispatcher = EventDispatcher()
+    seen = []
+
+    def leave_menu(_):
+        dispatcher.set_state("play")
+
+    dispatcher.on("menu", pygame.KEYDOWN, leave_menu)
+    dispatcher.on("play", pygame.KEYDOWN, lambda event: seen.append(event.key))
+    dispatcher.install()
+    dispatcher.set_state("menu")
+    pygame.event.clear()
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+    dispatcher.dispatch()
+    assert seen == [pygame.K_p]
+
+
+def test_dispatcher_filters_unused_events():
+    """
+    Test that event types with no handler
+    are kept out of the queue
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    dispatcher = EventDispatcher()
+    dispatcher.on(None, pygame.QUIT, lambda event: None)
+    dispatcher.install()
+    assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+    assert not pygame.event.get_blocked(pygame.QUIT)
+    assert dispatcher.wait(1) is False
@@ -0,0 +1,35 @@
+"""
+Unit tests for the memory diagnostics in
+soccer_game_field_diagnostics file
+"""
+
+import pygame
+from soccer_game_field_diagnostics import SurfaceTracker
+from soccer_game_field_diagnostics import MemoryDiagnostics
+
+
+def test_tracker_counts_live_surfaces():
+    """
+    Test that a Surface stops being counted
+    once nothing holds it any more
+    """
+    tracker = SurfaceTracker()
+    tracker.enabled = True
+    kept = tracker.track(pygame.Surface((4, 4)), "hud")
+    tracker.track(pygame.Surface((4, 4)), "hud")
+    assert tracker.counts() == {"hud": 1}
+    assert tracker.created == {"hud": 2}
+    assert kept is not None
+
+
+def test_growth_flagged_after_rising_restarts():
+    """
+    Test that memory rising at the end of
+    every one of the last restarts is flagged,
+    and flat memory is not
+    """
+    diagnostics = MemoryDiagnostics(restarts=3, threshold=1024)
+    diagnostics.run_ends.extend([10000, 10000, 10000, 10000])
+    assert not diagnostics.check_growth()
+    diagnostics.run_ends.extend([20000, 30000, 40000])
+    assert diagnostics.check_growth()
@@ -0,0 +1,165 @@
+"""
+Unit tests for the dev mode hot reload in
+soccer_game_field_hotreload file
+"""
+
+# pylint: disable=protected-access
+import json
+import os
+import shutil
+import pygame
+from soccer_game_field_hotreload import FileWatcher
+from soccer_game_field_hotreload import HotReloader
+from soccer_game_field_levels import load_levels
+from soccer_game_field_model import ASSET_CACHE
+from soccer_game_field_model import Match
+from soccer_game_field_view import UpFieldView
+
+LEVEL = {
+    "defenders": 2,
+    "ball_speed": 12.5,
+    "defender_speed": [1.7, 1.15],
+    "lanes": [300, 600],
+    "badge": "images/level_one.png",
+}
+
+
+def _newer(path):
+    """
+    Move the modification time of path a
+    second on, as a later save would
+    """
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def _touch(path, text):
+    """
+    Write text to path with a newer
+    modification time than before
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    _newer(path)
+
+
+def test_watcher_reports_each_change_once(tmp_path):
+    """
+    Test that added, changed and removed
+    files are reported, each only once
+    """
+    (tmp_path / "a.txt").write_text("a", encoding="utf-8")
+    watcher = FileWatcher([str(tmp_path)])
+    assert not watcher.poll()
+    _touch(str(tmp_path / "a.txt"), "b")
+    (tmp_path / "c.txt").write_text("c", encoding="utf-8")
+    watcher.poll()
+    os.remove(str(tmp_path / "c.txt"))
+    watcher.poll()
+    names = {os.path.basename(path) for path in watcher.changes()}
+    assert names == {"a.txt", "c.txt"}
+    assert not watcher.changes()
+
+
+def test_changed_image_swapped_in_mid_match(tmp_path, monkeypatch):
+    """
+    Test that a changed ball image replaces
+    only its own cache entries, and the match
+    plays on where it was
+    """
+    shutil.copytree("images", str(tmp_path / "images"))
+    monkeypatch.chdir(tmp_path)
+    view = UpFieldView(headless=True)
+    view._load_assets()
+    view.match = Match(3)
+    view.match.score = 2
+    view.match.ball_x = 321.0
+    goal = view.assets["goal"][0]
+    reloader = HotReloader(view, ["images"])
+    try:
+        red = pygame.Surface((10, 10))
+        red.fill((255, 0, 0))
+        pygame.image.save(red, "images/soccerball.png")
+        _newer("images/soccerball.png")
+        reloader.watcher.poll()
+        assert reloader.apply() == [os.path.join("images", "soccerball.png")]
+        assert view.assets["ball"].get_at((25, 25))[:3] == (255, 0, 0)
+        assert view.assets["goal"][0] is goal
+        assert view.match.ball_mask.count() == 50 * 50
+        assert (view.match.score, view.match.ball_x) == (2, 321.0)
+    finally:
+        # Later tests load the real ball again
+        ASSET_CACHE.invalidate("images/soccerball.png")
+
+
+def test_level_file_reloaded_without_reset(tmp_path):
+    """
+    Test that editing the level file changes
+    the level being played, keeping the score,
+    and that a broken edit is skipped
+    """
+    path = str(tmp_path / "levels.json")
+    _touch(path, json.dumps({"levels": [LEVEL]}))
+    view = UpFieldView(headless=True)
+    view.match = Match(1, levels=load_levels(path))
+    view.match.score = 4
+    reloader = HotReloader(view, [path])
+
+    _touch(path, json.dumps({"levels": [dict(LEVEL, defenders=1, lanes=[500])]}))
+    reloader.watcher.poll()
+    assert reloader.apply() == [path]
+    assert len(view.match.defenders) == 1
+    assert view.match.score == 4
+
+    _touch(path, "{not json")
+    reloader.watcher.poll()
+    assert reloader.apply() == []
+    assert len(view.match.defenders) == 1
+
+
+def test_unreadable_image_retried_once_saved(tmp_path, monkeypatch):
+    """
+    Test that an image caught mid-save keeps
+    the old one in play and is not read again
+    every frame, only once it is saved again,
+    and then from disk once
+    """
+    shutil.copytree("images", str(tmp_path / "images"))
+    monkeypatch.chdir(tmp_path)
+    view = UpFieldView(headless=True)
+    view._load_assets()
+    view.match = Match(3)
+    ball = view.assets["ball"]
+    reloader = HotReloader(view, ["images"])
+    loads = []
+    load = pygame.image.load
+
+    def counted_load(path, *args):
+        loads.append(path)
+        return load(path, *args)
+
+    monkeypatch.setattr(pygame.image, "load", counted_load)
+    path = os.path.join("images", "soccerball.png")
+    try:
+        with open(path, "wb") as f:
+            f.write(b"\x89PNG half saved")
+        _newer(path)
+        reloader.watcher.poll()
+        assert reloader.apply() == []
+        assert path in reloader.failed
+        assert view.assets["ball"] is ball
+        for _ in range(5):
+            assert reloader.apply() == []
+        assert loads.count(path) == 1
+
+        red = pygame.Surface((10, 10))
+        red.fill((255, 0, 0))
+        pygame.image.save(red, path)
+        _newer(path)
+        loads.clear()
+        assert reloader.apply() == [path]
+        assert not reloader.failed
+        assert loads.count(path) == 1
+        assert view.assets["ball"].get_at((25, 25))[:3] == (255, 0, 0)
+    finally:
+        ASSET_CACHE.invalidate("images/soccerball.png")
@@ -0,0 +1,111 @@
+"""
+Unit tests for the level files in
+soccer_game_field_levels file
+"""
+
+import json
+import pytest
+from soccer_game_field_levels import LevelError
+from soccer_game_field_levels import load_levels
+from soccer_game_field_levels import default_levels
+from soccer_game_field_model import Match
+
+
+def _write_levels(tmp_path, levels, name="levels.json"):
+    """
+    Write a JSON level file and return its path
+    """
+    path = tmp_path / name
+    path.write_text(json.dumps({"levels": levels}), encoding="utf-8")
+    return str(path)
+
+
+LEVEL = {
+    "defenders": 2,
+    "ball_speed": 12.5,
+    "defender_speed": [1.7, 1.15],
+    "lanes": [300, 600],
+    "badge": "images/level_one.png",
+}
+
+
+def test_shipped_levels_match_the_old_formulas():
+    """
+    Test that the shipped level file keeps the
+    difficulty the game had before it
+    """
+    levels = default_levels()
+    for number in (1, 4, 9):
+        spec = levels.get(number)
+        assert spec.defenders == number
+        assert spec.ball_speed == (4 * number + 20) / 2
+        assert spec.defender_speed[0] == pytest.approx(1.5 + 0.2 * number)
+        assert spec.pursuers == max(0, number - 5)
+        assert spec.pursuer_speed == 1.0 + 0.25 * number
+    assert levels.get(1000) == levels.specs[-1]
+
+
+def test_compiled_table_cached_by_hash(tmp_path):
+    """
+    Test that a second load reads the cached
+    table and an edited file is compiled again
+    """
+    path = _write_levels(tmp_path, [LEVEL])
+    first = load_levels(path)
+    second = load_levels(path)
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.specs == first.specs
+    assert second.get(1).ball_speed == 12.5
+
+    _write_levels(tmp_path, [LEVEL, dict(LEVEL, defenders=3)])
+    edited = load_levels(path)
+    assert not edited.from_cache
+    assert len(edited) == 2
+
+
+def test_invalid_levels_rejected(tmp_path):
+    """
+    Test that mistakes in a level file are
+    reported with the level they are in
+    """
+    path = _write_levels(tmp_path, [LEVEL, dict(LEVEL, pursuers=5)])
+    with pytest.raises(LevelError, match="level 2: 'pursuers'"):
+        load_levels(path)
+    path = _write_levels(tmp_path, [dict(LEVEL, pattern="zigzag")])
+    with pytest.raises(LevelError, match="'pattern'"):
+        load_levels(path)
+
+
+def test_match_set_up_from_level_file(tmp_path):
+    """
+    Test that a match places and moves its
+    defenders as its level file says
+    """
+    levels = load_levels(
+        _write_levels(tmp_path, [dict(LEVEL, pattern="horizontal")])
+    )
+    match = Match(1, levels=levels)
+    assert match.max_speed == 12.5
+    assert [defender.y for defender in match.defenders] == [300, 600]
+    assert all(defender.vy == 0 for defender in match.defenders)
+
+
+def test_pursuer_speed_from_level_file(tmp_path):
+    """
+    Test that pursuers chase at the speed the
+    level file gives, else one from the level
+    """
+    levels = load_levels(
+        _write_levels(
+            tmp_path,
+            [dict(LEVEL, pursuers=1), dict(LEVEL, pursuers=1, pursuer_speed=4.5)],
+        )
+    )
+    assert levels.get(1).pursuer_speed == 1.25
+    match = Match(2, levels=levels)
+    assert match.pursuer_speed == 4.5
+    match.ball_x, match.ball_y = 550.0, 850.0
+    match.flow.set_target(match.ball_x, match.ball_y)
+    _, vy = match._pursue(550.0, 450.0, 0.0, 0.0)  # pylint: disable=protected-access
+    assert vy == pytest.approx(4.5 * match.pursuit_turn)
@@ -0,0 +1,39 @@
+"""
+Unit tests for the metrics endpoint in
+soccer_game_field_metrics file
+"""
+
+import urllib.request
+from soccer_game_field_view import UpFieldView
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_metrics import MetricsServer
+from soccer_game_field_metrics import render_metrics
+
+
+def test_render_metrics_histogram():
+    """
+    Test that the frame histogram counts
+    every frame the view played
+    """
+    view = UpFieldView(headless=True)
+    view.display_game(bot=EvasiveBot(level=2), max_frames=20)
+    text = render_metrics(view)
+    assert 'soccer_frame_seconds_bucket{le="+Inf"} 20' in text
+    assert "soccer_level 2" in text
+    assert "soccer_defenders 2" in text
+
+
+def test_metrics_server_scrape():
+    """
+    Test that the endpoint serves the
+    metrics page over HTTP
+    """
+    view = UpFieldView(headless=True)
+    server = MetricsServer(view, port=0).start()
+    try:
+        url = f"http://127.0.0.1:{server.port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.stop()
+    assert "soccer_asset_cache_hits_total" in body
@@ -4,13 +4,16 @@ soccer_game_field_model file
 
 """
 
+import pygame
+from soccer_game_field_levels import default_levels
 from soccer_game_field_model import Level
 from soccer_game_field_model import Defender
 from soccer_game_field_model import defend_move
 from soccer_game_field_model import make_def_dict
 from soccer_game_field_model import initialize_def
-from soccer_game_field_model import level_images
-from soccer_game_field_model import make_level_rect
+from soccer_game_field_model import escape_force
+from soccer_game_field_model import Match
+from soccer_game_field_model import FlowField
 
 
 def test_create_numdef_one():
@@ -44,28 +47,24 @@ def test_newvel_increase():
     assert (s_level_vel - f_level_vel) >= 0
 
 
-def test_newvel_fifteen():
+def test_newvel_from_level_file():
     """
-    Test that when level changes by one
-    velocity changes by 4 pixels
+    Test that the ball speed of a level
+    is the one its level file defines
     """
-    one_level = Level(3)
-    o_level_vel = one_level.create_newvel()
-    two_level = Level(4)
-    t_level_vel = two_level.create_newvel()
-    assert (t_level_vel - o_level_vel) == 4
+    one_level = Level(4)
+    assert one_level.create_newvel() == default_levels().get(4).ball_speed
 
 
-def test_newvel_double():
+def test_newvel_past_last_level():
     """
-    Test that when game skips one level,
-    velocity changes by 8
+    Test that a level past the last one
+    defined keeps the last ball speed
     """
-    init_level = Level(2)
-    i_level_vel = init_level.create_newvel()
-    double_level = Level(4)
-    d_level_vel = double_level.create_newvel()
-    assert (d_level_vel - i_level_vel) == 8
+    last = len(default_levels())
+    last_level = Level(last)
+    past_level = Level(last + 5)
+    assert past_level.create_newvel() == last_level.create_newvel()
 
 
 def test_def_bounds():
@@ -158,35 +157,156 @@ def test_initialize_def_length():
     assert len(initial_reg_dict) == len(reg_dict)
 
 
-def test_initialize_dict_value_length():
+def test_initialize_def_entities():
     """
-    Test that values of a key in the
-    initialized dictionary is a list of
-    three elements.
+    Test that each initialized defender
+    holds its image and position, in the
+    order of the dictionary keys
     """
     reg_dict = make_def_dict(3)
-    new_initial_dict = initialize_def(reg_dict)
-    defender_two = new_initial_dict[2]
-    assert len(defender_two) == 3
+    defenders = initialize_def(reg_dict)
+    defender_two = defenders[1]
+    assert defender_two.image.get_size() == (150, 150)
+    assert (defender_two.x, defender_two.y) == (400.0, reg_dict[2])
 
 
-def test_level_image_length():
+def test_escape_force_outside_radius():
     """
-    Test that when called, the
-    dictionary length is always
-    six
+    Test that a defender outside the
+    danger radius does not push the ball
     """
-    level_dict = level_images()
-    assert len(level_dict) == 6
+    assert escape_force(500, 500, 500, 800, 180.0, 1.2) == (0.0, 0.0)
 
 
-def test_make_level_rect_length():
+def test_escape_force_away_from_defender():
     """
-    Test that the value of a
-    key in the image dictionary
-    is a list with the length of
-    two
+    Test that a defender just below the
+    ball pushes it straight up
     """
-    level_dict_im = level_images()
-    rect_level = make_level_rect(3, level_dict_im)
-    assert len(rect_level) == 2
+    push_x, push_y = escape_force(500, 500, 500, 590, 180.0, 1.2)
+    assert push_x == 0
+    assert push_y < 0
+
+
+def test_match_step_moves_ball():
+    """
+    Test that holding UP for a frame
+    moves the ball up the field
+    """
+    match = Match(1)
+    start_y = match.ball_y
+    held = {pygame.K_LEFT: False, pygame.K_RIGHT: False}
+    held.update({pygame.K_UP: True, pygame.K_DOWN: False})
+    match.step(held)
+    assert match.ball_y < start_y
+
+
+def test_match_goal_levels_up():
+    """
+    Test that putting the ball in the goal
+    scores, adds a defender and resets the ball
+    """
+    match = Match(1)
+    match.defenders.clear()
+    match.ball_x, match.ball_y = 500.0, 150.0
+    idle = dict.fromkeys(
+        (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), False
+    )
+    assert match.step(idle) == "goal"
+    assert match.score == 1
+    assert len(match.defenders) == 2
+    assert match.ball_y == 900.0
+
+
+def test_ball_hits_ignores_transparent_corner():
+    """
+    Test that a ball inside the defender's
+    rectangle but over its transparent corner
+    is not a tackle
+    """
+    match = Match(1)
+    defender = match.defenders[0]
+    sprite = match.defender_sprite(defender)
+    corner = sprite[0].get_rect(center=(sprite[1], sprite[2])).bottomright
+    ball_coord = pygame.Rect(0, 0, 50, 50)
+    ball_coord.bottomright = corner
+    assert not match.ball_hits(ball_coord, defender, sprite)
+
+
+def test_ball_hits_defender_body():
+    """
+    Test that a ball over the body of the
+    defender is a tackle
+    """
+    match = Match(1)
+    defender = match.defenders[0]
+    sprite = match.defender_sprite(defender)
+    topleft = sprite[0].get_rect(center=(sprite[1], sprite[2])).topleft
+    body_x, body_y = defender.masks[0].centroid()
+    ball_coord = pygame.Rect(0, 0, 50, 50)
+    ball_coord.center = (topleft[0] + body_x, topleft[1] + body_y)
+    assert match.ball_hits(ball_coord, defender, sprite)
+
+
+def test_match_beyond_five_defenders():
+    """
+    Test that from level six on, defenders
+    that do not fit a lane of their own share
+    one and the match still plays
+    """
+    match = Match(7)
+    idle = dict.fromkeys(
+        (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), False
+    )
+    match.step(idle)
+    assert match.defenders[5].y is not None
+    assert len(match.defenders) == 7
+
+
+def test_long_pitch_spreads_defenders():
+    """
+    Test that a pitch three screens long
+    starts the ball at its far end and puts
+    the level's defenders on every screen
+    """
+    match = Match(2, length=3000)
+    assert match.ball_y == 2900
+    lanes = sorted(defender.y for defender in match.defenders)
+    assert len(lanes) == 6
+    assert [y // 1000 for y in lanes] == [0, 0, 1, 1, 2, 2]
+
+
+def test_flow_field_updates_only_on_cell_change():
+    """
+    Test that the flow points toward the
+    target cell and is only worked out again
+    once the target changes cells
+    """
+    flow = FlowField(1000, 1000, cell=100)
+    flow.set_target(550, 150)
+    assert flow.direction(550, 850) == (0.0, -1.0)
+    assert flow.direction(520, 880) == (0.0, -1.0)
+    assert flow.updates == 1
+    flow.set_target(590, 120)
+    flow.direction(550, 850)
+    assert flow.updates == 1
+    flow.set_target(850, 850)
+    assert flow.direction(550, 850) == (1.0, 0.0)
+    assert flow.updates == 2
+
+
+def test_pursuers_chase_the_ball():
+    """
+    Test that on levels with pursuers in the
+    level file, the last defenders placed steer
+    toward the ball while the others patrol
+    """
+    assert not Match(5).pursuers
+    match = Match(7)
+    assert match.pursuers == match.defenders[5:]
+    assert [defender.pursuer for defender in match.defenders].count(True) == 2
+    match.ball_x, match.ball_y = 550.0, 850.0
+    match.flow.set_target(match.ball_x, match.ball_y)
+    vx, vy = match._pursue(550.0, 450.0, 0.0, 0.0)
+    assert vx == 0.0
+    assert vy > 0.0
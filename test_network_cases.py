@@ -0,0 +1,111 @@
+"""
+Unit tests for the snapshot encoding and
+localhost play of the
+soccer_game_field_network file
+"""
+
+# pylint: disable=protected-access
+import asyncio
+import pygame
+from soccer_game_field_model import Match
+from soccer_game_field_network import HISTORY
+from soccer_game_field_network import HeadToHeadClient
+from soccer_game_field_network import snapshot_values
+from soccer_game_field_network import encode_snapshot
+from soccer_game_field_network import decode_snapshot
+from soccer_game_field_network import run_local
+
+
+def test_full_snapshot_round_trip():
+    """
+    Test that a snapshot without a base
+    decodes to the values it was made from
+    """
+    values = snapshot_values(Match(3), Match(3))
+    packet = encode_snapshot(1, 0, values)
+    assert decode_snapshot(packet, {}) == (1, 0, values)
+
+
+def test_delta_snapshot_smaller():
+    """
+    Test that a snapshot where only the ball
+    moved is smaller than the full snapshot
+    and decodes against its base
+    """
+    match = Match(3)
+    base = snapshot_values(match, match)
+    match.ball_y -= 10
+    values = snapshot_values(match, match)
+    full = encode_snapshot(2, 5, values)
+    delta = encode_snapshot(2, 5, values, 1, base)
+    assert len(delta) < len(full)
+    assert decode_snapshot(delta, {1: base}) == (2, 5, values)
+
+
+def test_delta_snapshot_unknown_base():
+    """
+    Test that a delta against a snapshot the
+    client never received is not decoded
+    """
+    match = Match(1)
+    base = snapshot_values(match, match)
+    delta = encode_snapshot(2, 0, base, 1, base)
+    assert decode_snapshot(delta, {}) is None
+
+
+def test_local_match_over_lossy_link():
+    """
+    Test that two bots on localhost keep
+    receiving snapshots over a lossy link
+    """
+    report, players = asyncio.run(
+        run_local(seconds=0.5, latency=0.01, loss=0.2, seed=1)
+    )
+    assert report["ticks"] > 0
+    for client in report["clients"]:
+        assert client["bytes_per_second"] > 0
+    for player in players:
+        assert player.latest_tick > 0
+
+
+def test_client_history_bounded_under_loss():
+    """
+    Test that snapshots lost on the way do
+    not leave old ones in the client history
+    """
+    client = HeadToHeadClient()
+    client.match = Match(2)
+    values = snapshot_values(client.match, client.match)
+    for tick in range(1, 1000):
+        if tick % 7:  # every seventh snapshot is lost
+            client._apply(tick, 0, values)
+    assert len(client.history) <= HISTORY
+    assert min(client.history) > 999 - HISTORY
+
+
+def test_prediction_applies_escape_assist():
+    """
+    Test that the client predicts the ball
+    as the server steps it near a defender
+    """
+    keys = dict.fromkeys(
+        (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN), False
+    )
+    server = Match(1)
+    client = HeadToHeadClient()
+    client.match = Match(1)
+    for match in (server, client.match):
+        match.animate = False
+        match.ball_x, match.ball_y = 500.0, 600.0
+        for defender in match.defenders:
+            defender.x, defender.y = 800.0, 250.0
+            defender.vx = defender.vy = 0.0
+        match.defenders[0].y = 740.0
+        match.defenders[0].x = 500.0
+    server.step(keys)
+    client._predict(keys)
+    assert server.ball_vy < 0
+    assert (client.match.ball_vx, client.match.ball_vy) == (
+        server.ball_vx,
+        server.ball_vy,
+    )
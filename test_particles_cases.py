@@ -0,0 +1,86 @@
+"""
+Unit tests for the particle effects in
+soccer_game_field_particles file
+"""
+
+import pygame
+from soccer_game_field_particles import ParticleSystem
+from soccer_game_field_particles import PARTICLE_KINDS
+
+
+def test_particles_expire_and_free_slots():
+    """
+    Test that particles are removed once
+    their life runs out, freeing their slots
+    """
+    particles = ParticleSystem(capacity=100, seed=1)
+    assert particles.emit("trail", 500, 500, 10) == 10
+    for _ in range(PARTICLE_KINDS["trail"]["life"]):
+        particles.update()
+    assert particles.count == 0
+    assert particles.emit("trail", 500, 500, 10) == 10
+
+
+def test_confetti_rises_then_falls():
+    """
+    Test that confetti is thrown upward and
+    pulled back down by gravity
+    """
+    particles = ParticleSystem(capacity=10, seed=1)
+    particles.emit("confetti", 500, 500, 1)
+    particles.update()
+    assert particles.y[0] < 500
+    rising = particles.vy[0]
+    for _ in range(40):
+        particles.update()
+    assert particles.vy[0] > rising
+
+
+def test_budget_thins_emission():
+    """
+    Test that bursts shrink as the budget
+    fills and never go beyond it
+    """
+    particles = ParticleSystem(capacity=1000, budget=100, seed=1)
+    first = particles.emit("dust", 500, 500, 60)
+    second = particles.emit("dust", 500, 500, 60)
+    assert first == 60
+    assert second < 60
+    for _ in range(20):
+        particles.emit("dust", 500, 500, 60)
+    assert particles.count <= 100
+    assert particles.dropped > 0
+    particles.set_budget(10)
+    assert particles.count == 10
+
+
+def test_draw_is_one_batched_blit():
+    """
+    Test that drawing hands every particle
+    to the renderer in one blits call
+    """
+
+    class Recorder:
+        """
+        Renderer that records its calls
+        """
+
+        def __init__(self):
+            self.calls = []
+
+        def blits(self, pairs):
+            """
+            Record one batch
+            """
+            self.calls.append(list(pairs))
+
+    particles = ParticleSystem(capacity=100, seed=1)
+    particles.emit("confetti", 500, 500, 30)
+    recorder = Recorder()
+    particles.draw(recorder, 0.5, 0.5)
+    assert len(recorder.calls) == 1
+    assert len(recorder.calls[0]) == 30
+    sprite, dest = recorder.calls[0][0]
+    assert isinstance(sprite, pygame.Surface)
+    assert sprite.get_size() == (5, 5)
+    assert list(dest) == [247.5, 247.5]
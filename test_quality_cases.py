@@ -0,0 +1,140 @@
+"""
+Unit tests for the adaptive quality in
+soccer_game_field_quality file
+"""
+
+# pylint: disable=protected-access
+import pygame
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_quality import QualityGovernor
+from soccer_game_field_quality import QUALITY_TIERS
+from soccer_game_field_model import Match
+from soccer_game_field_render import SubsurfaceRenderer
+from soccer_game_field_view import UpFieldView
+
+
+def test_slow_frames_step_down_one_tier():
+    """
+    Test that only a full window of slow
+    frames steps the quality down, one tier
+    """
+    governor = QualityGovernor(window=10)
+    changes = [governor.record(0.03) for _ in range(10)]
+    assert changes == [False] * 9 + [True]
+    assert governor.tier == 1
+    # The next tier is judged on fresh frames
+    assert not governor.record(0.03)
+    assert governor.tier == 1
+
+
+def test_one_hitch_changes_nothing():
+    """
+    Test that one very slow frame among fast
+    ones leaves the quality where it is
+    """
+    governor = QualityGovernor(window=10)
+    for _ in range(30):
+        governor.record(0.005)
+    governor.record(0.05)
+    assert governor.tier == 0
+    assert governor.changes == 0
+
+
+def test_step_up_needs_headroom_for_a_while():
+    """
+    Test that the quality steps up only after
+    hold frames well under the budget, and not
+    at all near the budget
+    """
+    governor = QualityGovernor(window=10, hold=50)
+    for _ in range(20):
+        governor.record(0.03)
+    assert governor.tier == 2
+    for _ in range(49):
+        governor.record(0.004)
+    assert governor.tier == 2
+    assert governor.record(0.004)
+    assert governor.tier == 1
+    for _ in range(200):
+        governor.record(0.014)  # under budget, but no headroom
+    assert governor.tier == 1
+
+
+def test_last_tier_is_the_floor():
+    """
+    Test that the quality never steps
+    below the cheapest tier
+    """
+    governor = QualityGovernor(window=5)
+    for _ in range(100):
+        governor.record(0.1)
+    assert governor.tier == len(QUALITY_TIERS) - 1
+    assert governor.settings()["fps"] == 30
+
+
+def test_still_defenders_do_not_bob():
+    """
+    Test that defenders are drawn at their
+    position on their first frame when the
+    match does not animate
+    """
+    match = Match(3)
+    match.anim_counter = 15
+    match.animate = False
+    for defender in match.defenders:
+        image, x, y = match.defender_sprite(defender)
+        assert image is defender.frames[0]
+        assert (x, y) == (defender.x, defender.y)
+
+
+def test_low_resolution_tier_redraws_smaller():
+    """
+    Test that the view switches to a lower
+    internal resolution and opaque HUD, and
+    draws correctly at it
+    """
+    view = UpFieldView(headless=True)
+    view._load_assets()
+    view.match = Match(2)
+    view._update_camera(snap=True)
+    view._apply_quality(QUALITY_TIERS[3])
+    assert view.renderer.get_size() == (700, 700)
+    assert view.assets["background"][0].get_size() == (700, 700)
+    assert view._px((500, 500)) == (350, 350)
+    assert not view.match.animate
+    view._draw_field()
+    view._draw_hud(view.match.level)
+    assert view._hud_bg.get_alpha() is None
+    view._apply_quality(QUALITY_TIERS[0])
+    assert view.renderer.get_size() == (1000, 1000)
+    assert view.match.animate
+
+
+def test_half_frame_rate_keeps_game_speed():
+    """
+    Test that at 30 frames a second each frame
+    steps the match twice, so it plays at the
+    same speed as at 60
+    """
+    view = UpFieldView(headless=True)
+    view.quality_settings = QUALITY_TIERS[-1]
+    assert view.frame_steps() == 2
+    view.display_game(bot=EvasiveBot(level=1), max_frames=10)
+    assert view.match.anim_counter == 20
+
+
+def test_pane_keeps_its_size_at_lower_quality():
+    """
+    Test that a renderer that cannot be
+    resized keeps its size instead of failing
+    """
+    window = pygame.Surface((1000, 1000))
+    view = UpFieldView(
+        internal_size=(500, 500),
+        renderer=SubsurfaceRenderer(window, (0, 0, 500, 500)),
+    )
+    view.match = Match(2)
+    view._apply_quality(QUALITY_TIERS[3])
+    assert view.renderer.get_size() == (500, 500)
+    assert view.quality_settings is QUALITY_TIERS[3]
+    assert not view.match.animate
@@ -0,0 +1,109 @@
+"""
+Unit tests for the replays and video export
+in soccer_game_field_replay file
+"""
+
+import os
+import pygame
+import pytest
+from soccer_game_field_replay import Replay
+from soccer_game_field_replay import ReplayBot
+from soccer_game_field_replay import ReplayError
+from soccer_game_field_replay import ReplayRecorder
+from soccer_game_field_replay import export_replay
+from soccer_game_field_levels import default_levels
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_model import Match
+from soccer_game_field_view import UpFieldView
+
+LEFT_UP = {
+    pygame.K_LEFT: True,
+    pygame.K_RIGHT: False,
+    pygame.K_UP: True,
+    pygame.K_DOWN: False,
+}
+
+
+def test_replay_round_trip():
+    """
+    Test that a replay saved as bytes reads
+    back the same, and a cut one is refused
+    """
+    replay = Replay(4, 2000, 30, digest="ab" * 32)
+    replay.add(LEFT_UP)
+    replay.add(LEFT_UP, animate=False)
+    copy = Replay.from_bytes(replay.to_bytes())
+    assert (copy.level, copy.length, copy.score) == (4, 2000, 30)
+    assert copy.digest == "ab" * 32
+    assert list(copy.inputs()) == [(LEFT_UP, True), (LEFT_UP, False)]
+    with pytest.raises(ReplayError):
+        Replay.from_bytes(replay.to_bytes()[:-1])
+
+
+def test_recorded_run_plays_back_the_same(tmp_path):
+    """
+    Test that a recorded bot run, played back
+    step by step, ends with the same score
+    """
+    view = UpFieldView(headless=True)
+    view.recorder = ReplayRecorder(str(tmp_path))
+    view.display_game(bot=EvasiveBot(level=2, restarts=0), max_frames=20000)
+    assert len(view.recorder.saved) == 1
+    replay = Replay.load(view.recorder.saved[0])
+    assert replay.score == view.match.score
+    assert replay.digest == default_levels().digest
+
+    match = Match(replay.level, length=replay.length)
+    bot = ReplayBot(replay)
+    events = [match.step(bot.get_ball_move(match)) for _ in range(len(replay))]
+    assert events[-1] == "game_over"
+    assert match.score == replay.score
+
+
+def test_runs_saved_in_one_second_kept_apart(tmp_path):
+    """
+    Test that runs ending alike in the same
+    second are saved to files of their own
+    """
+    recorder = ReplayRecorder(str(tmp_path))
+    paths = []
+    for _ in range(3):
+        recorder.start(1, 1000)
+        paths.append(recorder.finish(0))
+    assert len(set(paths)) == 3
+    assert len(os.listdir(str(tmp_path))) == 3
+
+
+def test_replay_of_other_levels_refused():
+    """
+    Test that a replay recorded with another
+    level file is not played back
+    """
+    replay = Replay(1, digest="00" * 31 + "01")
+    with pytest.raises(ReplayError, match="levels changed"):
+        ReplayBot(replay)
+    ReplayBot(Replay(1, digest=default_levels().digest))
+
+
+def test_export_writes_every_frame(tmp_path):
+    """
+    Test that a short replay exports the same
+    frames as PNGs in this process and as a
+    raw stream from worker processes
+    """
+    replay = Replay(1)
+    for _ in range(20):
+        replay.add(LEFT_UP)
+    count = export_replay(replay, str(tmp_path / "png"), (100, 100), workers=0)
+    assert count == 20
+    names = sorted(os.listdir(str(tmp_path / "png")))
+    assert names[0] == "frame_000000.png" and len(names) == 20
+    last = pygame.image.load(str(tmp_path / "png" / names[-1]))
+    assert last.get_size() == (100, 100)
+
+    raw = str(tmp_path / "clip.rgb")
+    assert export_replay(replay, raw, (100, 100), fmt="raw", workers=2) == 20
+    with open(raw, "rb") as f:
+        frames = f.read()
+    assert len(frames) == 20 * 100 * 100 * 3
+    assert frames[-30000:] == pygame.image.tobytes(last, "RGB")
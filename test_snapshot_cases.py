@@ -0,0 +1,169 @@
+"""
+Unit tests for the match snapshots in
+soccer_game_field_snapshot file
+"""
+
+import os
+import time
+import pygame
+from soccer_game_field_model import Match
+from soccer_game_field_snapshot import SLOTS
+from soccer_game_field_snapshot import SnapshotWriter
+from soccer_game_field_snapshot import dump_match
+from soccer_game_field_snapshot import load_match
+from soccer_game_field_snapshot import load_snapshot
+from soccer_game_field_snapshot import seal
+from soccer_game_field_view import LOGICAL_SIZE
+from soccer_game_field_view import UpFieldView
+
+# Up and left: the ball runs up field towards the goal
+UP_LEFT = {
+    pygame.K_LEFT: True,
+    pygame.K_RIGHT: False,
+    pygame.K_UP: True,
+    pygame.K_DOWN: False,
+}
+
+
+def _state(match):
+    """
+    Return everything a snapshot saves
+    of a match, for comparing
+    """
+    return (
+        match.level,
+        match.score,
+        match.lives,
+        match.ball_x,
+        match.ball_y,
+        match.ball_vx,
+        match.ball_vy,
+        match.anim_counter,
+        [(d.x, d.y, d.vx, d.vy, d.phase, d.pursuer) for d in match.defenders],
+    )
+
+
+def test_restored_match_plays_on_identically():
+    """
+    Test that a restored match steps exactly
+    as the one it was taken from
+    """
+    match = Match(4, length=1500)
+    match.score = 3
+    for _ in range(40):
+        match.step(UP_LEFT)
+    restored = load_match(seal(dump_match(match, sequence=7)))
+    assert _state(restored) == _state(match)
+    for _ in range(40):
+        assert restored.step(UP_LEFT) == match.step(UP_LEFT)
+    assert _state(restored) == _state(match)
+
+
+def test_newest_good_slot_resumes(tmp_path):
+    """
+    Test that the newest snapshot resumes and
+    a damaged one falls back to the other slot
+    """
+    older, newer = Match(2), Match(5)
+    directory = str(tmp_path)
+    for name, match, sequence in zip(SLOTS, (older, newer), (1, 2)):
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(seal(dump_match(match, sequence)))
+    assert load_snapshot(directory).level == 5
+
+    path = os.path.join(directory, SLOTS[1])
+    with open(path, "r+b") as f:
+        f.seek(60)
+        f.write(b"\xff\xff")
+    assert load_snapshot(directory).level == 2
+    assert load_snapshot(str(tmp_path / "none")) is None
+
+
+def test_writer_saves_in_background_and_clears(tmp_path):
+    """
+    Test that the writer saves every interval
+    frames, alternating slots, and removes the
+    snapshots once cleared
+    """
+    directory = str(tmp_path / "snap")
+    writer = SnapshotWriter(directory, interval=3).start()
+    match = Match(3)
+    taken = [writer.offer(match) for _ in range(6)]
+    assert taken == [False, False, True, False, False, True]
+    writer.close()
+    assert writer.written >= 1
+    assert load_snapshot(directory).level == 3
+
+    # A new writer numbers on from the saved snapshots
+    writer = SnapshotWriter(directory, interval=1).start()
+    assert writer.sequence == 2
+    writer.clear()
+    writer.close()
+    assert not any(os.path.exists(os.path.join(directory, n)) for n in SLOTS)
+
+
+class _NeverMoves:
+    """
+    Bot that keeps the ball still
+    """
+
+    def choose_level(self):
+        """
+        Never called when resuming
+        """
+        raise AssertionError("the menu was shown")
+
+    def get_ball_move(self, match):
+        """
+        Press nothing
+        """
+        del match
+        return dict.fromkeys(UP_LEFT, False)
+
+    def want_restart(self):
+        """
+        Stop after the run
+        """
+        return False
+
+
+def test_view_resumes_before_the_menu(tmp_path):
+    """
+    Test that a headless view plays the
+    restored match and keeps saving it
+    """
+    match = Match(6)
+    match.score = 5
+    view = UpFieldView(headless=True)
+    view.resume = match
+    view.snapshots = SnapshotWriter(str(tmp_path), interval=10).start()
+    view.display_game(bot=_NeverMoves(), max_frames=30)
+    view.snapshots.close()
+    assert view.match is match
+    assert view.resume is None
+    saved = load_snapshot(str(tmp_path))
+    assert (saved.level, saved.score) == (6, 5)
+
+
+def test_resumed_length_kept_to_its_match():
+    """
+    Test that resuming a match on a longer
+    pitch leaves the pitch of later runs alone
+    """
+    view = UpFieldView(headless=True)
+    view.resume = Match(2, length=3000)
+    view.display_game(bot=_NeverMoves(), max_frames=5)
+    assert view.match.length == 3000
+    assert view.pitch_length == LOGICAL_SIZE[1]
+
+
+def test_restore_is_fast():
+    """
+    Test that restoring a full level takes
+    milliseconds
+    """
+    data = seal(dump_match(Match(30, length=5000)))
+    load_match(data)  # images cached, as after the first load
+    start = time.perf_counter()
+    load_match(data)
+    assert time.perf_counter() - start < 0.05
@@ -0,0 +1,76 @@
+"""
+Unit tests for split screen play in
+soccer_game_field_splitscreen file
+"""
+
+from collections import defaultdict
+import pygame
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_splitscreen import SplitScreen
+from soccer_game_field_splitscreen import pane_rects
+from soccer_game_field_render import SubsurfaceRenderer
+from soccer_game_field_view import UpFieldView
+
+
+def test_pane_layout():
+    """
+    Test that two players sit side by side
+    and four share the window two by two
+    """
+    two = pane_rects(2, (1920, 1080))
+    assert [rect.size for rect in two] == [(960, 960)] * 2
+    assert two[0].right <= two[1].left
+    four = pane_rects(4, (1920, 1080))
+    assert [rect.size for rect in four] == [(540, 540)] * 4
+    assert four[0].bottom <= four[2].top
+
+
+def test_panes_play_independently_and_share_sprites():
+    """
+    Test that four bot matches play in one
+    window, sharing assets and rescaled sprites
+    """
+    bots = [EvasiveBot(level=2, restarts=0) for _ in range(4)]
+    split = SplitScreen(4, (800, 800), bots=bots, headless=True)
+    scores = split.run(level=2, max_frames=120)
+    assert len(scores) == 4
+    first, second = split.panes[0].view, split.panes[1].view
+    assert first.match is not second.match
+    assert first.assets["ball"] is second.assets["ball"]
+    assert first._scaled is second._scaled
+    assert split.frame_stats.count == 120
+
+
+def test_pane_reads_its_own_keys():
+    """
+    Test that the second player's ball moves
+    with their own keys and not the arrows
+    """
+    split = SplitScreen(2, (800, 400), headless=True)
+    for pane in split.panes:
+        pane.start(1)
+    pressed = defaultdict(bool)
+    pressed[pygame.K_a] = True
+    pressed[pygame.K_LEFT] = False
+    split.panes[1].frame(pressed)
+    split.panes[0].frame(pressed)
+    assert split.panes[1].view.match.ball_x < 500
+    assert split.panes[0].view.match.ball_x == 500
+
+
+def test_window_events_belong_to_the_split_screen():
+    """
+    Test that panes leave the window's event
+    filter to the split screen, so a pane made
+    later does not replace it
+    """
+    split = SplitScreen(2, (800, 400), headless=True)
+    assert all(pane.view.embedded for pane in split.panes)
+    assert pygame.event.get_blocked(pygame.WINDOWFOCUSLOST)
+    UpFieldView(
+        internal_size=(400, 400),
+        renderer=SubsurfaceRenderer(split.window, split.window.get_rect()),
+        embedded=True,
+    )
+    assert pygame.event.get_blocked(pygame.WINDOWFOCUSLOST)
+    assert not pygame.event.get_blocked(pygame.QUIT)
@@ -0,0 +1,106 @@
+"""
+Unit tests for the session telemetry in
+soccer_game_field_telemetry file
+"""
+
+# pylint: disable=protected-access
+import os
+import time
+from soccer_game_field_telemetry import TelemetryWriter
+from soccer_game_field_telemetry import read_events
+from soccer_game_field_controller import EvasiveBot
+from soccer_game_field_view import UpFieldView
+
+
+def _all_events(directory):
+    """
+    Return the events of every file in
+    directory, oldest file first
+    """
+    events = []
+    for name in sorted(os.listdir(directory)):
+        events.extend(read_events(os.path.join(directory, name)))
+    return events
+
+
+def test_events_written_and_rotated(tmp_path):
+    """
+    Test that every event recorded is written,
+    spread over several small files
+    """
+    writer = TelemetryWriter(str(tmp_path), max_bytes=200, flush_interval=0.01)
+    writer.start()
+    for i in range(200):
+        writer.record("goal", level=i, score=i * 10)
+        if i % 50 == 49:
+            # Let the writer take the events as separate batches
+            time.sleep(0.1)
+    writer.close()
+    events = _all_events(str(tmp_path))
+    assert [event["level"] for event in events] == list(range(200))
+    assert len(os.listdir(str(tmp_path))) > 1
+
+
+def test_prune_keeps_newest_files(tmp_path):
+    """
+    Test that only the newest keep files are
+    left, and none when keep is 0
+    """
+    for i in range(4):
+        (tmp_path / f"session-{i}.jsonl.gz").write_bytes(b"")
+    TelemetryWriter(str(tmp_path), keep=1)._prune()
+    assert os.listdir(str(tmp_path)) == ["session-3.jsonl.gz"]
+    TelemetryWriter(str(tmp_path), keep=0)._prune()
+    assert not os.listdir(str(tmp_path))
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    """
+    Test that events beyond the queue size are
+    dropped, counted and reported in the file
+    """
+    writer = TelemetryWriter(str(tmp_path), queue_size=5)
+    # Not started, so nothing drains the queue
+    results = [writer.record("tackle", lives=2) for _ in range(8)]
+    assert results.count(False) == 3
+    assert writer.dropped == 3
+    writer.start()
+    writer.close()
+    events = _all_events(str(tmp_path))
+    assert events[-1]["kind"] == "dropped"
+    assert events[-1]["count"] == 3
+
+
+def test_unwritable_folder_closes_at_once(tmp_path):
+    """
+    Test that a file that cannot be opened
+    is reported and the writer thread keeps
+    draining, so closing does not wait
+    """
+    folder = str(tmp_path / "telemetry")
+    writer = TelemetryWriter(folder, flush_interval=0.01).start()
+    os.rmdir(folder)
+    writer.record("goal", level=1)
+    time.sleep(0.1)
+    assert writer._thread.is_alive()  # pylint: disable=protected-access
+    start = time.perf_counter()
+    writer.close()
+    assert time.perf_counter() - start < 1.0
+    assert writer.written == 0
+
+
+def test_bot_run_recorded(tmp_path):
+    """
+    Test that a bot run records its start
+    and, at game over, its frame times
+    """
+    view = UpFieldView(headless=True)
+    view.telemetry = TelemetryWriter(str(tmp_path)).start()
+    view.display_game(bot=EvasiveBot(level=3, restarts=0), max_frames=20000)
+    view.telemetry.close()
+    events = _all_events(str(tmp_path))
+    assert events[0]["kind"] == "run_start"
+    assert events[0]["level"] == 3
+    game_over = [event for event in events if event["kind"] == "game_over"]
+    assert len(game_over) == 1
+    assert game_over[0]["frames"]["frames"] > 0
@@ -0,0 +1,125 @@
+"""
+Unit tests for drawing at a lower internal
+resolution, with the texture renderer, on
+a scrolling pitch and when paused in the
+soccer_game_field_view file
+"""
+
+import pygame
+from soccer_game_field_model import ASSET_CACHE
+from soccer_game_field_model import Match
+from soccer_game_field_view import UpFieldView
+
+
+def test_internal_resolution_scales_positions():
+    """
+    Test that logical positions are halved
+    at a 500x500 internal resolution
+    """
+    view = UpFieldView(headless=True, internal_size=(500, 500))
+    assert view.renderer.get_size() == (500, 500)
+    assert view.renderer.window.get_size() == (1000, 1000)
+    assert view._px((500, 100)) == (250, 50)
+
+
+def test_fit_caches_per_surface():
+    """
+    Test that a sprite rescaled to the
+    internal resolution is made only once
+    """
+    view = UpFieldView(headless=True, internal_size=(500, 500))
+    badge = ASSET_CACHE.image("images/level_one.png")
+    first = view._fit(badge, (100, 100))
+    assert first.get_size() == (50, 50)
+    assert view._fit(badge, (100, 100)) is first
+
+
+def test_texture_renderer_uploads_once():
+    """
+    Test that the software texture renderer
+    uploads a sprite the first time only
+    """
+    view = UpFieldView(headless=True, renderer="texture-software")
+    badge = ASSET_CACHE.image("images/level_one.png")
+    view.renderer.blit(badge, (0, 0))
+    view.renderer.blit(badge, (10, 10))
+    view.renderer.present()
+    assert view.renderer.name == "texture"
+    assert view.renderer.uploads == 1
+
+
+def _count_blits(view):
+    """
+    Return the integer of blits drawing the
+    field of the view's match takes
+    """
+    blits = []
+    view.renderer.blit = lambda surface, dest: blits.append(dest)
+    view._draw_field()
+    return len(blits)
+
+
+def test_camera_follows_ball_on_long_pitch():
+    """
+    Test that the camera starts at the bottom
+    of a long pitch and stays on the pitch
+    """
+    view = UpFieldView(headless=True)
+    view._load_assets()
+    view.match = Match(1, length=3000)
+    view._update_camera(snap=True)
+    assert view.camera_y == 2000
+    view.match.ball_y = 150
+    view._update_camera(snap=True)
+    assert view.camera_y == 0
+
+
+def test_long_pitch_draws_only_what_is_on_screen():
+    """
+    Test that a pitch five times longer, with
+    five times the defenders, draws about as
+    much as a single screen
+    """
+    view = UpFieldView(headless=True)
+    view._load_assets()
+    view.match = Match(5)
+    view._update_camera(snap=True)
+    short = _count_blits(view)
+    view.match = Match(5, length=5000)
+    assert len(view.match.defenders) == 25
+    view._update_camera(snap=True)
+    assert _count_blits(view) <= short + 2
+
+
+def test_focus_loss_pauses_and_resumes():
+    """
+    Test that losing focus pauses and getting
+    it back resumes, but not a pause the
+    player asked for
+    """
+    view = UpFieldView(headless=True)
+    view.events.set_state("play")
+    view.events.handle(pygame.event.Event(pygame.WINDOWFOCUSLOST))
+    assert view.events.state == "paused"
+    view.events.handle(pygame.event.Event(pygame.WINDOWFOCUSGAINED))
+    assert view.events.state == "play"
+
+    view.events.handle(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+    view.events.handle(pygame.event.Event(pygame.WINDOWFOCUSGAINED))
+    assert view.events.state == "paused"
+    view.events.handle(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+    assert view.events.state == "play"
+
+
+def test_suspend_blocks_until_resumed():
+    """
+    Test that a paused game waits on the
+    event queue and returns once resumed
+    """
+    view = UpFieldView(headless=True)
+    view._load_assets()
+    view.match = Match(1)
+    view.events.set_state("paused")
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_p))
+    view._suspend()
+    assert view.events.state == "play"